@@ -11,13 +11,224 @@ This module coordinates three agents:
 import os
 import json
 import time
+import random
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional, Any
 
-from .core import Generator, Reflector, Curator, BulletpointAnalyzer
+from .core import Generator, CascadeGenerator, Reflector, Curator, ReflectionBuffer, ReflectorCurator, BulletpointAnalyzer, PlaybookFocus
 from playbook_utils import *
 from logger import *
 from utils import *
+from logging_utils import get_logger, configure_logging
+from tracing import trace_span, configure_tracing, export_trace, DEFAULT_MAX_SPANS
+from checkpoint import (
+    save_checkpoint, load_checkpoint, rng_state_to_json, rng_state_from_json, CheckpointJournal
+)
+from llm import configure_output_budgets, get_output_budgets, configure_truncation_recovery, get_truncation_recovery
+import metrics
+
+log = get_logger("orchestrator")
+
+
+def _refresh_cache_metrics():
+    """Refresh cache hit-ratio gauges right before a metrics scrape"""
+    index_info = build_bullet_index.cache_info()
+    index_lookups = index_info.hits + index_info.misses
+    if index_lookups:
+        metrics.CACHE_HIT_RATIO.set(index_info.hits / index_lookups, cache="bullet_index")
+    prompt_tokens = metrics.LLM_TOKENS.sum(kind="prompt")
+    if prompt_tokens:
+        cached_tokens = metrics.LLM_TOKENS.sum(kind="cached_prompt")
+        metrics.CACHE_HIT_RATIO.set(cached_tokens / prompt_tokens, cache="provider_prompt")
+
+
+class _GenerationPrefetcher:
+    """
+    Runs initial generations for upcoming training samples in background threads
+    against a snapshot of the playbook (pipelined offline training).
+    
+    A prefetched generation is used only if the playbook has advanced by at most
+    `max_staleness` versions since its snapshot was taken; otherwise it is
+    discarded and the sample is generated again against the current playbook.
+    """
+    
+    def __init__(self, ace, depth: int, max_staleness: int, log_dir: str, use_json_mode: bool):
+        self.ace = ace
+        self.depth = depth
+        self.max_staleness = max_staleness
+        self.log_dir = log_dir
+        self.use_json_mode = use_json_mode
+        # One slot for the current sample plus `depth` samples ahead
+        self._executor = ThreadPoolExecutor(max_workers=depth + 1, thread_name_prefix="ace-prefetch")
+        self._pending = {}
+        self.staleness = []
+        self.used = 0
+        self.discarded = 0
+        self.generation_seconds = 0.0
+        self.wait_seconds = 0.0
+    
+    def _generate(self, task_dict: Dict[str, Any], playbook: str, step_id: str):
+        start = time.perf_counter()
+        with trace_span("generate_initial_prefetch", "stage", step_id=step_id):
+            gen_response, bullet_ids, _ = self.ace.answer_generator.generate(
+                question=task_dict.get("question", ""),
+                playbook=playbook,
+                context=task_dict.get("context", ""),
+                reflection="(empty)",
+                use_json_mode=self.use_json_mode,
+                call_id=f"{step_id}_gen_initial",
+                log_dir=self.log_dir
+            )
+        return gen_response, bullet_ids, time.perf_counter() - start
+    
+    def schedule(self, key, task_dict: Dict[str, Any], step_id: str):
+        """Start the initial generation for a sample unless it is already running."""
+        if key in self._pending:
+            return
+        playbook, version = self.ace.playbook, self.ace.playbook_version
+        future = self._executor.submit(self._generate, task_dict, playbook, step_id)
+        self._pending[key] = (future, playbook, version)
+    
+    def take(self, key) -> Optional[Tuple[str, List[str], str]]:
+        """
+        Return (gen_response, bullet_ids, snapshot_playbook) for a scheduled sample,
+        or None if it was not scheduled or is too stale to use.
+        """
+        entry = self._pending.pop(key, None)
+        if entry is None:
+            return None
+        future, playbook, version = entry
+        wait_start = time.perf_counter()
+        gen_response, bullet_ids, generation_seconds = future.result()
+        self.wait_seconds += time.perf_counter() - wait_start
+        
+        staleness = self.ace.playbook_version - version
+        if staleness > self.max_staleness:
+            self.discarded += 1
+            log.info(f"Prefetched generation is {staleness} playbook versions old "
+                     f"(max {self.max_staleness}), regenerating")
+            return None
+        self.staleness.append(staleness)
+        self.used += 1
+        self.generation_seconds += generation_seconds
+        return gen_response, bullet_ids, playbook
+    
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._pending.clear()
+    
+    def summary(self, wall_seconds: float) -> Dict[str, Any]:
+        """
+        Observed staleness and estimated throughput gain over the serial loop.
+        
+        The serial loop would have spent the prefetched generation time on the
+        critical path; the pipeline only spent the time it blocked waiting on them.
+        """
+        serial_seconds = wall_seconds + self.generation_seconds - self.wait_seconds
+        return {
+            "pipeline_depth": self.depth,
+            "max_staleness": self.max_staleness,
+            "prefetched_used": self.used,
+            "prefetched_discarded": self.discarded,
+            "mean_staleness": sum(self.staleness) / len(self.staleness) if self.staleness else 0.0,
+            "max_observed_staleness": max(self.staleness, default=0),
+            "wall_seconds": wall_seconds,
+            "estimated_serial_seconds": serial_seconds,
+            "throughput_gain": serial_seconds / wall_seconds if wall_seconds > 0 else 1.0,
+        }
+
+
+class _BackgroundValidator:
+    """
+    Runs periodic validations in background threads on an immutable snapshot of
+    the playbook taken at the eval step, so training continues meanwhile
+    (async_validation).
+    
+    At most `max_concurrent` validations run at once; submitting another one
+    blocks until the oldest has finished. Finished validations are handed back
+    in submission order so results stay attached to the step they were taken at.
+    """
+    
+    def __init__(self, validate, max_concurrent: int):
+        # validate(job) -> (val_results, val_error_log)
+        self.validate = validate
+        self.max_concurrent = max(1, max_concurrent)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent,
+                                            thread_name_prefix="ace-validation")
+        self._jobs = deque()
+        self.wait_seconds = 0.0
+    
+    def _pop(self):
+        job, future = self._jobs.popleft()
+        wait_start = time.perf_counter()
+        val_results, val_error_log = future.result()
+        self.wait_seconds += time.perf_counter() - wait_start
+        return job, val_results, val_error_log
+    
+    def submit(self, job: Dict[str, Any]) -> List[Tuple[Dict[str, Any], Dict[str, Any], Any]]:
+        """
+        Start validating job["playbook"]. Returns the (job, val_results, val_error_log)
+        of validations that had to finish first to stay within max_concurrent.
+        """
+        return self._enqueue(job, self._executor.submit(self.validate, job))
+    
+    def _enqueue(self, job, future):
+        finished = []
+        while len(self._jobs) >= self.max_concurrent:
+            finished.append(self._pop())
+        self._jobs.append((job, future))
+        return finished
+    
+    def poll(self) -> List[Tuple[Dict[str, Any], Dict[str, Any], Any]]:
+        """Return validations that have finished, without blocking."""
+        finished = []
+        while self._jobs and self._jobs[0][1].done():
+            finished.append(self._pop())
+        return finished
+    
+    def drain(self) -> List[Tuple[Dict[str, Any], Dict[str, Any], Any]]:
+        """Wait for all running validations and return them."""
+        finished = []
+        while self._jobs:
+            finished.append(self._pop())
+        return finished
+    
+    def checkpoint_jobs(self) -> List[Dict[str, Any]]:
+        """
+        Validations not handed back yet, for checkpointing. Finished ones carry
+        their results so resume() does not re-run them.
+        """
+        entries = []
+        for job, future in self._jobs:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                val_results, val_error_log = future.result()
+                entries.append({"job": job, "val_results": val_results, "val_error_log": val_error_log})
+            else:
+                entries.append({"job": job})
+        return entries
+    
+    def resume(self, entries: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], Dict[str, Any], Any]]:
+        """
+        Queue the validations saved by checkpoint_jobs in their original order,
+        re-running only those that had not finished. Returns validations that
+        had to finish first, like submit().
+        """
+        finished = []
+        for entry in entries:
+            if "val_results" in entry:
+                future = Future()
+                future.set_result((entry["val_results"], entry["val_error_log"]))
+                finished.extend(self._enqueue(entry["job"], future))
+            else:
+                finished.extend(self.submit(entry["job"]))
+        return finished
+    
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._jobs.clear()
 
 
 class ACE:
@@ -62,6 +273,12 @@ class ACE:
         self.generator = Generator(generator_client, api_provider, generator_model, max_tokens)
         self.reflector = Reflector(reflector_client, api_provider, reflector_model, max_tokens)
         self.curator = Curator(curator_client, api_provider, curator_model, max_tokens)
+        # Single-call reflection + curation (fused_reflect_curate)
+        self.reflect_curator = ReflectorCurator(self.reflector, self.curator)
+        # Focused curator context (curator_context='focused'), set up by run()
+        self.playbook_focus = None
+        # Cheap -> strong generator cascade (cascade_model), set up by run()
+        self.cascade = None
         
         # Initialize bulletpoint analyzer if requested and available
         self.use_bulletpoint_analyzer = use_bulletpoint_analyzer
@@ -73,7 +290,7 @@ class ACE:
                 curator_model, 
                 max_tokens
             )
-            print(f"✓ BulletpointAnalyzer initialized (threshold={bulletpoint_analyzer_threshold})")
+            log.info(f"✓ BulletpointAnalyzer initialized (threshold={bulletpoint_analyzer_threshold})")
         else:
             self.bulletpoint_analyzer = None
         
@@ -83,7 +300,9 @@ class ACE:
         self.curator_client = curator_client
         self.max_tokens = max_tokens
         
-        # Initialize playbook
+        # Initialize playbook (every change bumps playbook_version)
+        self._playbook = None
+        self.playbook_version = 0
         if initial_playbook:
             self.playbook = initial_playbook
         else:
@@ -92,6 +311,46 @@ class ACE:
         self.best_playbook = self.playbook
         # Track global bullet ID
         self.next_global_id = 1
+        # Per-bullet usage statistics (count, last step, correct/incorrect co-occurrence)
+        self.bullet_usage = BulletUsageTable()
+        # Reflections waiting for the next curator run (curator_frequency > 1)
+        self.reflection_buffer = ReflectionBuffer()
+        # Rolling pre-train correctness for the live accuracy metric
+        self._recent_correct = deque(maxlen=50)
+        # RNG for sampling decisions during training; checkpointed with the run
+        self.rng = random.Random()
+        # Run-level state used for checkpointing (set by run())
+        self._run_mode = None
+        self._run_results = {}
+        self._resume_state = None
+        self._checkpoint_steps = 0
+        self._journal = None
+        # Background generator for pipelined offline training (pipeline_depth > 0)
+        self._prefetcher = None
+        # Background validator for offline training (async_validation)
+        self._validator = None
+        # Reflect-on-correct calls skipped by the helpful-consistency rule
+        self.reflection_skip_stats = {
+            "eligible": 0, "skipped": 0, "audited": 0, "audit_agreed": 0,
+            "reflect_on_correct_calls": 0, "reflect_on_correct_tokens": 0,
+        }
+        self._reflection_skip_lock = threading.Lock()
+        # Prompt and cached prompt tokens of post-reflection regenerations, per round
+        self.regeneration_token_stats = {}
+        self._regeneration_stats_lock = threading.Lock()
+        # Best full-set validation accuracy completed so far (sequential validation's reference)
+        self._best_validated_accuracy = None
+        self._validation_lock = threading.Lock()
+    
+    @property
+    def playbook(self) -> str:
+        return self._playbook
+    
+    @playbook.setter
+    def playbook(self, value: str):
+        if value != self._playbook:
+            self._playbook = value
+            self.playbook_version += 1
     
     def _initialize_empty_playbook(self) -> str:
         """Initialize an empty playbook with standard sections."""
@@ -109,6 +368,16 @@ class ACE:
 
 ## OTHERS"""
     
+    def _record_step_metrics(self, mode: str, tracking_dict: Dict[str, Any]):
+        """Update live metrics after a training step."""
+        metrics.TRAIN_STEPS.inc(mode=mode)
+        self._recent_correct.append(bool(tracking_dict["pre_train_result"]["is_correct"]))
+        metrics.ACCURACY.set(sum(self._recent_correct) / len(self._recent_correct), scope="rolling_train")
+        post_train_result = tracking_dict.get("post_train_result")
+        if post_train_result:
+            metrics.PLAYBOOK_TOKENS.set(post_train_result["playbook_num_tokens"])
+        metrics.PLAYBOOK_BULLETS.set(len(build_bullet_index(self.playbook)))
+    
     def _extract_config_params(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """
         Extract common configuration parameters.
@@ -132,10 +401,47 @@ class ACE:
             'save_dir': config.get('save_dir', './results'),
             'test_workers': config.get('test_workers', 20),
             'use_bulletpoint_analyzer': config.get('use_bulletpoint_analyzer', False),
-            'bulletpoint_analyzer_threshold': config.get('bulletpoint_analyzer_threshold', 0.90)
+            'bulletpoint_analyzer_threshold': config.get('bulletpoint_analyzer_threshold', 0.90),
+            'log_level': config.get('log_level', 'INFO'),
+            'quiet': config.get('quiet', False),
+            'log_file': config.get('log_file', None),
+            'trace_format': config.get('trace_format', None),
+            'trace_max_spans': config.get('trace_max_spans', DEFAULT_MAX_SPANS),
+            'metrics_port': config.get('metrics_port', None),
+            'metrics_host': config.get('metrics_host', '127.0.0.1'),
+            'metrics_window': config.get('metrics_window', 50),
+            'checkpoint_steps': config.get('checkpoint_steps', 0),
+            'pipeline_depth': config.get('pipeline_depth', 0),
+            'max_staleness': config.get('max_staleness', 4),
+            'batch_size': config.get('batch_size', 1),
+            'post_curate_generation': config.get('post_curate_generation', 'sync'),
+            'async_validation': config.get('async_validation', False),
+            'max_concurrent_validations': config.get('max_concurrent_validations', 1),
+            'sequential_validation': config.get('sequential_validation', False),
+            'validation_confidence': config.get('validation_confidence', 0.95),
+            'validation_chunk_size': config.get('validation_chunk_size', None),
+            'reflect_on_correct_skip_rate': config.get('reflect_on_correct_skip_rate', 0.0),
+            'skip_min_helpful': config.get('skip_min_helpful', 3),
+            'speculative_reflections': config.get('speculative_reflections', 1),
+            'reflection_temperatures': config.get('reflection_temperatures', None),
+            'fused_reflect_curate': config.get('fused_reflect_curate', False),
+            'curator_context': config.get('curator_context', 'full'),
+            'curator_neighbors': config.get('curator_neighbors', 20),
+            'playbook_format': config.get('playbook_format', 'raw'),
+            'eval_pack_size': config.get('eval_pack_size', 1),
+            'eval_pack_token_budget': config.get('eval_pack_token_budget', 4000),
+            'cascade_model': config.get('cascade_model', None),
+            'cascade_samples': config.get('cascade_samples', 1),
+            'cascade_min_logprob_margin': config.get('cascade_min_logprob_margin', None),
+            'adaptive_max_tokens': config.get('adaptive_max_tokens', False),
+            'max_tokens_margin': config.get('max_tokens_margin', 0.2),
+            'reflection_session': config.get('reflection_session', False),
+            'max_continuations': config.get('max_continuations', 0),
+            'seed': config.get('seed', None)
         }
     
-    def _setup_paths(self, save_dir: str, task_name: str, mode: str) -> Tuple[str, str]:
+    def _setup_paths(self, save_dir: str, task_name: str, mode: str,
+                     save_path: Optional[str] = None) -> Tuple[str, str]:
         """
         Setup logging paths and directories.
         
@@ -143,14 +449,17 @@ class ACE:
             save_dir: Base path for saving results
             task_name: task name
             mode: 'offline', 'online', or 'eval_only'
+            save_path: Existing run folder to reuse (when resuming); a new
+                timestamped folder is created if None
             
         Returns:
             Tuple of (usage_log_path, playbook_dir)
         """
         # Create timestamped run folder
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        run_folder = f"ace_run_{timestamp}_{task_name}_{mode}"
-        save_path = os.path.join(save_dir, run_folder)
+        if save_path is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            run_folder = f"ace_run_{timestamp}_{task_name}_{mode}"
+            save_path = os.path.join(save_dir, run_folder)
         os.makedirs(save_path, exist_ok=True)
         log_dir = os.path.join(save_path, "detailed_llm_logs")
         os.makedirs(log_dir, exist_ok=True)
@@ -164,6 +473,71 @@ class ACE:
         
         return save_path, usage_log_path, playbook_dir, log_dir
     
+    def _checkpoint_state(self) -> Dict[str, Any]:
+        """Return the ACE state (playbooks, IDs, usage, RNG) as a JSON-serializable dict."""
+        return {
+            "playbook": self.playbook,
+            "best_playbook": self.best_playbook,
+            "next_global_id": self.next_global_id,
+            "bullet_usage": self.bullet_usage.to_dict(),
+            "rng_state": rng_state_to_json(self.rng.getstate()),
+            "playbook_version": self.playbook_version,
+            "reflection_buffer": self.reflection_buffer.to_list(),
+            "reflection_skip_stats": self.reflection_skip_stats,
+            "regeneration_token_stats": self.regeneration_token_stats,
+        }
+    
+    def _restore_checkpoint_state(self, state: Dict[str, Any]):
+        """Restore the ACE state saved by _checkpoint_state."""
+        self.playbook = state["playbook"]
+        self.best_playbook = state["best_playbook"]
+        self.next_global_id = state["next_global_id"]
+        self.playbook_version = state.get("playbook_version", self.playbook_version)
+        self.bullet_usage.load_dict(state.get("bullet_usage"))
+        self.reflection_buffer.load_list(state.get("reflection_buffer"))
+        self.reflection_skip_stats.update(state.get("reflection_skip_stats") or {})
+        self.regeneration_token_stats = {
+            key: dict(value) for key, value in (state.get("regeneration_token_stats") or {}).items()
+        }
+        if state.get("rng_state") is not None:
+            self.rng.setstate(rng_state_from_json(state["rng_state"]))
+    
+    def _save_checkpoint(
+        self,
+        save_path: str,
+        train_state: Optional[Dict[str, Any]] = None,
+        journaled: Optional[List[str]] = None,
+        stable: Optional[Dict[str, int]] = None
+    ):
+        """
+        Atomically write a resumable checkpoint for the current run.
+        
+        Args:
+            save_path: Run folder
+            train_state: Loop position and accumulated results of the running
+                training loop (None between phases)
+            journaled: Keys of append-only lists in train_state that are written
+                to the checkpoint journal instead of the checkpoint
+            stable: Number of leading items of a journaled list that can no longer
+                change, by key (default: all of them)
+        """
+        if self._checkpoint_steps <= 0:
+            return
+        # Buffered logs must reach disk before the checkpoint claims the step is done
+        flush_log_sinks()
+        with trace_span("checkpoint", "io"):
+            if train_state is not None and journaled:
+                train_state = dict(train_state)
+                train_state["journal"] = self._journal.sync(
+                    {key: train_state.pop(key) for key in journaled}, stable
+                )
+            save_checkpoint(save_path, {
+                "mode": self._run_mode,
+                **self._checkpoint_state(),
+                "run_results": self._run_results,
+                "train_state": train_state,
+            })
+    
     def run(
         self,
         mode: str,
@@ -171,7 +545,8 @@ class ACE:
         val_samples: Optional[List[Dict[str, Any]]] = None,
         test_samples: Optional[List[Dict[str, Any]]] = None,
         data_processor = None,
-        config: Dict[str, Any] = None
+        config: Dict[str, Any] = None,
+        resume_from: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Main entrypoint for running ACE system in different modes.
@@ -183,6 +558,8 @@ class ACE:
             test_samples: Test samples (required for online and eval_only modes)
             data_processor: Data processor instance for the task
             config: Configuration dictionary
+            resume_from: Run folder (or its checkpoint.json) of an interrupted
+                offline/online run to continue; completed steps are not re-run
             
         Returns:
             Dictionary with results depending on the mode
@@ -204,6 +581,54 @@ class ACE:
         config_params = self._extract_config_params(config)
         task_name = config_params['task_name']
         save_dir = config_params['save_dir']
+        if config_params['post_curate_generation'] not in ('sync', 'deferred', 'off'):
+            raise ValueError(f"Invalid post_curate_generation: {config_params['post_curate_generation']}. "
+                             f"Must be 'sync', 'deferred', or 'off'")
+        if config_params['playbook_format'] not in ('raw', 'compact', 'compact_bucketed'):
+            raise ValueError(f"Invalid playbook_format: {config_params['playbook_format']}. "
+                             f"Must be 'raw', 'compact', or 'compact_bucketed'")
+        self.generator.playbook_format = config_params['playbook_format']
+        configure_output_budgets(enabled=config_params['adaptive_max_tokens'],
+                                 margin=config_params['max_tokens_margin'])
+        configure_truncation_recovery(max_continuations=config_params['max_continuations'])
+        self.cascade = None
+        if config_params['cascade_model']:
+            metrics.set_pricing(config.get('pricing'))
+            cheap = Generator(self.generator_client, self.generator.api_provider,
+                              config_params['cascade_model'], self.max_tokens,
+                              playbook_format=config_params['playbook_format'])
+            self.cascade = CascadeGenerator(
+                cheap, self.generator,
+                cheap_samples=config_params['cascade_samples'],
+                min_logprob_margin=config_params['cascade_min_logprob_margin']
+            )
+        # One focus (and embedding model) shared by all training workers
+        if config_params['curator_context'] == 'focused':
+            if self.playbook_focus is None or self.playbook_focus.top_k != config_params['curator_neighbors']:
+                self.playbook_focus = PlaybookFocus(top_k=config_params['curator_neighbors'])
+        else:
+            self.playbook_focus = None
+        
+        # Configure console logging (quiet mode keeps only warnings and errors)
+        configure_logging(
+            level=config_params['log_level'],
+            quiet=config_params['quiet'],
+            log_file=config_params['log_file']
+        )
+        if config_params['fused_reflect_curate'] and config_params['curator_frequency'] != 1:
+            log.warning("fused_reflect_curate only applies with curator_frequency=1; "
+                        "using separate reflector and curator calls")
+        
+        # Load checkpoint when resuming an interrupted run
+        checkpoint = None
+        resume_path = None
+        if resume_from:
+            if mode == 'eval_only':
+                raise ValueError("resume_from is only supported for offline and online modes")
+            checkpoint = load_checkpoint(resume_from)
+            if checkpoint["mode"] != mode:
+                raise ValueError(f"Checkpoint was written by a {checkpoint['mode']} run, cannot resume in {mode} mode")
+            resume_path = resume_from if os.path.isdir(resume_from) else os.path.dirname(resume_from)
         
         # Setup paths based on mode
         if mode == 'eval_only':
@@ -211,7 +636,46 @@ class ACE:
             usage_log_path = None
             playbook_dir = None
         else:
-            save_path, usage_log_path, playbook_dir, log_dir = self._setup_paths(save_dir, task_name, mode)
+            save_path, usage_log_path, playbook_dir, log_dir = self._setup_paths(
+                save_dir, task_name, mode, save_path=resume_path
+            )
+        
+        # Setup span tracing (Chrome trace-event or OTLP-JSON file in the run folder)
+        trace_format = config_params['trace_format']
+        if trace_format:
+            trace_filename = "trace.json" if trace_format == "chrome" else "trace.otlp.json"
+            configure_tracing(os.path.join(save_path, trace_filename), fmt=trace_format,
+                              max_spans=config_params['trace_max_spans'])
+        else:
+            configure_tracing(None)
+        
+        # Start the live metrics endpoint (Prometheus text format) if requested
+        if config_params['metrics_port'] is not None:
+            metrics.set_pricing(config.get('pricing'))
+            metrics.REGISTRY.add_collect_callback(_refresh_cache_metrics)
+            server = metrics.start_metrics_server(config_params['metrics_port'], config_params['metrics_host'])
+            host, port = server.server_address[:2]
+            log.info(f"Metrics available at http://{host}:{port}/metrics")
+        self._recent_correct = deque(maxlen=config_params['metrics_window'])
+        
+        # Execute based on mode
+        results = {}
+        self._run_mode = mode
+        self._run_results = results
+        self._resume_state = None
+        self._checkpoint_steps = config_params['checkpoint_steps']
+        self._journal = CheckpointJournal(save_path)
+        if checkpoint is not None:
+            self._restore_checkpoint_state(checkpoint)
+            results.update(checkpoint["run_results"])
+            self._resume_state = checkpoint["train_state"]
+            journal_state = self._resume_state.pop("journal", None) if self._resume_state else None
+            journaled_lists = self._journal.restore(journal_state)
+            if self._resume_state:
+                self._resume_state.update(journaled_lists)
+            log.info(f"Resuming {mode} run from checkpoint saved at {checkpoint['saved_at']}")
+        elif config_params['seed'] is not None:
+            self.rng.seed(config_params['seed'])
         
         # Save configuration
         config_path = os.path.join(save_path, "run_config.json")
@@ -226,31 +690,28 @@ class ACE:
             }, f, indent=2)
         
         # Print initial banner
-        print(f"\n{'='*60}")
-        print(f"ACE SYSTEM - {mode.upper().replace('_', ' ')} MODE")
-        print(f"{'='*60}")
-        print(f"Task: {task_name}")
+        log.info(f"\n{'='*60}")
+        log.info(f"ACE SYSTEM - {mode.upper().replace('_', ' ')} MODE")
+        log.info(f"{'='*60}")
+        log.info(f"Task: {task_name}")
         if mode == 'offline':
-            print(f"Train samples: {len(train_samples)}")
-            print(f"Validation samples: {len(val_samples)}")
+            log.info(f"Train samples: {len(train_samples)}")
+            log.info(f"Validation samples: {len(val_samples)}")
             if test_samples:
-                print(f"Test samples: {len(test_samples)}")
+                log.info(f"Test samples: {len(test_samples)}")
         elif mode == 'online':
-            print(f"Test samples (used for training and testing): {len(test_samples)}")
+            log.info(f"Test samples (used for training and testing): {len(test_samples)}")
         else:  # eval_only
-            print(f"Test samples: {len(test_samples)}")
-        print(f"{'='*60}\n")
-        
-        # Execute based on mode
-        results = {}
+            log.info(f"Test samples: {len(test_samples)}")
+        log.info(f"{'='*60}\n")
         
         if mode == 'offline':
             # OFFLINE MODE WORKFLOW
             # 1. Run initial test if test_samples provided
-            if test_samples:
-                print(f"\n{'='*60}")
-                print(f"INITIAL TEST (before training)")
-                print(f"{'='*60}\n")
+            if test_samples and 'initial_test_results' not in results:
+                log.info(f"\n{'='*60}")
+                log.info(f"INITIAL TEST (before training)")
+                log.info(f"{'='*60}\n")
                 initial_test_results = self._run_test(
                     test_samples=test_samples,
                     data_processor=data_processor,
@@ -261,29 +722,41 @@ class ACE:
                     prefix="initial"
                 )
                 results['initial_test_results'] = initial_test_results
-                print(f"Initial Test Accuracy: {initial_test_results['accuracy']:.3f}\n")
+                log.info(f"Initial Test Accuracy: {initial_test_results['accuracy']:.3f}\n")
+                self._save_checkpoint(save_path)
             
             # 2. Run offline training
-            print(f"\n{'='*60}")
-            print(f"STARTING OFFLINE TRAINING")
-            print(f"{'='*60}\n")
-            training_results = self._offline_train(
-                train_samples=train_samples,
-                val_samples=val_samples,
-                data_processor=data_processor,
-                config=config,
-                save_path=save_path,
-                usage_log_path=usage_log_path,
-                playbook_dir=playbook_dir,
-                log_dir=log_dir
-            )
-            results['training_results'] = training_results
+            if 'training_results' not in results:
+                log.info(f"\n{'='*60}")
+                log.info(f"STARTING OFFLINE TRAINING")
+                log.info(f"{'='*60}\n")
+                try:
+                    training_results = self._offline_train(
+                        train_samples=train_samples,
+                        val_samples=val_samples,
+                        data_processor=data_processor,
+                        config=config,
+                        save_path=save_path,
+                        usage_log_path=usage_log_path,
+                        playbook_dir=playbook_dir,
+                        log_dir=log_dir
+                    )
+                finally:
+                    # Don't leave prefetched generations or validations running after a failure
+                    if self._prefetcher:
+                        self._prefetcher.close()
+                        self._prefetcher = None
+                    if self._validator:
+                        self._validator.close()
+                        self._validator = None
+                results['training_results'] = training_results
+                self._save_checkpoint(save_path)
             
             # 3. Run final test if test_samples provided
             if test_samples:
-                print(f"\n{'='*60}")
-                print(f"FINAL TEST (with best playbook)")
-                print(f"{'='*60}\n")
+                log.info(f"\n{'='*60}")
+                log.info(f"FINAL TEST (with best playbook)")
+                log.info(f"{'='*60}\n")
                 final_test_results = self._run_test(
                     test_samples=test_samples,
                     data_processor=data_processor,
@@ -294,30 +767,32 @@ class ACE:
                     prefix="final"
                 )
                 results['final_test_results'] = final_test_results
-                print(f"Final Test Accuracy: {final_test_results['accuracy']:.3f}\n")
+                log.info(f"Final Test Accuracy: {final_test_results['accuracy']:.3f}\n")
         
         elif mode == 'online':
             # ONLINE MODE WORKFLOW
             # 1. Run initial test
-            print(f"\n{'='*60}")
-            print(f"INITIAL TEST (before training)")
-            print(f"{'='*60}\n")
-            initial_test_results = self._run_test(
-                test_samples=test_samples,
-                data_processor=data_processor,
-                playbook=self.playbook,
-                config=config,
-                log_dir=log_dir,
-                save_path=save_path,
-                prefix="initial"
-            )
-            results['initial_test_results'] = initial_test_results
-            print(f"Initial Test Accuracy: {initial_test_results['accuracy']:.3f}\n")
+            if 'initial_test_results' not in results:
+                log.info(f"\n{'='*60}")
+                log.info(f"INITIAL TEST (before training)")
+                log.info(f"{'='*60}\n")
+                initial_test_results = self._run_test(
+                    test_samples=test_samples,
+                    data_processor=data_processor,
+                    playbook=self.playbook,
+                    config=config,
+                    log_dir=log_dir,
+                    save_path=save_path,
+                    prefix="initial"
+                )
+                results['initial_test_results'] = initial_test_results
+                log.info(f"Initial Test Accuracy: {initial_test_results['accuracy']:.3f}\n")
+                self._save_checkpoint(save_path)
             
             # 2. Run online training and testing
-            print(f"\n{'='*60}")
-            print(f"STARTING ONLINE TRAIN AND TEST")
-            print(f"{'='*60}\n")
+            log.info(f"\n{'='*60}")
+            log.info(f"STARTING ONLINE TRAIN AND TEST")
+            log.info(f"{'='*60}\n")
             online_results = self._online_train_and_test(
                 test_samples=test_samples,
                 data_processor=data_processor,
@@ -331,9 +806,9 @@ class ACE:
         
         else:  # eval_only
             # EVAL ONLY MODE WORKFLOW
-            print(f"\n{'='*60}")
-            print(f"RUNNING TEST")
-            print(f"{'='*60}\n")
+            log.info(f"\n{'='*60}")
+            log.info(f"RUNNING TEST")
+            log.info(f"{'='*60}\n")
             test_results = self._run_test(
                 test_samples=test_samples,
                 data_processor=data_processor,
@@ -345,28 +820,69 @@ class ACE:
             )
             results['test_results'] = test_results
         
+        if self.regeneration_token_stats:
+            with self._regeneration_stats_lock:
+                regeneration_stats = {key: dict(value) for key, value in self.regeneration_token_stats.items()}
+            for round_num, stats in sorted(regeneration_stats.items(), key=lambda item: int(item[0])):
+                cached_share = stats['cached_prompt_tokens'] / stats['prompt_tokens'] if stats['prompt_tokens'] else 0.0
+                log.info(f"Regeneration round {int(round_num) + 1}: {stats['calls']} calls, "
+                         f"{stats['prompt_tokens']} prompt tokens, {cached_share:.1%} served from cache")
+            results['regeneration_token_stats'] = regeneration_stats
+        if config_params['adaptive_max_tokens']:
+            output_budgets = get_output_budgets().summary(self.max_tokens)
+            for role, budget in output_budgets.items():
+                log.info(f"Learned max_tokens for {role}: {budget['budget']} (cap {self.max_tokens}, "
+                         f"{budget['observed']} responses, {budget['truncation_retries']} truncation retries)")
+            results['output_budgets'] = output_budgets
+        if config_params['max_continuations']:
+            truncation_recovery = get_truncation_recovery().summary()
+            for role, stats in truncation_recovery.items():
+                log.info(f"Truncated {role} responses: {stats['truncated']} ({stats['salvaged']} salvaged, "
+                         f"{stats['continued']} continued with {stats['continuation_calls']} calls, "
+                         f"{stats['unrecovered']} unrecovered)")
+            results['truncation_recovery'] = truncation_recovery
+        if self.cascade:
+            cascade_stats = self.cascade.summary()
+            for tier, stats in cascade_stats["tiers"].items():
+                log.info(f"Cascade {tier} tier ({stats['model']}): {stats['calls']} calls, "
+                         f"{stats['latency_seconds']:.1f}s, ~${stats['spend_usd']:.4f}")
+            log.info(f"Cascade escalated {cascade_stats['escalation_rate']:.1%} of "
+                     f"{cascade_stats['requests']} requests: {cascade_stats['escalations']}")
+            results['cascade_stats'] = cascade_stats
+        if config_params['playbook_format'] != 'raw':
+            render_stats = self.answer_generator.playbook_render_summary()
+            log.info(f"Compact playbook rendering: {render_stats['tokens_saved']} of "
+                     f"{render_stats['raw_tokens']} playbook tokens saved "
+                     f"({render_stats['savings_ratio']:.1%}) over {render_stats['calls']} generator calls")
+            results['playbook_render_stats'] = render_stats
+        
+        flush_log_sinks()
+        trace_path = export_trace()
+        if trace_path:
+            log.info(f"Trace written to: {trace_path}")
+        
         # Save consolidated results
         final_results_path = os.path.join(save_path, "final_results.json")
         with open(final_results_path, "w") as f:
             json.dump(results, f, indent=2)
         
         # Print final summary
-        print(f"\n{'='*60}")
-        print(f"RUN COMPLETE")
-        print(f"{'='*60}")
-        print(f"Mode: {mode.upper().replace('_', ' ')}")
+        log.info(f"\n{'='*60}")
+        log.info(f"RUN COMPLETE")
+        log.info(f"{'='*60}")
+        log.info(f"Mode: {mode.upper().replace('_', ' ')}")
         if mode == 'offline':
-            print(f"Best Validation Accuracy: {results['training_results']['best_validation_accuracy']:.3f}")
+            log.info(f"Best Validation Accuracy: {results['training_results']['best_validation_accuracy']:.3f}")
             if test_samples:
-                print(f"Initial Test Accuracy: {results['initial_test_results']['accuracy']:.3f}")
-                print(f"Final Test Accuracy: {results['final_test_results']['accuracy']:.3f}")
+                log.info(f"Initial Test Accuracy: {results['initial_test_results']['accuracy']:.3f}")
+                log.info(f"Final Test Accuracy: {results['final_test_results']['accuracy']:.3f}")
         elif mode == 'online':
-            print(f"Initial Test Accuracy: {results['initial_test_results']['accuracy']:.3f}")
-            print(f"Final Test Accuracy: {results['online_test_results']['accuracy']:.3f}")
+            log.info(f"Initial Test Accuracy: {results['initial_test_results']['accuracy']:.3f}")
+            log.info(f"Final Test Accuracy: {results['online_test_results']['accuracy']:.3f}")
         else:  # eval_only
-            print(f"Test Accuracy: {results['test_results']['accuracy']:.3f}")
-        print(f"Results saved to: {save_path}")
-        print(f"{'='*60}\n")
+            log.info(f"Test Accuracy: {results['test_results']['accuracy']:.3f}")
+        log.info(f"Results saved to: {save_path}")
+        log.info(f"{'='*60}\n")
         
         return results
     
@@ -399,16 +915,19 @@ class ACE:
         use_json_mode = config_params['use_json_mode']
         test_workers = config_params['test_workers']
         
-        test_results, test_error_log = evaluate_test_set(
-            data_processor,
-            self.generator,
-            playbook,
-            test_samples,
-            self.max_tokens,
-            log_dir,
-            max_workers=test_workers,
-            use_json_mode=use_json_mode
-        )
+        with trace_span("test", "eval", prefix=prefix, samples=len(test_samples)):
+            test_results, test_error_log = evaluate_test_set(
+                data_processor,
+                self.answer_generator,
+                playbook,
+                test_samples,
+                self.max_tokens,
+                log_dir,
+                max_workers=test_workers,
+                use_json_mode=use_json_mode,
+                pack_size=config_params['eval_pack_size'],
+                pack_token_budget=config_params['eval_pack_token_budget']
+            )
 
         # Save test results
         test_results_path = os.path.join(save_path, f"{prefix}_test_results.json")
@@ -420,39 +939,131 @@ class ACE:
         
         return test_results
     
-    def _train_single_sample(
+    def _curate_remaining_reflections(
+        self,
+        step: int,
+        step_id: str,
+        log_dir: str,
+        config_params: Dict[str, Any],
+        total_samples: int
+    ):
+        """Run the curator once more on reflections still buffered at the end of training."""
+        if not len(self.reflection_buffer):
+            return
+        buffered = self.reflection_buffer.drain()
+        log.info(f"\n--- Running Curator on {len(buffered)} remaining buffered reflections ---")
+        recent_reflection, question_context = Curator.format_reflection_batch(buffered)
+        with trace_span("curate", "stage", step_id=step_id) as span:
+            self.playbook, self.next_global_id, operations, _ = self.curator.curate(
+                current_playbook=self.playbook,
+                recent_reflection=recent_reflection,
+                question_context=question_context,
+                current_step=step,
+                total_samples=total_samples,
+                token_budget=config_params['token_budget'],
+                playbook_stats=get_playbook_stats(self.playbook),
+                use_ground_truth=not config_params['no_ground_truth'],
+                use_json_mode=config_params['use_json_mode'],
+                call_id=step_id,
+                log_dir=log_dir,
+                next_global_id=self.next_global_id,
+                playbook_view=self._curator_playbook_view(
+                    self.playbook, recent_reflection, question_context,
+                    self._buffered_bullet_ids(buffered), config_params
+                )
+            )
+            span.set("operations", len(operations))
+    
+    @property
+    def answer_generator(self):
+        """Generator for first answers (evaluation and initial generations): the cascade if enabled."""
+        return self.cascade or self.generator
+    
+    def _curator_playbook_view(
+        self,
+        playbook: str,
+        recent_reflection: str,
+        question_context: str,
+        cited_ids: List[str],
+        config_params: Dict[str, Any]
+    ) -> Optional[str]:
+        """
+        Build the playbook text shown to the curator.
+        
+        Args:
+            playbook: Playbook the curator operations will apply to
+            recent_reflection: Reflection(s) being curated
+            question_context: Question context of the reflection(s)
+            cited_ids: Bullet IDs cited in the curated sample(s)
+            config_params: Configuration parameters dictionary
+            
+        Returns:
+            Focused view when curator_context is 'focused', None for the full playbook
+        """
+        if config_params['curator_context'] != 'focused':
+            return None
+        return self.playbook_focus.render(
+            playbook, f"{recent_reflection}\n\n{question_context}", cited_ids
+        )
+    
+    @staticmethod
+    def _buffered_bullet_ids(entries: List[Dict[str, Any]]) -> List[str]:
+        """Union of the bullet IDs cited by buffered reflections, in first-cited order."""
+        return list(dict.fromkeys(
+            bullet_id for entry in entries for bullet_id in entry.get("bullet_ids", [])
+        ))
+    
+    def _generate_and_reflect(
         self,
         task_dict: Dict[str, Any],
         data_processor,
+        playbook: str,
         step_id: str,
         epoch: int,
         step: int,
         usage_log_path: str,
         log_dir: str,
         config_params: Dict[str, Any],
-        total_samples: int
-    ) -> Tuple[str, str, Dict[str, Any]]:
+        initial_generation: Optional[Tuple[str, List[str], str]] = None,
+        skip_draw: Optional[float] = None,
+        curation: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
-        Train on a single sample with reflection and curation.
+        Run the initial generation and reflection rounds for one sample.
+        
+        Does not modify self.playbook: helpful/harmful tags from the reflector are
+        applied to a local copy of `playbook`, and also returned so that several
+        samples reflecting on the same playbook version can be merged.
         
         Args:
             task_dict: Sample dictionary with question, context, target
             data_processor: Data processor for evaluation
-            step_id: Identifier string for this step (e.g., "train_e_1_s_10" or "online_train_w_1_s_5")
+            playbook: Playbook version to generate and reflect against
+            step_id: Identifier string for this step
             epoch: Current epoch number
             step: Current step number
             usage_log_path: Path for bullet usage logging
             log_dir: Path for logging directory
             config_params: Configuration parameters dictionary
-            total_samples: Total number of samples in dataset
+            initial_generation: Optional precomputed (gen_response, bullet_ids, playbook)
+                for STEP 1 (prefetched or reused from a window test)
+            skip_draw: Uniform draw from self.rng (taken by the caller so batches
+                stay deterministic); reflect-on-correct is skipped for eligible
+                samples when it is below reflect_on_correct_skip_rate
+            curation: If given (current_step, total_samples, token_budget and
+                playbook_stats for the curator), the first reflection of the
+                sample is a fused reflector + curator call
             
         Returns:
-            Tuple of (pre_train_answer, post_train_answer, tracking_dict)
+            Dictionary with pre_train_answer, tracking_dict, reflection_content,
+            bullet_tags (one tag list per reflection, in order), playbook (the
+            local copy with updated counts), generation_playbook (the playbook
+            the initial answer was generated with), curator_operations (from
+            the fused call; None if there was none or it could not be parsed)
+            and cited_bullet_ids (bullets cited across all generations)
         """
         # Extract configuration
         max_num_rounds = config_params['max_num_rounds']
-        curator_frequency = config_params['curator_frequency']
-        token_budget = config_params['token_budget']
         use_json_mode = config_params['use_json_mode']
         no_ground_truth = config_params['no_ground_truth']
         
@@ -462,190 +1073,857 @@ class ACE:
         target = task_dict.get("target", "")
         
         # STEP 1: Initial generation (pre-train)
-        print("Generating initial answer...")
-        gen_response, bullet_ids, call_info = self.generator.generate(
-            question=question,
-            playbook=self.playbook,
-            context=context,
-            reflection="(empty)",
-            use_json_mode=use_json_mode,
-            call_id=f"{step_id}_gen_initial",
-            log_dir=log_dir
-        )
+        if initial_generation is not None:
+            gen_response, bullet_ids, generation_playbook = initial_generation
+        else:
+            log.info("Generating initial answer...")
+            generation_playbook = playbook
+            with trace_span("generate_initial", "stage", step_id=step_id):
+                gen_response, bullet_ids, call_info = self.answer_generator.generate(
+                    question=question,
+                    playbook=generation_playbook,
+                    context=context,
+                    reflection="(empty)",
+                    use_json_mode=use_json_mode,
+                    call_id=f"{step_id}_gen_initial",
+                    log_dir=log_dir
+                )
         
         # Extract answer and check correctness
         final_answer = extract_answer(gen_response)
         is_correct = data_processor.answer_is_correct(final_answer, target)
         pre_train_answer = final_answer
         
-        print(f"Correct: {is_correct}")
+        log.info(f"Correct: {is_correct}")
         
         # Log bullet usage
-        log_bullet_usage(usage_log_path, epoch, step, task_dict, bullet_ids,
-                       playbook=self.playbook, is_correct=is_correct)
+        with trace_span("log_bullet_usage", "io", step_id=step_id):
+            log_bullet_usage(usage_log_path, epoch, step, task_dict, bullet_ids,
+                           playbook=generation_playbook, is_correct=is_correct,
+                           usage_table=self.bullet_usage)
         
         # Track pre-train result
         tracking_dict = {
             "pre_train_result": {
                 "final_answer": final_answer,
                 "is_correct": is_correct,
-                "playbook_num_tokens": count_tokens(self.playbook),
-                "playbook_length": len(self.playbook)
+                "playbook_num_tokens": count_tokens(generation_playbook),
+                "playbook_length": len(generation_playbook)
             }
         }
         
         reflection_content = "(empty)"
-        
-        # STEP 2: Reflection and regeneration
-        if not is_correct:
-            # For incorrect answers - iterate reflection rounds
-            for round_num in range(max_num_rounds):
-                print(f"Reflection round {round_num + 1}/{max_num_rounds}")
-                
-                # Get bullets for reflector
-                playbook_bullets = extract_playbook_bullets(
-                    self.playbook, bullet_ids
-                )
-                
-                # Reflect on error
-                reflection_content, bullet_tags, _ = self.reflector.reflect(
+        all_bullet_tags = []
+        curator_operations = None
+        cited_bullet_ids = list(dict.fromkeys(bullet_ids))
+        
+        def reflect(environment_feedback, call_id, temperature=None, fuse=False):
+            """Reflect on the current answer, proposing curator operations too if fused."""
+            nonlocal curator_operations
+            bullets_used = extract_playbook_bullets(playbook, bullet_ids)
+            if fuse:
+                reflection, tags, curator_operations, call_info = self.reflect_curator.reflect_and_curate(
                     question=question,
+                    question_context=context,
                     reasoning_trace=gen_response,
                     predicted_answer=final_answer,
                     ground_truth=target if not no_ground_truth else None,
-                    environment_feedback="Predicted answer does not match ground truth",
-                    bullets_used=playbook_bullets,
+                    environment_feedback=environment_feedback,
+                    bullets_used=bullets_used,
+                    current_playbook=playbook,
                     use_ground_truth=not no_ground_truth,
                     use_json_mode=use_json_mode,
-                    call_id=f"{step_id}_round_{round_num}",
-                    log_dir=log_dir
+                    call_id=f"{call_id}_fused",
+                    log_dir=log_dir,
+                    **curation
                 )
+                return reflection, tags, call_info
+            return self.reflector.reflect(
+                question=question,
+                reasoning_trace=gen_response,
+                predicted_answer=final_answer,
+                ground_truth=target if not no_ground_truth else None,
+                environment_feedback=environment_feedback,
+                bullets_used=bullets_used,
+                use_ground_truth=not no_ground_truth,
+                use_json_mode=use_json_mode,
+                call_id=call_id,
+                log_dir=log_dir,
+                temperature=temperature
+            )
+        
+        # STEP 2: Reflection and regeneration
+        if not is_correct:
+            num_candidates = max(1, config_params['speculative_reflections'])
+            temperatures = config_params['reflection_temperatures'] or [None]
+            
+            # Session mode: regenerations are follow-up turns after the initial answer
+            session = None
+            if config_params['reflection_session']:
+                session = self.generator.start_session(question, generation_playbook, context, gen_response)
+            regeneration_rounds = []
+            tracking_dict["regeneration_rounds"] = regeneration_rounds
+            
+            def reflect_and_regenerate(round_num, candidate, cancelled=None):
+                """One reflect -> regenerate attempt; None if cancelled in between."""
+                suffix = f"_cand_{candidate}" if num_candidates > 1 else ""
                 
-                # Update bullet counts
-                if bullet_tags:
-                    self.playbook = update_bullet_counts(
-                        self.playbook, bullet_tags
+                # Reflect on error (the first sequential round carries the curation if fused)
+                with trace_span("reflect", "stage", step_id=step_id, round=round_num, candidate=candidate):
+                    candidate_reflection, bullet_tags, _ = reflect(
+                        "Predicted answer does not match ground truth",
+                        f"{step_id}_round_{round_num}{suffix}",
+                        temperature=temperatures[candidate % len(temperatures)],
+                        fuse=curation is not None and round_num == 0 and num_candidates == 1
                     )
+                if cancelled is not None and cancelled.is_set():
+                    return None
+                
+                # Update bullet counts
+                candidate_playbook = update_bullet_counts(playbook, bullet_tags) if bullet_tags else playbook
                 
                 # Regenerate with reflection
-                gen_response, bullet_ids, _ = self.generator.generate(
-                    question=question,
-                    playbook=self.playbook,
-                    context=context,
-                    reflection=reflection_content,
-                    use_json_mode=use_json_mode,
-                    call_id=f"{step_id}_post_reflect_round_{round_num}",
-                    log_dir=log_dir
-                )
+                candidate_session = None
+                with trace_span("regenerate", "stage", step_id=step_id, round=round_num, candidate=candidate):
+                    if session is not None:
+                        # Each candidate continues its own copy of the conversation
+                        candidate_session = {**session, "messages": list(session["messages"])}
+                        candidate_response, candidate_bullet_ids, regen_info = self.generator.generate_followup(
+                            candidate_session,
+                            reflection=candidate_reflection,
+                            use_json_mode=use_json_mode,
+                            call_id=f"{step_id}_post_reflect_round_{round_num}{suffix}",
+                            log_dir=log_dir
+                        )
+                    else:
+                        candidate_response, candidate_bullet_ids, regen_info = self.generator.generate(
+                            question=question,
+                            playbook=candidate_playbook,
+                            context=context,
+                            reflection=candidate_reflection,
+                            use_json_mode=use_json_mode,
+                            call_id=f"{step_id}_post_reflect_round_{round_num}{suffix}",
+                            log_dir=log_dir
+                        )
+                candidate_answer = extract_answer(candidate_response)
+                return {
+                    "session": candidate_session,
+                    "regeneration_tokens": {
+                        "round": round_num,
+                        "prompt_tokens": regen_info.get("prompt_num_tokens") or 0,
+                        "cached_prompt_tokens": regen_info.get("cached_prompt_tokens") or 0,
+                    },
+                    "candidate": candidate,
+                    "reflection_content": candidate_reflection,
+                    "bullet_tags": bullet_tags,
+                    "playbook": candidate_playbook,
+                    "gen_response": candidate_response,
+                    "bullet_ids": candidate_bullet_ids,
+                    "final_answer": candidate_answer,
+                    "is_correct": data_processor.answer_is_correct(candidate_answer, target),
+                }
+            
+            # For incorrect answers - iterate reflection rounds
+            for round_num in range(max_num_rounds):
+                log.info(f"Reflection round {round_num + 1}/{max_num_rounds}")
+                
+                if num_candidates == 1:
+                    outcome = reflect_and_regenerate(round_num, 0)
+                else:
+                    outcome = self._speculative_reflection_round(
+                        reflect_and_regenerate, round_num, num_candidates
+                    )
                 
-                final_answer = extract_answer(gen_response)
+                session = outcome["session"]
+                regeneration_rounds.append(outcome["regeneration_tokens"])
+                self._record_regeneration_tokens(outcome["regeneration_tokens"])
+                reflection_content = outcome["reflection_content"]
+                if outcome["bullet_tags"]:
+                    all_bullet_tags.append(outcome["bullet_tags"])
+                playbook = outcome["playbook"]
+                gen_response = outcome["gen_response"]
+                bullet_ids = outcome["bullet_ids"]
+                final_answer = outcome["final_answer"]
+                cited_bullet_ids.extend(b for b in bullet_ids if b not in cited_bullet_ids)
                 
-                if data_processor.answer_is_correct(final_answer, target):
-                    print(f"Corrected after reflection round {round_num + 1}!")
+                if outcome["is_correct"]:
+                    log.info(f"Corrected after reflection round {round_num + 1}!")
                     is_correct = True
                     break
         
         else:
-            # For correct answers - still run reflector to tag helpful bullets
-            playbook_bullets = extract_playbook_bullets(
-                self.playbook, bullet_ids
+            # Cited bullets with a consistent helpful record can be tagged
+            # helpful without asking the reflector
+            skip_rate = config_params['reflect_on_correct_skip_rate']
+            eligible = skip_rate > 0 and bullets_consistently_helpful(
+                playbook, bullet_ids, config_params['skip_min_helpful']
             )
+            cited_ids = list(dict.fromkeys(bullet_ids))
             
-            reflection_content, bullet_tags, _ = self.reflector.reflect(
-                question=question,
-                reasoning_trace=gen_response,
-                predicted_answer=final_answer,
-                ground_truth=target if not no_ground_truth else None,
-                environment_feedback="Predicted answer matches ground truth",
-                bullets_used=playbook_bullets,
-                use_ground_truth=not no_ground_truth,
-                use_json_mode=use_json_mode,
-                call_id=f"{step_id}_reflect_on_correct",
-                log_dir=log_dir
-            )
+            if eligible and skip_draw is not None and skip_draw < skip_rate:
+                log.info("Skipping reflect-on-correct: cited bullets are consistently helpful")
+                bullet_tags = [{"id": bullet_id, "tag": "helpful"} for bullet_id in cited_ids]
+                with self._reflection_skip_lock:
+                    self.reflection_skip_stats["eligible"] += 1
+                    self.reflection_skip_stats["skipped"] += 1
+            else:
+                # For correct answers - still run reflector to tag helpful bullets
+                with trace_span("reflect_on_correct", "stage", step_id=step_id):
+                    reflection_content, bullet_tags, call_info = reflect(
+                        "Predicted answer matches ground truth",
+                        f"{step_id}_reflect_on_correct",
+                        fuse=curation is not None
+                    )
+                
+                # Eligible samples that were reflected on audit the rule
+                with self._reflection_skip_lock:
+                    stats = self.reflection_skip_stats
+                    if curation is None:
+                        stats["reflect_on_correct_calls"] += 1
+                        stats["reflect_on_correct_tokens"] += (
+                            (call_info.get("prompt_num_tokens") or 0) + (call_info.get("response_num_tokens") or 0)
+                        )
+                    if eligible:
+                        tags = {tag.get("id") or tag.get("bullet"): tag.get("tag")
+                                for tag in bullet_tags or [] if isinstance(tag, dict)}
+                        stats["eligible"] += 1
+                        stats["audited"] += 1
+                        stats["audit_agreed"] += all(tags.get(bullet_id) == "helpful" for bullet_id in cited_ids)
             
             # Update bullet counts
             if bullet_tags:
-                self.playbook = update_bullet_counts(
-                    self.playbook, bullet_tags
+                all_bullet_tags.append(bullet_tags)
+                playbook = update_bullet_counts(
+                    playbook, bullet_tags
                 )
             
             # Log with reflection
-            log_bullet_usage(usage_log_path, epoch, step, task_dict, bullet_ids,
-                           playbook=self.playbook, 
-                           reflection_content=reflection_content,
-                           is_correct=is_correct)
-        
-        # STEP 3: Curator - Periodically update playbook
-        if step % curator_frequency == 0:
-            print(f"\n--- Running Curator at step {step} ---")
-            
-            stats = get_playbook_stats(self.playbook)
-            
-            self.playbook, self.next_global_id, operations, _ = self.curator.curate(
-                current_playbook=self.playbook,
-                recent_reflection=reflection_content,
-                question_context=context,
-                current_step=step,
-                total_samples=total_samples,
-                token_budget=token_budget,
-                playbook_stats=stats,
-                use_ground_truth=not no_ground_truth,
-                use_json_mode=use_json_mode,
-                call_id=step_id,
-                log_dir=log_dir,
-                next_global_id=self.next_global_id
-            )
-            
-            # Run bulletpoint analyzer if enabled
-            if self.use_bulletpoint_analyzer and self.bulletpoint_analyzer:
-                print(f"  Running BulletpointAnalyzer (threshold={self.bulletpoint_analyzer_threshold})...")
-                self.playbook = self.bulletpoint_analyzer.analyze(
-                    playbook=self.playbook,
-                    threshold=self.bulletpoint_analyzer_threshold,
-                    merge=True
-                )
+            with trace_span("log_bullet_usage", "io", step_id=step_id):
+                log_bullet_usage(usage_log_path, epoch, step, task_dict, bullet_ids,
+                               playbook=playbook, 
+                               reflection_content=reflection_content,
+                               is_correct=is_correct)
         
-        # STEP 4: Post-curator generation
-        gen_response, _, _ = self.generator.generate(
-            question=question,
-            playbook=self.playbook,
-            context=context,
-            reflection="(empty)",
-            use_json_mode=use_json_mode,
-            call_id=f"{step_id}_post_curate",
-            log_dir=log_dir
-        )
-        
-        final_answer = extract_answer(gen_response)
-        post_train_answer = final_answer
-        
-        post_train_is_correct = data_processor.answer_is_correct(final_answer, target)
-        tracking_dict["post_train_result"] = {
-            "final_answer": final_answer,
-            "is_correct": post_train_is_correct,
-            "playbook_num_tokens": count_tokens(self.playbook),
-            "playbook_length": len(self.playbook)
+        return {
+            "pre_train_answer": pre_train_answer,
+            "tracking_dict": tracking_dict,
+            "reflection_content": reflection_content,
+            "bullet_tags": all_bullet_tags,
+            "playbook": playbook,
+            "generation_playbook": generation_playbook,
+            "curator_operations": curator_operations,
+            "cited_bullet_ids": cited_bullet_ids,
         }
-        
-        return pre_train_answer, post_train_answer, tracking_dict
     
-    def _offline_train(
-        self,
-        train_samples: List[Dict[str, Any]],
-        val_samples: List[Dict[str, Any]],
-        data_processor,
-        config: Dict[str, Any],
-        save_path: str,
-        usage_log_path: str,
-        playbook_dir: str,
-        log_dir: str
-    ) -> Dict[str, Any]:
+    def _speculative_reflection_round(self, attempt, round_num: int, num_candidates: int) -> Dict[str, Any]:
         """
-        Run offline training
+        Run `num_candidates` reflect -> regenerate attempts in parallel and
+        return the first one that fixes the answer.
+        
+        Once a winner is found, candidates that have not started are cancelled
+        and running ones stop before their regeneration call (a request already
+        in flight cannot be aborted and finishes in the background). A candidate
+        that raises is logged and dropped. If no candidate fixes the answer, the
+        lowest-numbered candidate that finished is returned so the next round
+        continues as in the sequential loop; if every candidate failed, the
+        first candidate's exception is raised.
         
         Args:
-            train_samples: List of training samples
+            attempt: Callable (round_num, candidate, cancelled) -> outcome dict or None
+            round_num: Reflection round number
+            num_candidates: Number of parallel candidates
+            
+        Returns:
+            Outcome dict of the chosen candidate
+        """
+        cancelled = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=num_candidates, thread_name_prefix="ace-speculate")
+        try:
+            futures = {
+                executor.submit(attempt, round_num, candidate, cancelled): candidate
+                for candidate in range(num_candidates)
+            }
+            outcomes = {}
+            errors = {}
+            for future in as_completed(futures):
+                candidate = futures[future]
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    log.warning(f"Speculative candidate {candidate} of round {round_num} failed: "
+                                f"{type(e).__name__}: {e}")
+                    errors[candidate] = e
+                    outcome = None
+                outcomes[candidate] = outcome
+                if outcome is not None and outcome["is_correct"]:
+                    log.info(f"Speculative candidate {outcome['candidate']} fixed the answer "
+                             f"({len(outcomes)}/{num_candidates} finished)")
+                    return outcome
+            for candidate in sorted(outcomes):
+                if outcomes[candidate] is not None:
+                    return outcomes[candidate]
+            raise errors[min(errors)]
+        finally:
+            cancelled.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _post_train_result(self, final_answer: str, target: str, data_processor, playbook: str) -> Dict[str, Any]:
+        """Build the post_train_result tracking entry for a post-curate answer."""
+        return {
+            "final_answer": final_answer,
+            "is_correct": data_processor.answer_is_correct(final_answer, target),
+            "playbook_num_tokens": count_tokens(playbook),
+            "playbook_length": len(playbook)
+        }
+    
+    def _skip_post_curate(self, generation_playbook: str, mode: str) -> bool:
+        """
+        Whether STEP 4 needs no generator call for a sample.
+        
+        Always true for mode 'off'. Otherwise true only when the playbook as
+        rendered into the generator prompt is exactly the one of the initial
+        generation, so the post-curate prompt would repeat the initial one. With
+        the raw format the helpful/harmful counters are part of the prompt, so
+        any counter update forces a new generation. Never true with the cascade
+        enabled: the initial answer may come from the cheap tier, while the
+        post-curate answer must come from the strong generator.
+        """
+        if mode == 'off':
+            return True
+        if self.answer_generator is not self.generator:
+            return False
+        if self.playbook == generation_playbook:
+            return True
+        render = self.generator.render_playbook
+        return render(self.playbook, record=False)[0] == render(generation_playbook, record=False)[0]
+    
+    def _record_regeneration_tokens(self, round_tokens: Dict[str, int]):
+        """Add one regeneration's prompt and cached prompt tokens to its round's totals."""
+        with self._regeneration_stats_lock:
+            stats = self.regeneration_token_stats.setdefault(
+                str(round_tokens["round"]), {"calls": 0, "prompt_tokens": 0, "cached_prompt_tokens": 0}
+            )
+            stats["calls"] += 1
+            stats["prompt_tokens"] += round_tokens["prompt_tokens"]
+            stats["cached_prompt_tokens"] += round_tokens["cached_prompt_tokens"]
+    
+    def _reflection_skip_summary(self) -> Dict[str, Any]:
+        """
+        Savings and fidelity of reflect-on-correct skipping.
+        
+        Skipped calls are priced at the mean tokens of the reflect-on-correct
+        calls that did run. audit_agreement is the share of eligible samples that
+        were still reflected on where the reflector tagged every cited bullet
+        helpful, i.e. agreed with the rule that replaced it.
+        """
+        with self._reflection_skip_lock:
+            stats = dict(self.reflection_skip_stats)
+        calls = stats["reflect_on_correct_calls"]
+        mean_tokens = stats["reflect_on_correct_tokens"] / calls if calls else 0.0
+        return {
+            **stats,
+            "estimated_tokens_saved": round(mean_tokens * stats["skipped"]),
+            "audit_agreement": stats["audit_agreed"] / stats["audited"] if stats["audited"] else None,
+        }
+    
+    def _log_reflection_skip_summary(self, summary: Dict[str, Any]):
+        """Log the summary returned by _reflection_skip_summary."""
+        agreement = summary["audit_agreement"]
+        log.info(f"Reflect-on-correct: {summary['skipped']} of {summary['eligible']} eligible calls skipped "
+                 f"(~{summary['estimated_tokens_saved']} tokens saved); reflector agreed with the rule on "
+                 f"{'n/a' if agreement is None else f'{agreement:.1%}'} of {summary['audited']} audited samples")
+    
+    def _run_deferred_post_curate(
+        self,
+        deferred: List[Dict[str, Any]],
+        playbooks: Dict[str, str],
+        pre_train_post_train_results: List[Dict[str, Any]],
+        answers_post_train: List[Optional[str]],
+        data_processor,
+        log_dir: str,
+        config_params: Dict[str, Any]
+    ):
+        """
+        Run deferred post-curate generations in parallel and fill in their results.
+        
+        Args:
+            deferred: Pending items with task_dict, playbook_version (of the
+                playbook after the sample's curator step), step_id, result_index
+                (into pre_train_post_train_results) and answer_index (into answers_post_train)
+            playbooks: Playbook snapshots of the pending items by playbook_version
+            pre_train_post_train_results: Per-sample tracking records to update
+            answers_post_train: Post-train answers list to update
+            data_processor: Data processor for evaluation
+            log_dir: Path for logging directory
+            config_params: Configuration parameters dictionary
+        """
+        if not deferred:
+            return
+        log.info(f"Running {len(deferred)} deferred post-curate generations...")
+        with trace_span("generate_post_curate_deferred", "stage", samples=len(deferred)):
+            with ThreadPoolExecutor(max_workers=config_params['test_workers']) as executor:
+                responses = list(executor.map(
+                    lambda item: self.generator.generate(
+                        question=item["task_dict"].get("question", ""),
+                        playbook=playbooks[item["playbook_version"]],
+                        context=item["task_dict"].get("context", ""),
+                        reflection="(empty)",
+                        use_json_mode=config_params['use_json_mode'],
+                        call_id=f"{item['step_id']}_post_curate",
+                        log_dir=log_dir
+                    )[0],
+                    deferred
+                ))
+        
+        for item, gen_response in zip(deferred, responses):
+            final_answer = extract_answer(gen_response)
+            pre_train_post_train_results[item["result_index"]]["post_train_result"] = self._post_train_result(
+                final_answer, item["task_dict"].get("target", ""), data_processor,
+                playbooks[item["playbook_version"]]
+            )
+            answers_post_train[item["answer_index"]] = final_answer
+        deferred.clear()
+        playbooks.clear()
+    
+    def _train_single_sample(
+        self,
+        task_dict: Dict[str, Any],
+        data_processor,
+        step_id: str,
+        epoch: int,
+        step: int,
+        usage_log_path: str,
+        log_dir: str,
+        config_params: Dict[str, Any],
+        total_samples: int,
+        initial_generation: Optional[Tuple[str, List[str], str]] = None
+    ) -> Tuple[str, str, Dict[str, Any]]:
+        """
+        Train on a single sample with reflection and curation.
+        
+        Args:
+            task_dict: Sample dictionary with question, context, target
+            data_processor: Data processor for evaluation
+            step_id: Identifier string for this step (e.g., "train_e_1_s_10" or "online_train_w_1_s_5")
+            epoch: Current epoch number
+            step: Current step number
+            usage_log_path: Path for bullet usage logging
+            log_dir: Path for logging directory
+            config_params: Configuration parameters dictionary
+            total_samples: Total number of samples in dataset
+            initial_generation: Optional precomputed (gen_response, bullet_ids, playbook)
+                for STEP 1 (prefetched or reused from a window test)
+            
+        Returns:
+            Tuple of (pre_train_answer, post_train_answer, tracking_dict)
+        """
+        # Extract configuration
+        curator_frequency = config_params['curator_frequency']
+        token_budget = config_params['token_budget']
+        use_json_mode = config_params['use_json_mode']
+        no_ground_truth = config_params['no_ground_truth']
+        
+        # Extract sample data
+        question = task_dict.get("question", "")
+        context = task_dict.get("context", "")
+        target = task_dict.get("target", "")
+        
+        # Fused mode: the reflection of a curator step also proposes the operations
+        curation = None
+        if config_params['fused_reflect_curate'] and curator_frequency == 1:
+            curation = {
+                "current_step": step,
+                "total_samples": total_samples,
+                "token_budget": token_budget,
+                "playbook_stats": get_playbook_stats(self.playbook),
+            }
+        
+        # STEP 1-2: Initial generation, reflection and regeneration
+        reflected = self._generate_and_reflect(
+            task_dict=task_dict,
+            data_processor=data_processor,
+            playbook=self.playbook,
+            step_id=step_id,
+            epoch=epoch,
+            step=step,
+            usage_log_path=usage_log_path,
+            log_dir=log_dir,
+            config_params=config_params,
+            initial_generation=initial_generation,
+            skip_draw=self.rng.random() if config_params['reflect_on_correct_skip_rate'] > 0 else None,
+            curation=curation
+        )
+        self.playbook = reflected["playbook"]
+        pre_train_answer = reflected["pre_train_answer"]
+        tracking_dict = reflected["tracking_dict"]
+        reflection_content = reflected["reflection_content"]
+        
+        # STEP 3: Curator - Periodically update playbook
+        if curator_frequency > 1:
+            # Keep every reflection until the next curator run
+            self.reflection_buffer.add(step, reflection_content, context, reflected["cited_bullet_ids"])
+        if step % curator_frequency == 0:
+            log.info(f"\n--- Running Curator at step {step} ---")
+            
+            stats = get_playbook_stats(self.playbook)
+            recent_reflection, question_context = reflection_content, context
+            cited_ids = reflected["cited_bullet_ids"]
+            if curator_frequency > 1:
+                buffered = self.reflection_buffer.drain()
+                if buffered:
+                    log.info(f"Curating {len(buffered)} buffered reflections")
+                    recent_reflection, question_context = Curator.format_reflection_batch(buffered)
+                    cited_ids = self._buffered_bullet_ids(buffered)
+            
+            with trace_span("curate", "stage", step_id=step_id) as span:
+                operations = reflected["curator_operations"]
+                if operations is not None:
+                    log.info("Applying operations proposed by the fused reflector-curator call")
+                    updated_playbook, self.next_global_id = self.curator.apply_operations(
+                        self.playbook, operations, self.next_global_id,
+                        current_step=step, call_id=step_id, log_dir=log_dir
+                    )
+                    if updated_playbook is None:
+                        operations = []
+                    else:
+                        self.playbook = updated_playbook
+                else:
+                    self.playbook, self.next_global_id, operations, _ = self.curator.curate(
+                        current_playbook=self.playbook,
+                        recent_reflection=recent_reflection,
+                        question_context=question_context,
+                        current_step=step,
+                        total_samples=total_samples,
+                        token_budget=token_budget,
+                        playbook_stats=stats,
+                        use_ground_truth=not no_ground_truth,
+                        use_json_mode=use_json_mode,
+                        call_id=step_id,
+                        log_dir=log_dir,
+                        next_global_id=self.next_global_id,
+                        playbook_view=self._curator_playbook_view(
+                            self.playbook, recent_reflection, question_context, cited_ids, config_params
+                        )
+                    )
+                span.set("operations", len(operations))
+            
+            # Run bulletpoint analyzer if enabled
+            if self.use_bulletpoint_analyzer and self.bulletpoint_analyzer:
+                log.info(f"  Running BulletpointAnalyzer (threshold={self.bulletpoint_analyzer_threshold})...")
+                with trace_span("bulletpoint_analyzer", "stage", step_id=step_id):
+                    self.playbook = self.bulletpoint_analyzer.analyze(
+                        playbook=self.playbook,
+                        threshold=self.bulletpoint_analyzer_threshold,
+                        merge=True
+                    )
+        
+        # STEP 4: Post-curator generation ('deferred' leaves it to the training loop)
+        post_curate_mode = config_params['post_curate_generation']
+        if self._skip_post_curate(reflected["generation_playbook"], post_curate_mode):
+            if post_curate_mode == 'off':
+                tracking_dict["post_train_result"] = None
+                return pre_train_answer, None, tracking_dict
+            log.info("Playbook content unchanged, reusing the initial answer as post-curate answer")
+            tracking_dict["post_train_result"] = {**tracking_dict["pre_train_result"], "reused_pre_train": True}
+            return pre_train_answer, pre_train_answer, tracking_dict
+        if post_curate_mode == 'deferred':
+            tracking_dict["post_train_result"] = None
+            return pre_train_answer, None, tracking_dict
+        
+        with trace_span("generate_post_curate", "stage", step_id=step_id):
+            gen_response, _, _ = self.generator.generate(
+                question=question,
+                playbook=self.playbook,
+                context=context,
+                reflection="(empty)",
+                use_json_mode=use_json_mode,
+                call_id=f"{step_id}_post_curate",
+                log_dir=log_dir
+            )
+        
+        final_answer = extract_answer(gen_response)
+        post_train_answer = final_answer
+        tracking_dict["post_train_result"] = self._post_train_result(
+            final_answer, target, data_processor, self.playbook
+        )
+        
+        return pre_train_answer, post_train_answer, tracking_dict
+    
+    def _train_batch(
+        self,
+        batch: List[Dict[str, Any]],
+        data_processor,
+        step_ids: List[str],
+        epoch: int,
+        steps: List[int],
+        usage_log_path: str,
+        log_dir: str,
+        config_params: Dict[str, Any],
+        total_samples: int
+    ) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Train on a mini-batch of samples against one playbook version.
+        
+        All samples generate and reflect concurrently against the current
+        playbook. Their helpful/harmful tags are summed and applied once, then
+        the curator proposes operations for every sample whose step is a
+        curator step, all against that same version. The operations are merged
+        in sample order (duplicate ADDs collapsed) and applied as one new
+        playbook version, which the post-curate generations then use.
+        
+        Args:
+            batch: Sample dictionaries with question, context, target
+            data_processor: Data processor for evaluation
+            step_ids: Identifier string for each sample's step
+            epoch: Current epoch number
+            steps: Step number of each sample
+            usage_log_path: Path for bullet usage logging
+            log_dir: Path for logging directory
+            config_params: Configuration parameters dictionary
+            total_samples: Total number of samples in dataset
+            
+        Returns:
+            List of (pre_train_answer, post_train_answer, tracking_dict), one per sample
+        """
+        curator_frequency = config_params['curator_frequency']
+        token_budget = config_params['token_budget']
+        use_json_mode = config_params['use_json_mode']
+        no_ground_truth = config_params['no_ground_truth']
+        
+        with ThreadPoolExecutor(max_workers=len(batch), thread_name_prefix="ace-batch") as executor:
+            # STEP 1-2: Generate and reflect against the same playbook version
+            playbook = self.playbook
+            skip_draws = [
+                self.rng.random() if config_params['reflect_on_correct_skip_rate'] > 0 else None
+                for _ in batch
+            ]
+            curations = [None] * len(batch)
+            if config_params['fused_reflect_curate'] and curator_frequency == 1:
+                snapshot_stats = get_playbook_stats(playbook)
+                curations = [{
+                    "current_step": step,
+                    "total_samples": total_samples,
+                    "token_budget": token_budget,
+                    "playbook_stats": snapshot_stats,
+                } for step in steps]
+            reflected = list(executor.map(
+                lambda args: self._generate_and_reflect(
+                    task_dict=args[0],
+                    data_processor=data_processor,
+                    playbook=playbook,
+                    step_id=args[1],
+                    epoch=epoch,
+                    step=args[2],
+                    usage_log_path=usage_log_path,
+                    log_dir=log_dir,
+                    config_params=config_params,
+                    skip_draw=args[3],
+                    curation=args[4]
+                ),
+                zip(batch, step_ids, steps, skip_draws, curations)
+            ))
+            
+            # Counter updates commute, so their sum is independent of completion order
+            deltas = merge_bullet_tags(
+                bullet_tags for item in reflected for bullet_tags in item["bullet_tags"]
+            )
+            playbook = apply_bullet_count_deltas(playbook, deltas)
+            
+            # STEP 3: Curator proposals for all curator steps, merged into one update.
+            # With curator_frequency > 1 each curator step gets the reflections
+            # buffered since the previous curator run.
+            curate_indices = []
+            curator_inputs = []
+            for i, step in enumerate(steps):
+                recent_reflection = reflected[i]["reflection_content"]
+                question_context = batch[i].get("context", "")
+                cited_ids = reflected[i]["cited_bullet_ids"]
+                if curator_frequency > 1:
+                    self.reflection_buffer.add(step, recent_reflection, question_context, cited_ids)
+                if step % curator_frequency == 0:
+                    if curator_frequency > 1:
+                        buffered = self.reflection_buffer.drain()
+                        if buffered:
+                            recent_reflection, question_context = Curator.format_reflection_batch(buffered)
+                            cited_ids = self._buffered_bullet_ids(buffered)
+                    curate_indices.append(i)
+                    curator_inputs.append((recent_reflection, question_context, cited_ids))
+            if curate_indices:
+                log.info(f"\n--- Running Curator for {len(curate_indices)} samples at steps "
+                         f"{steps[curate_indices[0]]}-{steps[curate_indices[-1]]} ---")
+                stats = get_playbook_stats(playbook)
+                
+                with trace_span("curate_batch", "stage", samples=len(curate_indices)) as span:
+                    proposals = list(executor.map(
+                        lambda i, inputs: reflected[i]["curator_operations"]
+                        if reflected[i]["curator_operations"] is not None
+                        else self.curator.propose_operations(
+                            current_playbook=playbook,
+                            recent_reflection=inputs[0],
+                            question_context=inputs[1],
+                            current_step=steps[i],
+                            total_samples=total_samples,
+                            token_budget=token_budget,
+                            playbook_stats=stats,
+                            use_ground_truth=not no_ground_truth,
+                            use_json_mode=use_json_mode,
+                            call_id=step_ids[i],
+                            log_dir=log_dir,
+                            playbook_view=self._curator_playbook_view(
+                                playbook, inputs[0], inputs[1], inputs[2], config_params
+                            )
+                        )[0],
+                        curate_indices, curator_inputs
+                    ))
+                    proposed_count = sum(len(operations or []) for operations in proposals)
+                    operations = merge_curator_operations(proposals)
+                    span.set("operations", len(operations))
+                    log.info(f"Merged {proposed_count} proposed operations into {len(operations)} "
+                             f"({proposed_count - len(operations)} duplicates collapsed)")
+                    
+                    if operations:
+                        updated_playbook, self.next_global_id = self.curator.apply_operations(
+                            playbook, operations, self.next_global_id,
+                            current_step=steps[-1],
+                            call_id=f"train_e_{epoch}_batch_{steps[0]}_{steps[-1]}",
+                            log_dir=log_dir
+                        )
+                        if updated_playbook is not None:
+                            playbook = updated_playbook
+                self.playbook = playbook
+                
+                # Run bulletpoint analyzer if enabled
+                if self.use_bulletpoint_analyzer and self.bulletpoint_analyzer:
+                    log.info(f"  Running BulletpointAnalyzer (threshold={self.bulletpoint_analyzer_threshold})...")
+                    with trace_span("bulletpoint_analyzer", "stage", steps=f"{steps[0]}-{steps[-1]}"):
+                        self.playbook = self.bulletpoint_analyzer.analyze(
+                            playbook=self.playbook,
+                            threshold=self.bulletpoint_analyzer_threshold,
+                            merge=True
+                        )
+            else:
+                self.playbook = playbook
+            
+            # STEP 4: Post-curator generations against the new version
+            # ('deferred' leaves them to the training loop)
+            post_curate_mode = config_params['post_curate_generation']
+            playbook = self.playbook
+            skipped = [self._skip_post_curate(item["generation_playbook"], post_curate_mode) for item in reflected]
+            to_generate = [] if post_curate_mode == 'deferred' else [
+                (task_dict, step_id) for task_dict, step_id, skip in zip(batch, step_ids, skipped) if not skip
+            ]
+            post_responses = iter(list(executor.map(
+                lambda args: self.generator.generate(
+                    question=args[0].get("question", ""),
+                    playbook=playbook,
+                    context=args[0].get("context", ""),
+                    reflection="(empty)",
+                    use_json_mode=use_json_mode,
+                    call_id=f"{args[1]}_post_curate",
+                    log_dir=log_dir
+                )[0],
+                to_generate
+            )))
+        
+        outputs = []
+        for task_dict, item, skip in zip(batch, reflected, skipped):
+            tracking_dict = item["tracking_dict"]
+            if skip and post_curate_mode != 'off':
+                post_train_answer = item["pre_train_answer"]
+                tracking_dict["post_train_result"] = {**tracking_dict["pre_train_result"], "reused_pre_train": True}
+            elif skip or post_curate_mode == 'deferred':
+                post_train_answer = None
+                tracking_dict["post_train_result"] = None
+            else:
+                post_train_answer = extract_answer(next(post_responses))
+                tracking_dict["post_train_result"] = self._post_train_result(
+                    post_train_answer, task_dict.get("target", ""), data_processor, playbook
+                )
+            outputs.append((item["pre_train_answer"], post_train_answer, tracking_dict))
+        return outputs
+    
+    def _validate_playbook(
+        self,
+        job: Dict[str, Any],
+        data_processor,
+        val_samples: List[Dict[str, Any]],
+        log_dir: str,
+        config_params: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Validate the playbook snapshot of a periodic evaluation.
+        
+        With sequential_validation, random stratified chunks are evaluated until
+        the accuracy interval is clearly below the reference accuracy: the best
+        full-set validation accuracy among the validations completed when this
+        one starts (including background validations not yet recorded by the
+        training loop). Playbooks that may beat it are evaluated on the full set.
+        
+        Args:
+            job: Evaluation job with epoch, step, playbook and seed
+            data_processor: Data processor instance for the task
+            val_samples: List of validation samples
+            log_dir: Directory for detailed logs
+            config_params: Extracted configuration parameters
+            
+        Returns:
+            Tuple of (val_results, val_error_log)
+        """
+        with trace_span("validation", "eval", epoch=job["epoch"], step=job["step"],
+                        samples=len(val_samples)) as span:
+            if config_params['sequential_validation']:
+                with self._validation_lock:
+                    reference_accuracy = self._best_validated_accuracy
+                val_results, val_error_log = evaluate_test_set_sequential(
+                    data_processor, self.answer_generator, job["playbook"], val_samples,
+                    reference_accuracy=reference_accuracy,
+                    max_tokens=self.max_tokens, log_dir=log_dir,
+                    max_workers=config_params['test_workers'],
+                    use_json_mode=config_params['use_json_mode'],
+                    chunk_size=config_params['validation_chunk_size'],
+                    confidence=config_params['validation_confidence'],
+                    seed=job["seed"]
+                )
+                span.set("samples_saved", val_results["sequential"]["samples_saved"])
+            else:
+                val_results, val_error_log = evaluate_test_set(
+                    data_processor, self.answer_generator, job["playbook"],
+                    val_samples, self.max_tokens, log_dir,
+                    max_workers=config_params['test_workers'],
+                    use_json_mode=config_params['use_json_mode'],
+                    pack_size=config_params['eval_pack_size'],
+                    pack_token_budget=config_params['eval_pack_token_budget']
+                )
+        if self._is_full_validation(val_results):
+            with self._validation_lock:
+                if self._best_validated_accuracy is None or val_results["accuracy"] > self._best_validated_accuracy:
+                    self._best_validated_accuracy = val_results["accuracy"]
+        return val_results, val_error_log
+    
+    @staticmethod
+    def _is_full_validation(val_results: Dict[str, Any]) -> bool:
+        """Whether a validation covered the whole validation set (did not stop early)"""
+        if not val_results:
+            return False
+        sequential = val_results.get("sequential")
+        return sequential is None or sequential["samples_saved"] == 0
+    
+    def _offline_train(
+        self,
+        train_samples: List[Dict[str, Any]],
+        val_samples: List[Dict[str, Any]],
+        data_processor,
+        config: Dict[str, Any],
+        save_path: str,
+        usage_log_path: str,
+        playbook_dir: str,
+        log_dir: str
+    ) -> Dict[str, Any]:
+        """
+        Run offline training
+        
+        Args:
+            train_samples: List of training samples
             val_samples: List of validation samples
             data_processor: Data processor instance for the task
             config: Configuration dictionary
@@ -666,73 +1944,267 @@ class ACE:
         test_workers = config_params['test_workers']
         use_json_mode = config_params['use_json_mode']
         curator_frequency = config_params['curator_frequency']
+        checkpoint_steps = config_params['checkpoint_steps']
+        pipeline_depth = config_params['pipeline_depth']
+        batch_size = max(1, config_params['batch_size'])
+        post_curate_mode = config_params['post_curate_generation']
+        sequential_validation = config_params['sequential_validation']
+        
+        # Pipelined mode: prefetch initial generations for the next samples
+        # while the current one is reflected on and curated
+        if pipeline_depth > 0 and batch_size > 1:
+            log.warning("pipeline_depth is ignored when batch_size > 1")
+        elif pipeline_depth > 0:
+            self._prefetcher = _GenerationPrefetcher(
+                self, pipeline_depth, config_params['max_staleness'], log_dir, use_json_mode
+            )
+        # Async validation: validate playbook snapshots while training continues
+        if config_params['async_validation'] and val_samples:
+            self._validator = _BackgroundValidator(
+                lambda job: self._validate_playbook(job, data_processor, val_samples, log_dir, config_params),
+                config_params['max_concurrent_validations']
+            )
+        train_start_time = time.perf_counter()
         
         # Initialize tracking
         results = []
         pre_train_post_train_results = []
         error_logs = []
         best_accuracy = 0.0
-        self.best_playbook = self.playbook
+        # Post-curate generations waiting for the next eval interval ('deferred' mode)
+        deferred_post_curate = []
+        # Playbook snapshots of the deferred items, one per playbook version
+        deferred_playbooks = {}
+        # Samples/tokens evaluated and saved by sequential validation
+        validation_stats = {"samples_evaluated": 0, "samples_saved": 0,
+                            "tokens_used": 0, "estimated_tokens_saved": 0}
+        start_epoch, completed_steps = 1, 0
+        resume_state, self._resume_state = self._resume_state, None
+        if resume_state:
+            # Continue from checkpoint (playbooks were restored in run())
+            results = resume_state["results"]
+            pre_train_post_train_results = resume_state["pre_train_post_train_results"]
+            error_logs = resume_state["error_logs"]
+            best_accuracy = resume_state["best_accuracy"]
+            deferred_post_curate = resume_state.get("deferred_post_curate", [])
+            deferred_playbooks = resume_state.get("deferred_playbooks", {})
+            validation_stats = resume_state.get("validation_stats", validation_stats)
+            start_epoch, completed_steps = resume_state["epoch"], resume_state["step"]
+            log.info(f"Resuming at epoch {start_epoch}, after step {completed_steps}")
+        else:
+            self.best_playbook = self.playbook
+        self._best_validated_accuracy = max(
+            (result["val_result"]["accuracy"] for result in results
+             if self._is_full_validation(result["val_result"])),
+            default=None
+        )
 
-        print(f"Total epochs: {num_epochs}")
-        print(f"Train samples per epoch: {len(train_samples)}")
-        print(f"Val samples: {len(val_samples)}")
-        print(f"Curator frequency: every {curator_frequency} steps")
-        print(f"Evaluation frequency: every {eval_steps} steps\n")
+        log.info(f"Total epochs: {num_epochs}")
+        log.info(f"Train samples per epoch: {len(train_samples)}")
+        log.info(f"Val samples: {len(val_samples)}")
+        log.info(f"Curator frequency: every {curator_frequency} steps")
+        log.info(f"Evaluation frequency: every {eval_steps} steps")
+        if batch_size > 1:
+            log.info(f"Mini-batch size: {batch_size}")
+        if pipeline_depth > 0:
+            log.info(f"Pipeline depth: {pipeline_depth} (max staleness: {config_params['max_staleness']} playbook versions)")
+        if self._validator:
+            log.info(f"Async validation: up to {self._validator.max_concurrent} concurrent")
+        if config_params['sequential_validation']:
+            log.info(f"Sequential validation: {config_params['validation_confidence']:.0%} confidence")
+        
+        def reached(every, first_step, last_step):
+            """True if a multiple of `every` lies in [first_step, last_step]"""
+            return every > 0 and last_step // every > (first_step - 1) // every
+        
+        def train_state(epoch, step):
+            return {
+                "epoch": epoch,
+                "step": step,
+                "best_accuracy": best_accuracy,
+                "results": results,
+                "pre_train_post_train_results": pre_train_post_train_results,
+                "error_logs": error_logs,
+                "deferred_post_curate": deferred_post_curate,
+                "deferred_playbooks": deferred_playbooks,
+                "pending_validations": self._validator.checkpoint_jobs() if self._validator else [],
+                "validation_stats": validation_stats,
+                "epoch_answers_pre_train": epoch_answers_pre_train,
+                "epoch_targets_pre_train": epoch_targets_pre_train,
+                "epoch_answers_post_train": epoch_answers_post_train,
+                "epoch_targets_post_train": epoch_targets_post_train,
+            }
+        
+        def save_checkpoint_at(epoch, step):
+            """Checkpoint the loop; result lists go to the journal up to the first deferred sample"""
+            stable = {}
+            if deferred_post_curate:
+                stable = {
+                    "pre_train_post_train_results": min(item["result_index"] for item in deferred_post_curate),
+                    "epoch_answers_post_train": min(item["answer_index"] for item in deferred_post_curate),
+                }
+            self._save_checkpoint(save_path, train_state(epoch, step), journaled=[
+                "results", "pre_train_post_train_results", "error_logs",
+                "epoch_answers_pre_train", "epoch_targets_pre_train",
+                "epoch_answers_post_train", "epoch_targets_post_train",
+            ], stable=stable)
+        
+        def record_validation(job, val_results, val_error_log):
+            """Attach a validation of job["playbook"] to its step and track the best playbook"""
+            nonlocal best_accuracy
+            playbook = job["playbook"]
+            results.append({
+                "epoch": job["epoch"],
+                "step": job["step"],
+                "train_result": job["train_result"],
+                "val_result": val_results,
+                "playbook_num_tokens": count_tokens(playbook),
+                "playbook_length": len(playbook),
+                "playbook_stats": get_playbook_stats(playbook)
+            })
+            error_logs.append({
+                "epoch": job["epoch"],
+                "step": job["step"],
+                "val_results": val_results,
+                "error_log": val_error_log
+            })
+            if val_results.get("sequential"):
+                for key in validation_stats:
+                    validation_stats[key] += val_results["sequential"][key]
+            
+            # Track best playbook; only full-set accuracies are comparable, so a
+            # sequential validation that stopped early never becomes the best
+            if val_results:
+                acc = val_results["accuracy"]
+                metrics.ACCURACY.set(acc, scope="validation")
+                if self._is_full_validation(val_results) and acc > best_accuracy:
+                    best_accuracy = acc
+                    self.best_playbook = playbook
+                    log.info(f"🎉 New best accuracy: {best_accuracy:.3f} "
+                             f"(epoch {job['epoch']}, step {job['step']})")
+            
+            # Save results
+            results_path = os.path.join(save_path, "train_results.json")
+            with open(results_path, "w") as f:
+                json.dump({
+                    "best_accuracy": best_accuracy,
+                    "results": results,
+                    **({"validation_stats": validation_stats} if sequential_validation else {}),
+                }, f, indent=2)
+            
+            error_logs_path = os.path.join(save_path, "val_results.json")
+            with open(error_logs_path, "w") as f:
+                json.dump(error_logs, f, indent=2)
+        
+        # Validations not yet recorded when the checkpoint was written (unfinished ones are re-run)
+        if self._validator and resume_state:
+            for finished in self._validator.resume(resume_state.get("pending_validations", [])):
+                record_validation(*finished)
         
         # Training loop
-        for epoch in range(1, num_epochs + 1):
-            print(f"\n{'='*60}")
-            print(f"EPOCH {epoch}/{num_epochs}")
-            print(f"{'='*60}")
+        for epoch in range(start_epoch, num_epochs + 1):
+            log.info(f"\n{'='*60}")
+            log.info(f"EPOCH {epoch}/{num_epochs}")
+            log.info(f"{'='*60}")
             
             epoch_answers_pre_train = []
             epoch_targets_pre_train = []
             epoch_answers_post_train = []
             epoch_targets_post_train = []
+            skip_steps = 0
+            if resume_state and epoch == start_epoch:
+                epoch_answers_pre_train = resume_state["epoch_answers_pre_train"]
+                epoch_targets_pre_train = resume_state["epoch_targets_pre_train"]
+                epoch_answers_post_train = resume_state["epoch_answers_post_train"]
+                epoch_targets_post_train = resume_state["epoch_targets_post_train"]
+                skip_steps = completed_steps
             
-            for step, task_dict in enumerate(train_samples):
-                step += 1
-                print(f"\n--- Step {step}/{len(train_samples)} ---")
+            for batch_start in range(skip_steps, len(train_samples), batch_size):
+                batch = train_samples[batch_start:batch_start + batch_size]
+                batch_steps = list(range(batch_start + 1, batch_start + len(batch) + 1))
+                step = batch_steps[-1]
                 
-                target = task_dict.get("target", "")
+                if batch_size == 1:
+                    task_dict = batch[0]
+                    log.info(f"\n--- Step {step}/{len(train_samples)} ---")
+                    
+                    # Keep initial generations running for this and the next samples
+                    initial_generation = None
+                    if self._prefetcher:
+                        for ahead in range(step, min(step + pipeline_depth, len(train_samples)) + 1):
+                            self._prefetcher.schedule((epoch, ahead), train_samples[ahead - 1],
+                                                      f"train_e_{epoch}_s_{ahead}")
+                        initial_generation = self._prefetcher.take((epoch, step))
+                    
+                    # Use helper method for training single sample
+                    with trace_span("train_sample", "train", epoch=epoch, step=step):
+                        step_outputs = [self._train_single_sample(
+                            task_dict=task_dict,
+                            data_processor=data_processor,
+                            step_id=f"train_e_{epoch}_s_{step}",
+                            epoch=epoch,
+                            step=step,
+                            usage_log_path=usage_log_path,
+                            log_dir=log_dir,
+                            config_params=config_params,
+                            total_samples=len(train_samples),
+                            initial_generation=initial_generation
+                        )]
+                else:
+                    log.info(f"\n--- Steps {batch_steps[0]}-{step}/{len(train_samples)} (mini-batch) ---")
+                    
+                    # Train the whole mini-batch against one playbook version
+                    with trace_span("train_batch", "train", epoch=epoch, first_step=batch_steps[0], step=step):
+                        step_outputs = self._train_batch(
+                            batch=batch,
+                            data_processor=data_processor,
+                            step_ids=[f"train_e_{epoch}_s_{s}" for s in batch_steps],
+                            epoch=epoch,
+                            steps=batch_steps,
+                            usage_log_path=usage_log_path,
+                            log_dir=log_dir,
+                            config_params=config_params,
+                            total_samples=len(train_samples)
+                        )
+                
+                for task_dict, sample_step, (pre_train_answer, post_train_answer, tracking_dict) in zip(
+                        batch, batch_steps, step_outputs):
+                    target = task_dict.get("target", "")
+                    self._record_step_metrics("offline", tracking_dict)
+                    
+                    # Collect answers for accuracy calculation
+                    epoch_answers_pre_train.append(pre_train_answer)
+                    epoch_targets_pre_train.append(target)
+                    epoch_answers_post_train.append(post_train_answer)
+                    epoch_targets_post_train.append(target)
+                    
+                    # Track pre-train and post-train results
+                    pre_train_post_train_result = {
+                        "epoch": epoch,
+                        "step": sample_step,
+                        "target": target,
+                        **tracking_dict
+                    }
+                    pre_train_post_train_results.append(pre_train_post_train_result)
+                    
+                    if post_train_answer is None and post_curate_mode == 'deferred':
+                        deferred_playbooks.setdefault(str(self.playbook_version), self.playbook)
+                        deferred_post_curate.append({
+                            "task_dict": task_dict,
+                            "playbook_version": str(self.playbook_version),
+                            "step_id": f"train_e_{epoch}_s_{sample_step}",
+                            "result_index": len(pre_train_post_train_results) - 1,
+                            "answer_index": len(epoch_answers_post_train) - 1,
+                        })
                 
-                # Use helper method for training single sample
-                pre_train_answer, post_train_answer, tracking_dict = self._train_single_sample(
-                    task_dict=task_dict,
-                    data_processor=data_processor,
-                    step_id=f"train_e_{epoch}_s_{step}",
-                    epoch=epoch,
-                    step=step,
-                    usage_log_path=usage_log_path,
-                    log_dir=log_dir,
-                    config_params=config_params,
-                    total_samples=len(train_samples)
-                )
-
                 # Rate limiting sleep if configured
                 sleep_seconds = config.get('sleep_between_steps', 0)
                 if sleep_seconds > 0:
-                    print(f"Sleeping {sleep_seconds}s for rate limiting...")
+                    log.info(f"Sleeping {sleep_seconds}s for rate limiting...")
                     time.sleep(sleep_seconds)
                 
-                # Collect answers for accuracy calculation
-                epoch_answers_pre_train.append(pre_train_answer)
-                epoch_targets_pre_train.append(target)
-                epoch_answers_post_train.append(post_train_answer)
-                epoch_targets_post_train.append(target)
-                
-                # Track pre-train and post-train results
-                pre_train_post_train_result = {
-                    "epoch": epoch,
-                    "step": step,
-                    "target": target,
-                    **tracking_dict
-                }
-                pre_train_post_train_results.append(pre_train_post_train_result)
-                
                 # Save intermediate playbook
-                if step % save_steps == 0:
+                if reached(save_steps, batch_steps[0], step):
                     intermediate_path = os.path.join(
                         playbook_dir, f"epoch_{epoch}_step_{step}_playbook.txt"
                     )
@@ -740,10 +2212,15 @@ class ACE:
                         f.write(self.playbook)
                 
                 # Periodic evaluation
-                if step % eval_steps == 0:
-                    print(f"\n{'='*40}")
-                    print(f"EVALUATION AT EPOCH {epoch}, STEP {step}")
-                    print(f"{'='*40}")
+                if reached(eval_steps, batch_steps[0], step):
+                    log.info(f"\n{'='*40}")
+                    log.info(f"EVALUATION AT EPOCH {epoch}, STEP {step}")
+                    log.info(f"{'='*40}")
+                    
+                    self._run_deferred_post_curate(
+                        deferred_post_curate, deferred_playbooks, pre_train_post_train_results, epoch_answers_post_train,
+                        data_processor, log_dir, config_params
+                    )
                     
                     # Compute training accuracies
                     pre_train_accuracy = data_processor.evaluate_accuracy(
@@ -751,56 +2228,45 @@ class ACE:
                     )
                     post_train_accuracy = data_processor.evaluate_accuracy(
                         epoch_answers_post_train, epoch_targets_post_train
-                    )
+                    ) if post_curate_mode != 'off' else None
                     
-                    # Validation evaluation
-                    val_results = {}
-                    if val_samples:
-                        val_results, val_error_log = evaluate_test_set(
-                            data_processor, self.generator, self.playbook, 
-                            val_samples, self.max_tokens, log_dir, 
-                            max_workers=test_workers, use_json_mode=use_json_mode
-                        )
-                    
-                    result = {
+                    job = {
                         "epoch": epoch,
                         "step": step,
                         "train_result": {
                             "pre_train_accuracy": pre_train_accuracy,
                             "post_train_accuracy": post_train_accuracy
                         },
-                        "val_result": val_results,
-                        "playbook_num_tokens": count_tokens(self.playbook),
-                        "playbook_length": len(self.playbook),
-                        "playbook_stats": get_playbook_stats(self.playbook)
+                        "playbook": self.playbook,
+                        "seed": self.rng.getrandbits(32) if sequential_validation else None,
                     }
-                    results.append(result)
-                    error_logs.append({
-                        "epoch": epoch,
-                        "step": step,
-                        "val_results": val_results,
-                        "error_log": val_error_log
-                    })
-
-                    # Track best playbook
-                    if val_results:
-                        acc = val_results["accuracy"]
-                        if acc > best_accuracy:
-                            best_accuracy = acc
-                            self.best_playbook = self.playbook
-                            print(f"🎉 New best accuracy: {best_accuracy:.3f}")
-                    
-                    # Save results
-                    results_path = os.path.join(save_path, "train_results.json")
-                    with open(results_path, "w") as f:
-                        json.dump({
-                            "best_accuracy": best_accuracy,
-                            "results": results,
-                        }, f, indent=2)
                     
-                    error_logs_path = os.path.join(save_path, "val_results.json")
-                    with open(error_logs_path, "w") as f:
-                        json.dump(error_logs, f, indent=2)
+                    # Validation evaluation
+                    if self._validator:
+                        for finished in self._validator.submit(job):
+                            record_validation(*finished)
+                        log.info(f"Validation of the step {step} playbook running in the background")
+                    else:
+                        val_results, val_error_log = {}, None
+                        if val_samples:
+                            val_results, val_error_log = self._validate_playbook(
+                                job, data_processor, val_samples, log_dir, config_params
+                            )
+                        record_validation(job, val_results, val_error_log)
+                
+                # Pick up background validations that finished during this step
+                if self._validator:
+                    for finished in self._validator.poll():
+                        record_validation(*finished)
+                
+                # Checkpoint after the step (and its evaluation) completed
+                if reached(checkpoint_steps, batch_steps[0], step):
+                    save_checkpoint_at(epoch, step)
+            
+            self._run_deferred_post_curate(
+                deferred_post_curate, deferred_playbooks, pre_train_post_train_results, epoch_answers_post_train,
+                data_processor, log_dir, config_params
+            )
             
             # End of epoch - save final playbook
             epoch_playbook_path = os.path.join(
@@ -808,6 +2274,46 @@ class ACE:
             )
             with open(epoch_playbook_path, "w") as f:
                 f.write(self.playbook)
+            
+            # Next epoch starts with empty answer lists
+            epoch_answers_pre_train = []
+            epoch_targets_pre_train = []
+            epoch_answers_post_train = []
+            epoch_targets_post_train = []
+            save_checkpoint_at(epoch + 1, 0)
+
+        # Don't lose reflections buffered after the last curator step
+        self._curate_remaining_reflections(
+            step=len(train_samples),
+            step_id=f"train_e_{num_epochs}_final_curate",
+            log_dir=log_dir,
+            config_params=config_params,
+            total_samples=len(train_samples)
+        )
+
+        if self._validator:
+            for finished in self._validator.drain():
+                record_validation(*finished)
+            log.info(f"Async validation: training waited {self._validator.wait_seconds:.1f}s "
+                     f"on background validations")
+            self._validator.close()
+            self._validator = None
+
+        reflection_skip_stats = None
+        if config_params['reflect_on_correct_skip_rate'] > 0:
+            reflection_skip_stats = self._reflection_skip_summary()
+            self._log_reflection_skip_summary(reflection_skip_stats)
+
+        pipeline_stats = None
+        if self._prefetcher:
+            pipeline_stats = self._prefetcher.summary(time.perf_counter() - train_start_time)
+            self._prefetcher.close()
+            self._prefetcher = None
+            log.info(f"Pipeline: {pipeline_stats['prefetched_used']} prefetched generations used, "
+                     f"{pipeline_stats['prefetched_discarded']} discarded as stale; "
+                     f"staleness mean {pipeline_stats['mean_staleness']:.2f}, "
+                     f"max {pipeline_stats['max_observed_staleness']}; "
+                     f"estimated throughput gain {pipeline_stats['throughput_gain']:.2f}x over serial")
 
         # Save training results
         results_path = os.path.join(save_path, "train_results.json")
@@ -815,12 +2321,19 @@ class ACE:
             json.dump({
                 "best_accuracy": best_accuracy,
                 "results": results,
+                **({"pipeline_stats": pipeline_stats} if pipeline_stats else {}),
+                **({"validation_stats": validation_stats} if sequential_validation else {}),
+                **({"reflection_skip_stats": reflection_skip_stats} if reflection_skip_stats else {}),
             }, f, indent=2)
         
         pre_train_post_train_results_path = os.path.join(save_path, "pre_train_post_train_results.json")
         with open(pre_train_post_train_results_path, "w") as f:
             json.dump(pre_train_post_train_results, f, indent=2)
         
+        # Save per-bullet usage summary and flush buffered logs
+        self.bullet_usage.save(os.path.join(save_path, "bullet_usage_summary.json"))
+        flush_log_sinks()
+        
         # Save final playbook
         final_playbook_path = os.path.join(save_path, f"final_playbook.txt")
         with open(final_playbook_path, "w") as f:
@@ -831,13 +2344,23 @@ class ACE:
         with open(best_playbook_path, "w") as f:
             f.write(self.best_playbook)
         
-        print(f"\n{'='*60}")
-        print(f"OFFLINE TRAINING COMPLETE")
-        print(f"{'='*60}")
-        print(f"Best Validation Accuracy: {best_accuracy:.3f}")
-        print(f"{'='*60}\n")
+        log.info(f"\n{'='*60}")
+        log.info(f"OFFLINE TRAINING COMPLETE")
+        log.info(f"{'='*60}")
+        log.info(f"Best Validation Accuracy: {best_accuracy:.3f}")
+        log.info(f"{'='*60}\n")
 
-        return {"best_validation_accuracy": best_accuracy}
+        training_results = {"best_validation_accuracy": best_accuracy}
+        if pipeline_stats:
+            training_results["pipeline_stats"] = pipeline_stats
+        if sequential_validation:
+            log.info(f"Sequential validation: {validation_stats['samples_saved']} samples and "
+                     f"~{validation_stats['estimated_tokens_saved']} tokens saved "
+                     f"({validation_stats['samples_evaluated']} samples evaluated)")
+            training_results["validation_stats"] = validation_stats
+        if reflection_skip_stats:
+            training_results["reflection_skip_stats"] = reflection_skip_stats
+        return training_results
 
     
     def test(
@@ -921,10 +2444,16 @@ class ACE:
         use_json_mode = config_params['use_json_mode']
         test_workers = config_params['test_workers']
         online_eval_frequency = config.get('online_eval_frequency', 100)  # Get from config
+        checkpoint_steps = config_params['checkpoint_steps']
+        post_curate_mode = config_params['post_curate_generation']
         
         # Initialize tracking
         train_results = []
         pre_train_post_train_results = []
+        # Post-curate generations waiting for the end of the window ('deferred' mode)
+        deferred_post_curate = []
+        # Playbook snapshots of the deferred items, one per playbook version
+        deferred_playbooks = {}
         
         # Test tracking - accumulate across all windows
         correct_count_sample_based = 0
@@ -932,108 +2461,214 @@ class ACE:
         total_count = 0
         all_test_errors = []
         window_test_results = []
-        print(f"Total samples: {len(test_samples)}")
-        print(f"Window size: {online_eval_frequency}")
-        print(f"Number of windows: {(len(test_samples) + online_eval_frequency - 1) // online_eval_frequency}")
-        print(f"Curator frequency: every {curator_frequency} steps")
+        
+        start_window, completed_local_steps, window_test_done = 0, 0, False
+        global_step = 0
+        cumulative_test_accuracy = None
+        # Window-test generations by window index, reused as pre-train generations
+        # while the playbook is still the version the window was tested with
+        window_generations, window_playbook_version = {}, None
+        # The same generations as [index, generation] pairs, for the checkpoint journal
+        window_generation_items = []
+        resume_state, self._resume_state = self._resume_state, None
+        if resume_state:
+            # Continue from checkpoint (playbooks were restored in run())
+            train_results = resume_state["train_results"]
+            pre_train_post_train_results = resume_state["pre_train_post_train_results"]
+            correct_count_sample_based = resume_state["correct_count_sample_based"]
+            correct_count = resume_state["correct_count"]
+            total_count = resume_state["total_count"]
+            all_test_errors = resume_state["all_test_errors"]
+            window_test_results = resume_state["window_test_results"]
+            global_step = resume_state["global_step"]
+            cumulative_test_accuracy = resume_state["cumulative_test_accuracy"]
+            start_window = resume_state["window_idx"]
+            completed_local_steps = resume_state["local_step"]
+            window_test_done = resume_state["window_test_done"]
+            deferred_post_curate = resume_state.get("deferred_post_curate", [])
+            deferred_playbooks = resume_state.get("deferred_playbooks", {})
+            window_generation_items = resume_state.get("window_generations", [])
+            window_generations = {index: generation for index, generation in window_generation_items}
+            window_playbook_version = resume_state.get("window_playbook_version")
+        
+        def train_state(window_idx, local_step, test_done):
+            return {
+                "window_idx": window_idx,
+                "local_step": local_step,
+                "window_test_done": test_done,
+                "global_step": global_step,
+                "cumulative_test_accuracy": cumulative_test_accuracy,
+                "train_results": train_results,
+                "pre_train_post_train_results": pre_train_post_train_results,
+                "correct_count_sample_based": correct_count_sample_based,
+                "correct_count": correct_count,
+                "total_count": total_count,
+                "all_test_errors": all_test_errors,
+                "window_test_results": window_test_results,
+                "deferred_post_curate": deferred_post_curate,
+                "deferred_playbooks": deferred_playbooks,
+                "window_generations": window_generation_items if test_done else [],
+                "window_playbook_version": window_playbook_version,
+                "reused_test_generations": reused_test_generations,
+                "epoch_answers_pre_train": epoch_answers_pre_train,
+                "epoch_targets_pre_train": epoch_targets_pre_train,
+                "epoch_answers_post_train": epoch_answers_post_train,
+                "epoch_targets_post_train": epoch_targets_post_train,
+            }
+        
+        def save_checkpoint_at(window_idx, local_step, test_done):
+            """Checkpoint the loop; result lists go to the journal up to the first deferred sample"""
+            stable = {}
+            if deferred_post_curate:
+                stable = {
+                    "pre_train_post_train_results": min(item["result_index"] for item in deferred_post_curate),
+                    "epoch_answers_post_train": min(item["answer_index"] for item in deferred_post_curate),
+                }
+            self._save_checkpoint(save_path, train_state(window_idx, local_step, test_done), journaled=[
+                "train_results", "pre_train_post_train_results", "all_test_errors",
+                "window_test_results", "window_generations",
+                "epoch_answers_pre_train", "epoch_targets_pre_train",
+                "epoch_answers_post_train", "epoch_targets_post_train",
+            ], stable=stable)
+        
+        log.info(f"Total samples: {len(test_samples)}")
+        log.info(f"Window size: {online_eval_frequency}")
+        log.info(f"Number of windows: {(len(test_samples) + online_eval_frequency - 1) // online_eval_frequency}")
+        log.info(f"Curator frequency: every {curator_frequency} steps")
         
         # Split samples into windows
         num_windows = (len(test_samples) + online_eval_frequency - 1) // online_eval_frequency
         
         epoch = 1  # Always 1 epoch
-        global_step = 0
         
-        for window_idx in range(num_windows):
+        for window_idx in range(start_window, num_windows):
             start_idx = window_idx * online_eval_frequency
             end_idx = min((window_idx + 1) * online_eval_frequency, len(test_samples))
             window_samples = test_samples[start_idx:end_idx]
             
-            print(f"\n{'='*60}")
-            print(f"WINDOW {window_idx + 1}/{num_windows}")
-            print(f"Samples {start_idx} to {end_idx - 1}")
-            print(f"{'='*60}")
+            log.info(f"\n{'='*60}")
+            log.info(f"WINDOW {window_idx + 1}/{num_windows}")
+            log.info(f"Samples {start_idx} to {end_idx - 1}")
+            log.info(f"{'='*60}")
+            
+            epoch_answers_pre_train = []
+            epoch_targets_pre_train = []
+            epoch_answers_post_train = []
+            epoch_targets_post_train = []
+            reused_test_generations = 0
+            skip_steps = 0
+            if resume_state and window_idx == start_window:
+                epoch_answers_pre_train = resume_state["epoch_answers_pre_train"]
+                epoch_targets_pre_train = resume_state["epoch_targets_pre_train"]
+                epoch_answers_post_train = resume_state["epoch_answers_post_train"]
+                epoch_targets_post_train = resume_state["epoch_targets_post_train"]
+                reused_test_generations = resume_state.get("reused_test_generations", 0)
+                skip_steps = completed_local_steps
             
             # =================================================================
             # STEP 1: TEST on window with current playbook (before training)
             # =================================================================
-            print(f"\n--- Testing window {window_idx + 1} with current playbook ---")
-            
-            # Use evaluate_test_set for parallel evaluation
-            window_test_results_dict, window_test_error_log = evaluate_test_set(
-                data_processor,
-                self.generator,
-                self.playbook,
-                window_samples,
-                self.max_tokens,
-                log_dir,
-                max_workers=test_workers,
-                use_json_mode=use_json_mode
-            )
-            
-            # Extract results
-            window_accuracy = window_test_results_dict['accuracy']
-            window_correct = window_test_results_dict['correct']
-            window_total = window_test_results_dict['total']
-            correct_count_sample_based += window_correct
-            correct_count += window_accuracy * window_total
-            total_count += window_total
-            
-            # Add errors with window and global index information
-            for error in window_test_error_log['errors']:
-                all_test_errors.append({
+            if resume_state and window_idx == start_window and window_test_done:
+                log.info(f"\n--- Window {window_idx + 1} already tested, resuming training after step {skip_steps} ---")
+            else:
+                log.info(f"\n--- Testing window {window_idx + 1} with current playbook ---")
+                
+                # Use evaluate_test_set for parallel evaluation
+                window_generations = {}
+                window_playbook_version = self.playbook_version
+                with trace_span("window_test", "eval", window=window_idx + 1, samples=len(window_samples)):
+                    window_test_results_dict, window_test_error_log = evaluate_test_set(
+                        data_processor,
+                        self.answer_generator,
+                        self.playbook,
+                        window_samples,
+                        self.max_tokens,
+                        log_dir,
+                        max_workers=test_workers,
+                        use_json_mode=use_json_mode,
+                        generations=window_generations,
+                        pack_size=config_params['eval_pack_size'],
+                        pack_token_budget=config_params['eval_pack_token_budget']
+                    )
+                
+                # Extract results
+                window_accuracy = window_test_results_dict['accuracy']
+                window_correct = window_test_results_dict['correct']
+                window_total = window_test_results_dict['total']
+                correct_count_sample_based += window_correct
+                correct_count += window_accuracy * window_total
+                total_count += window_total
+                
+                # Add errors with window and global index information
+                for error in window_test_error_log['errors']:
+                    all_test_errors.append({
+                        "window": window_idx + 1,
+                        "global_index": start_idx + error['index'],
+                        "prediction": error['prediction'],
+                        "ground_truth": error['ground_truth']
+                    })
+                
+                window_test_results.append({
                     "window": window_idx + 1,
-                    "global_index": start_idx + error['index'],
-                    "prediction": error['prediction'],
-                    "ground_truth": error['ground_truth']
+                    "start_idx": start_idx,
+                    "end_idx": end_idx,
+                    "window_accuracy": window_accuracy,
+                    "window_correct": window_correct,
+                    "window_total": window_total
                 })
-            
-            window_test_results.append({
-                "window": window_idx + 1,
-                "start_idx": start_idx,
-                "end_idx": end_idx,
-                "window_accuracy": window_accuracy,
-                "window_correct": window_correct,
-                "window_total": window_total
-            })
-            
-            # Calculate cumulative test accuracy so far
-            cumulative_test_accuracy = correct_count / total_count
-            
-            print(f"Window {window_idx + 1} test accuracy: {window_accuracy:.3f}")
-            print(f"Cumulative test accuracy so far: {cumulative_test_accuracy:.3f} "
-                  f"({total_count} samples)")
+                
+                # Calculate cumulative test accuracy so far
+                cumulative_test_accuracy = correct_count / total_count
+                metrics.ACCURACY.set(window_accuracy, scope="online_window")
+                metrics.ACCURACY.set(cumulative_test_accuracy, scope="online_cumulative")
+                
+                log.info(f"Window {window_idx + 1} test accuracy: {window_accuracy:.3f}")
+                log.info(f"Cumulative test accuracy so far: {cumulative_test_accuracy:.3f} "
+                         f"({total_count} samples)")
+                
+                window_generation_items = sorted(window_generations.items())
+                save_checkpoint_at(window_idx, 0, True)
             
             # =================================================================
             # STEP 2: TRAIN on window (same as offline_train)
             # =================================================================
-            print(f"\n--- Training on window {window_idx + 1} ---")
-            
-            epoch_answers_pre_train = []
-            epoch_targets_pre_train = []
-            epoch_answers_post_train = []
-            epoch_targets_post_train = []
+            log.info(f"\n--- Training on window {window_idx + 1} ---")
             
             for local_step, task_dict in enumerate(window_samples):
-                global_step += 1
                 local_step += 1
+                if local_step <= skip_steps:
+                    continue
+                global_step += 1
                 
-                print(f"\n--- Window {window_idx + 1}, Step {local_step}/{len(window_samples)} "
-                      f"(Global step {global_step}) ---")
+                log.info(f"\n--- Window {window_idx + 1}, Step {local_step}/{len(window_samples)} "
+                         f"(Global step {global_step}) ---")
                 
                 target = task_dict.get("target", "")
                 
+                # The window test already ran this exact initial generation if
+                # the playbook has not changed since
+                initial_generation = None
+                generation = window_generations.get(local_step - 1)
+                if generation is not None and self.playbook_version == window_playbook_version:
+                    initial_generation = (generation["response"], generation["bullet_ids"], self.playbook)
+                    reused_test_generations += 1
+                
                 # Use helper method for training single sample
-                pre_train_answer, post_train_answer, tracking_dict = self._train_single_sample(
-                    task_dict=task_dict,
-                    data_processor=data_processor,
-                    step_id=f"online_train_s_{global_step}",
-                    epoch=epoch,
-                    step=global_step,
-                    usage_log_path=usage_log_path,
-                    log_dir=log_dir,
-                    config_params=config_params,
-                    total_samples=len(test_samples)
-                )
+                with trace_span("train_sample", "train", window=window_idx + 1, step=global_step):
+                    pre_train_answer, post_train_answer, tracking_dict = self._train_single_sample(
+                        task_dict=task_dict,
+                        data_processor=data_processor,
+                        step_id=f"online_train_s_{global_step}",
+                        epoch=epoch,
+                        step=global_step,
+                        usage_log_path=usage_log_path,
+                        log_dir=log_dir,
+                        config_params=config_params,
+                        total_samples=len(test_samples),
+                        initial_generation=initial_generation
+                    )
+                
+                self._record_step_metrics("online", tracking_dict)
                 
                 # Collect answers for accuracy calculation
                 epoch_answers_pre_train.append(pre_train_answer)
@@ -1050,6 +2685,16 @@ class ACE:
                 }
                 pre_train_post_train_results.append(pre_train_post_train_result)
                 
+                if post_train_answer is None and post_curate_mode == 'deferred':
+                    deferred_playbooks.setdefault(str(self.playbook_version), self.playbook)
+                    deferred_post_curate.append({
+                        "task_dict": task_dict,
+                        "playbook_version": str(self.playbook_version),
+                        "step_id": f"online_train_s_{global_step}",
+                        "result_index": len(pre_train_post_train_results) - 1,
+                        "answer_index": len(epoch_answers_post_train) - 1,
+                    })
+                
                 # Save intermediate playbook
                 if global_step % save_steps == 0:
                     intermediate_path = os.path.join(
@@ -1057,6 +2702,15 @@ class ACE:
                     )
                     with open(intermediate_path, "w") as f:
                         f.write(self.playbook)
+                
+                # Checkpoint after the step completed
+                if checkpoint_steps > 0 and local_step % checkpoint_steps == 0:
+                    save_checkpoint_at(window_idx, local_step, True)
+            
+            self._run_deferred_post_curate(
+                deferred_post_curate, deferred_playbooks, pre_train_post_train_results, epoch_answers_post_train,
+                data_processor, log_dir, config_params
+            )
             
             # End of window - compute training accuracies for this window
             pre_train_accuracy = data_processor.evaluate_accuracy(
@@ -1064,7 +2718,7 @@ class ACE:
             )
             post_train_accuracy = data_processor.evaluate_accuracy(
                 epoch_answers_post_train, epoch_targets_post_train
-            )
+            ) if post_curate_mode != 'off' else None
             
             window_train_result = {
                 "window": window_idx + 1,
@@ -1074,15 +2728,18 @@ class ACE:
                     "post_train_accuracy": post_train_accuracy
                 },
                 "cumulative_test_accuracy": cumulative_test_accuracy,
+                "reused_test_generations": reused_test_generations,
                 "playbook_num_tokens": count_tokens(self.playbook),
                 "playbook_length": len(self.playbook),
                 "playbook_stats": get_playbook_stats(self.playbook)
             }
             train_results.append(window_train_result)
             
-            print(f"\nWindow {window_idx + 1} training complete:")
-            print(f"  Pre-train accuracy: {pre_train_accuracy:.3f}")
-            print(f"  Post-train accuracy: {post_train_accuracy:.3f}")
+            log.info(f"\nWindow {window_idx + 1} training complete:")
+            log.info(f"  Pre-train accuracy: {pre_train_accuracy:.3f}")
+            log.info(f"  Window-test generations reused: {reused_test_generations}")
+            if post_train_accuracy is not None:
+                log.info(f"  Post-train accuracy: {post_train_accuracy:.3f}")
             
             # Save window playbook
             window_playbook_path = os.path.join(
@@ -1090,11 +2747,28 @@ class ACE:
             )
             with open(window_playbook_path, "w") as f:
                 f.write(self.playbook)
+            
+            # Next window starts untested with empty answer lists
+            epoch_answers_pre_train = []
+            epoch_targets_pre_train = []
+            epoch_answers_post_train = []
+            epoch_targets_post_train = []
+            reused_test_generations = 0
+            save_checkpoint_at(window_idx + 1, 0, False)
+        
+        # Don't lose reflections buffered after the last curator step
+        self._curate_remaining_reflections(
+            step=global_step,
+            step_id="online_train_final_curate",
+            log_dir=log_dir,
+            config_params=config_params,
+            total_samples=len(test_samples)
+        )
         
         # All windows complete
-        print(f"\n{'='*60}")
-        print(f"ONLINE TRAIN AND TEST COMPLETE")
-        print(f"{'='*60}")
+        log.info(f"\n{'='*60}")
+        log.info(f"ONLINE TRAIN AND TEST COMPLETE")
+        log.info(f"{'='*60}")
         
         # Calculate final cumulative test accuracy
         assert total_count == len(test_samples)
@@ -1123,24 +2797,35 @@ class ACE:
         
         # Save training results (per window)
         train_results_path = os.path.join(save_path, "train_results.json")
+        reflection_skip_stats = None
+        if config_params['reflect_on_correct_skip_rate'] > 0:
+            reflection_skip_stats = self._reflection_skip_summary()
+            self._log_reflection_skip_summary(reflection_skip_stats)
         with open(train_results_path, "w") as f:
-            json.dump({"train_results": train_results}, f, indent=2)
+            json.dump({
+                "train_results": train_results,
+                **({"reflection_skip_stats": reflection_skip_stats} if reflection_skip_stats else {}),
+            }, f, indent=2)
         
         # Save pre-train/post-train results
         pre_train_post_train_results_path = os.path.join(save_path, "pre_train_post_train_results.json")
         with open(pre_train_post_train_results_path, "w") as f:
             json.dump(pre_train_post_train_results, f, indent=2)
         
+        # Save per-bullet usage summary and flush buffered logs
+        self.bullet_usage.save(os.path.join(save_path, "bullet_usage_summary.json"))
+        flush_log_sinks()
+        
         # Save final playbook
         final_playbook_path = os.path.join(save_path, f"final_playbook.txt")
         with open(final_playbook_path, "w") as f:
             f.write(self.playbook)
         
-        print(f"\n{'='*60}")
-        print(f"ONLINE TRAINING AND TESTING COMPLETE")
-        print(f"{'='*60}")
-        print(f"Final Test Accuracy: {final_test_accuracy:.3f}")
-        print(f"{'='*60}\n")
+        log.info(f"\n{'='*60}")
+        log.info(f"ONLINE TRAINING AND TESTING COMPLETE")
+        log.info(f"{'='*60}")
+        log.info(f"Final Test Accuracy: {final_test_accuracy:.3f}")
+        log.info(f"{'='*60}\n")
         
         return {
             "accuracy": final_test_accuracy,
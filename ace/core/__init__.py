@@ -4,8 +4,12 @@ Contains the three main agent classes: Generator, Reflector, and Curator.
 """
 
 from .generator import Generator
+from .cascade_generator import CascadeGenerator
 from .reflector import Reflector
-from .curator import Curator
+from .curator import Curator, ReflectionBuffer
+from .reflect_curator import ReflectorCurator
 from .bulletpoint_analyzer import BulletpointAnalyzer, DEDUP_AVAILABLE
+from .playbook_focus import PlaybookFocus
 
-__all__ = ['Generator', 'Reflector', 'Curator', 'BulletpointAnalyzer', 'DEDUP_AVAILABLE']
\ No newline at end of file
+__all__ = ['Generator', 'CascadeGenerator', 'Reflector', 'Curator', 'ReflectionBuffer', 'ReflectorCurator',
+           'BulletpointAnalyzer', 'DEDUP_AVAILABLE', 'PlaybookFocus']
\ No newline at end of file
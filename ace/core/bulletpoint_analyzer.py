@@ -9,6 +9,10 @@ import re
 import numpy as np
 from typing import List, Dict, Tuple, Any, Optional
 from collections import defaultdict
+from tracing import trace_span
+from logging_utils import get_logger
+
+log = get_logger("agents.bulletpoint_analyzer")
 
 try:
     from sentence_transformers import SentenceTransformer
@@ -16,8 +20,8 @@ try:
     DEDUP_AVAILABLE = True
 except ImportError:
     DEDUP_AVAILABLE = False
-    print("Warning: sentence-transformers or faiss not available for bulletpoint analysis.")
-    print("Install with: pip install sentence-transformers faiss-cpu")
+    log.warning("sentence-transformers or faiss not available for bulletpoint analysis. "
+                "Install with: pip install sentence-transformers faiss-cpu")
 
 
 def parse_playbook_line(line: str) -> Optional[Dict[str, Any]]:
@@ -91,12 +95,12 @@ class BulletpointAnalyzer:
         self.embedding_model = None
         
         if not DEDUP_AVAILABLE:
-            print("⚠️  Bulletpoint analyzer initialized but dependencies not available")
+            log.warning("⚠️  Bulletpoint analyzer initialized but dependencies not available")
     
     def _load_embedding_model(self):
         """Load sentence transformer model for embeddings."""
         if self.embedding_model is None and DEDUP_AVAILABLE:
-            print(f"Loading embedding model: {self.embedding_model_name}")
+            log.info(f"Loading embedding model: {self.embedding_model_name}")
             self.embedding_model = SentenceTransformer(self.embedding_model_name)
     
     def _parse_playbook(self, playbook: str) -> Tuple[List[str], List[Dict[str, Any]], Dict[int, int]]:
@@ -263,11 +267,11 @@ Do NOT include any explanation, just output the merged bulletpoint."""
                     'original_count': len(bullets_group)
                 }
             else:
-                print(f"⚠️  Failed to parse merged bullet, keeping first bullet from group")
+                log.warning(f"⚠️  Failed to parse merged bullet, keeping first bullet from group")
                 return bullets_group[0]
                 
         except Exception as e:
-            print(f"⚠️  Error merging bullets: {e}, keeping first bullet from group")
+            log.warning(f"⚠️  Error merging bullets: {e}, keeping first bullet from group")
             return bullets_group[0]
     
     def analyze(
@@ -288,7 +292,7 @@ Do NOT include any explanation, just output the merged bulletpoint."""
             Processed playbook string
         """
         if not DEDUP_AVAILABLE:
-            print("⚠️  Skipping bulletpoint analysis (dependencies not available)")
+            log.warning("⚠️  Skipping bulletpoint analysis (dependencies not available)")
             return playbook
         
         # Parse playbook
@@ -297,19 +301,21 @@ Do NOT include any explanation, just output the merged bulletpoint."""
         if len(bullets) == 0:
             return playbook
         
-        print(f"Analyzing {len(bullets)} bulletpoints (threshold={threshold})...")
+        log.info(f"Analyzing {len(bullets)} bulletpoints (threshold={threshold})...")
         
         # Compute embeddings
-        embeddings = self._compute_embeddings(bullets)
+        with trace_span("analyzer.embed", "analyzer", bullets=len(bullets)):
+            embeddings = self._compute_embeddings(bullets)
         
         # Find similar groups
-        duplicate_groups = self._find_similar_groups(bullets, embeddings, threshold)
+        with trace_span("analyzer.group", "analyzer", bullets=len(bullets)):
+            duplicate_groups = self._find_similar_groups(bullets, embeddings, threshold)
         
         if len(duplicate_groups) == 0:
-            print(f"No similar bulletpoints found at threshold {threshold}")
+            log.info(f"No similar bulletpoints found at threshold {threshold}")
             return playbook
         
-        print(f"Found {len(duplicate_groups)} groups of similar bulletpoints")
+        log.info(f"Found {len(duplicate_groups)} groups of similar bulletpoints")
         
         # Create merge mapping
         merge_mapping = {}
@@ -321,8 +327,9 @@ Do NOT include any explanation, just output the merged bulletpoint."""
                 indices = group['indices']
                 group_bullets = group['bullets']
                 
-                print(f"  Merging group {group_idx + 1}: {len(group_bullets)} bullets -> 1")
-                merged_bullet = self._merge_bullets_with_llm(group_bullets)
+                log.info(f"  Merging group {group_idx + 1}: {len(group_bullets)} bullets -> 1")
+                with trace_span("analyzer.merge_llm", "llm", group_size=len(group_bullets)):
+                    merged_bullet = self._merge_bullets_with_llm(group_bullets)
                 
                 if merged_bullet:
                     first_bullet_idx = indices[0]
@@ -366,7 +373,7 @@ Do NOT include any explanation, just output the merged bulletpoint."""
         final_bullet_count = len(bullets) - len(processed_indices) + len(merge_mapping)
         removed_count = len(bullets) - final_bullet_count
         
-        print(f"✓ Bulletpoint analysis complete: {len(bullets)} -> {final_bullet_count} "
-              f"({removed_count} bullets merged/removed)")
+        log.info(f"✓ Bulletpoint analysis complete: {len(bullets)} -> {final_bullet_count} "
+                 f"({removed_count} bullets merged/removed)")
         
         return '\n'.join(output_lines)
\ No newline at end of file
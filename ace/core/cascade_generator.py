@@ -0,0 +1,190 @@
+"""
+CascadeGenerator for ACE system.
+Answers with a cheap generator model first and escalates to the strong one
+only when the cheap answer does not look trustworthy.
+"""
+
+import threading
+from typing import Dict, List, Tuple, Optional, Any
+from .generator import Generator
+from utils import vote_answers
+from logging_utils import get_logger
+from tracing import trace_span
+import metrics
+
+log = get_logger("agents.cascade")
+
+NO_ANSWER = "No final answer found"
+
+
+class CascadeGenerator:
+    """
+    Two-tier generator with the same generate() interface as Generator.
+
+    The cheap tier answers first; with `cheap_samples` > 1 the samples come from
+    one request (provider n parameter) and are majority-voted. The answer is
+    escalated to the strong tier when no final_answer can be parsed, when the
+    cheap samples disagree, or when `min_logprob_margin` is set and the answer tokens'
+    logprob margin falls below it. Per-tier call counts, latency, tokens and
+    estimated spend are tracked for summary().
+    """
+
+    def __init__(self, cheap: Generator, strong: Generator, cheap_samples: int = 1,
+                 min_logprob_margin: Optional[float] = None):
+        """
+        Initialize the cascade.
+
+        Args:
+            cheap: Generator for the cheap, fast model
+            strong: Generator for the strong model (the regular ACE generator)
+            cheap_samples: Cheap samples per question; answers must agree
+            min_logprob_margin: Escalate when the answer logprob margin is below
+                this (None disables; requires provider logprobs support)
+        """
+        self.cheap = cheap
+        self.strong = strong
+        self.cheap_samples = max(1, cheap_samples)
+        self.min_logprob_margin = min_logprob_margin
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "escalations": {"no_answer": 0, "disagreement": 0, "low_margin": 0},
+            "tiers": {
+                tier: {"model": generator.model, "calls": 0, "latency_seconds": 0.0,
+                       "prompt_tokens": 0, "completion_tokens": 0, "spend_usd": 0.0}
+                for tier, generator in (("cheap", cheap), ("strong", strong))
+            },
+        }
+
+    @property
+    def model(self) -> str:
+        return self.strong.model
+
+    def _record(self, tier: str, call_info: Dict[str, Any]):
+        """Add one call to the per-tier stats."""
+        prompt_tokens = call_info.get("prompt_num_tokens") or 0
+        completion_tokens = call_info.get("response_num_tokens") or 0
+        with self._lock:
+            stats = self._stats["tiers"][tier]
+            stats["calls"] += 1
+            stats["latency_seconds"] += call_info.get("total_time") or 0.0
+            stats["prompt_tokens"] += prompt_tokens
+            stats["completion_tokens"] += completion_tokens
+            stats["spend_usd"] += metrics.estimate_cost(stats["model"], prompt_tokens, completion_tokens)
+
+    def _escalation_reason(self, vote: Dict[str, Any], margins: List[Optional[float]]) -> Optional[str]:
+        """Why the voted cheap answer should be escalated, or None to accept it."""
+        if vote["answer"] == NO_ANSWER:
+            return "no_answer"
+        if vote["agreement"] < 1.0:
+            return "disagreement"
+        if self.min_logprob_margin is not None:
+            if any(margin is not None and margin < self.min_logprob_margin for margin in margins):
+                return "low_margin"
+        return None
+
+    def generate(
+        self,
+        question: str,
+        playbook: str,
+        context: str = "",
+        reflection: str = "(empty)",
+        use_json_mode: bool = False,
+        call_id: str = "gen",
+        log_dir: Optional[str] = None
+    ) -> Tuple[str, List[str], Dict[str, Any]]:
+        """
+        Generate an answer, escalating to the strong model if needed.
+
+        Args:
+            question: The question to answer
+            playbook: The current playbook content
+            context: Additional context for the question
+            reflection: Previous reflection content
+            use_json_mode: Whether to use JSON mode
+            call_id: Unique identifier for this call
+            log_dir: Directory for logging
+
+        Returns:
+            Tuple of (full_response, bullet_ids_used, call_info) as Generator.generate;
+            call_info token counts cover every call of the cascade and
+            call_info["cascade"] holds the answering tier and escalation reason
+        """
+        with trace_span("cascade.cheap", "generator", call_id=call_id, samples=self.cheap_samples):
+            responses, cheap_bullet_ids, cheap_info = self.cheap.generate_samples(
+                question=question, playbook=playbook, n=self.cheap_samples, context=context,
+                reflection=reflection, use_json_mode=use_json_mode, call_id=f"{call_id}_cheap",
+                log_dir=log_dir, logprobs=self.min_logprob_margin is not None
+            )
+        self._record("cheap", cheap_info)
+
+        vote = vote_answers(responses)
+        margins = cheap_info.get("answer_logprob_margin")
+        if not isinstance(margins, list):
+            margins = [margins]
+        reason = self._escalation_reason(vote, margins)
+        with self._lock:
+            self._stats["requests"] += 1
+            if reason:
+                self._stats["escalations"][reason] += 1
+
+        if reason is None:
+            response, bullet_ids = responses[vote["index"]], cheap_bullet_ids[vote["index"]]
+            call_info = cheap_info
+            tier_infos = [cheap_info]
+        else:
+            log.debug(f"Cascade escalating {call_id} to {self.strong.model}: {reason}")
+            with trace_span("cascade.strong", "generator", call_id=call_id, reason=reason):
+                response, bullet_ids, call_info = self.strong.generate(
+                    question=question, playbook=playbook, context=context, reflection=reflection,
+                    use_json_mode=use_json_mode, call_id=f"{call_id}_strong", log_dir=log_dir
+                )
+            self._record("strong", call_info)
+            tier_infos = [cheap_info, call_info]
+
+        call_info = {
+            **call_info,
+            "prompt_num_tokens": sum(info.get("prompt_num_tokens") or 0 for info in tier_infos),
+            "response_num_tokens": sum(info.get("response_num_tokens") or 0 for info in tier_infos),
+            "cascade": {"tier": "cheap" if reason is None else "strong", "reason": reason},
+        }
+        return response, bullet_ids, call_info
+
+    def generate_packed(self, *args, **kwargs):
+        """
+        Packed generation on the cheap tier (see Generator.generate_packed).
+
+        Packs whose response cannot be unpacked fall back to single requests,
+        which go through the full cascade.
+        """
+        response, answers, call_info = self.cheap.generate_packed(*args, **kwargs)
+        self._record("cheap", call_info)
+        return response, answers, call_info
+
+    def playbook_render_summary(self) -> Dict[str, Any]:
+        """Playbook render stats of both tiers combined (see Generator.playbook_render_summary)."""
+        cheap, strong = self.cheap.playbook_render_summary(), self.strong.playbook_render_summary()
+        combined = {key: cheap[key] + strong[key] for key in ("calls", "raw_tokens", "rendered_tokens", "tokens_saved")}
+        return {
+            "playbook_format": strong["playbook_format"],
+            **combined,
+            "savings_ratio": combined["tokens_saved"] / combined["raw_tokens"] if combined["raw_tokens"] else 0.0,
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Per-tier usage and escalation counts so far.
+
+        escalation_rate is the share of cascade requests answered by the strong
+        tier. Only calls made through the cascade are counted; regenerations
+        during training call the strong generator directly.
+        """
+        with self._lock:
+            stats = {
+                "requests": self._stats["requests"],
+                "escalations": dict(self._stats["escalations"]),
+                "tiers": {tier: dict(values) for tier, values in self._stats["tiers"].items()},
+            }
+        escalated = sum(stats["escalations"].values())
+        stats["escalation_rate"] = escalated / stats["requests"] if stats["requests"] else 0.0
+        return stats
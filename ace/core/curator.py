@@ -9,12 +9,56 @@ should be added to the playbook to improve future performance.
 
 import json
 import time
+import logging
 from typing import Dict, List, Tuple, Optional, Any
 from pathlib import Path
 from ..prompts.curator import CURATOR_PROMPT, CURATOR_PROMPT_NO_GT
-from playbook_utils import extract_json_from_text, apply_curator_operations
+from playbook_utils import apply_curator_operations, build_bullet_index
+from response_parsing import parse_curator_response
 from logger import log_curator_failure, log_curator_operation_diff, log_playbook_diff
-from llm import timed_llm_call
+from llm import timed_llm_call, get_truncation_recovery
+from logging_utils import get_logger
+from tracing import trace_span
+
+log = get_logger("agents.curator")
+
+
+class ReflectionBuffer:
+    """
+    Reflections collected between curator runs (curator_frequency > 1).
+    
+    Each entry keeps the step, the reflection and the question context it was
+    produced for, so the next curator run can learn from all of them at once.
+    """
+    
+    def __init__(self):
+        self._entries = []
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def add(self, step: int, reflection: str, question_context: str,
+            bullet_ids: Optional[List[str]] = None):
+        """Buffer one reflection; empty reflections are ignored."""
+        if reflection and reflection != "(empty)":
+            self._entries.append({
+                "step": step,
+                "reflection": reflection,
+                "question_context": question_context,
+                "bullet_ids": list(bullet_ids or []),
+            })
+    
+    def drain(self) -> List[Dict[str, Any]]:
+        """Return all buffered entries and clear the buffer."""
+        entries, self._entries = self._entries, []
+        return entries
+    
+    def to_list(self) -> List[Dict[str, Any]]:
+        return [dict(entry) for entry in self._entries]
+    
+    def load_list(self, entries: Optional[List[Dict[str, Any]]]):
+        self._entries = [dict(entry) for entry in entries or []]
+
 
 class Curator:
     """
@@ -50,7 +94,8 @@ class Curator:
         use_json_mode: bool = False,
         call_id: str = "curate",
         log_dir: Optional[str] = None,
-        next_global_id: int = 1
+        next_global_id: int = 1,
+        playbook_view: Optional[str] = None
     ) -> Tuple[str, int, List[Dict[str, Any]], Dict[str, Any]]:
         """
         Curate the playbook based on reflection feedback.
@@ -68,12 +113,103 @@ class Curator:
             call_id: Unique identifier for this call
             log_dir: Directory for logging
             next_global_id: Next available global ID for bullets
+            playbook_view: Text shown to the curator instead of the full playbook
+                (e.g. a PlaybookFocus view); operations still apply to current_playbook
             
         Returns:
             Tuple of (updated_playbook, next_global_id, operations, call_info)
         """
+        operations, call_info = self.propose_operations(
+            current_playbook=current_playbook,
+            recent_reflection=recent_reflection,
+            question_context=question_context,
+            current_step=current_step,
+            total_samples=total_samples,
+            token_budget=token_budget,
+            playbook_stats=playbook_stats,
+            use_ground_truth=use_ground_truth,
+            use_json_mode=use_json_mode,
+            call_id=call_id,
+            log_dir=log_dir,
+            playbook_view=playbook_view
+        )
+        if operations is None:
+            return current_playbook, next_global_id, [], call_info
+        
+        updated_playbook, next_global_id = self.apply_operations(
+            current_playbook, operations, next_global_id,
+            current_step=current_step, call_id=call_id, log_dir=log_dir
+        )
+        if updated_playbook is None:
+            return current_playbook, next_global_id, [], call_info
+        return updated_playbook, next_global_id, operations, call_info
+    
+    @staticmethod
+    def format_reflection_batch(entries: List[Dict[str, Any]]) -> Tuple[str, str]:
+        """
+        Format buffered reflections for a single curator call.
+        
+        Args:
+            entries: Entries from ReflectionBuffer.drain()
+            
+        Returns:
+            Tuple of (recent_reflection, question_context) for curate()
+        """
+        if len(entries) == 1:
+            return entries[0]["reflection"], entries[0]["question_context"]
+        
+        parts = [f"{len(entries)} reflections were collected since the last curator run, each with "
+                 f"the question context it refers to. Propose operations that cover the lessons "
+                 f"from all of them."]
+        for i, entry in enumerate(entries, 1):
+            parts.append(
+                f"--- Reflection {i} (step {entry['step']}) ---\n"
+                f"{entry['reflection']}\n\n"
+                f"Question Context {i}:\n"
+                f"{entry['question_context']}"
+            )
+        return "\n\n".join(parts), "(Included with each reflection above.)"
+    
+    def propose_operations(
+        self,
+        current_playbook: str,
+        recent_reflection: str,
+        question_context: str,
+        current_step: int,
+        total_samples: int,
+        token_budget: int,
+        playbook_stats: Dict[str, Any],
+        use_ground_truth: bool = True,
+        use_json_mode: bool = False,
+        call_id: str = "curate",
+        log_dir: Optional[str] = None,
+        playbook_view: Optional[str] = None
+    ) -> Tuple[Optional[List[Dict[str, Any]]], Dict[str, Any]]:
+        """
+        Ask the curator for playbook operations without applying them.
+        
+        Args:
+            current_playbook: Current playbook content
+            recent_reflection: Recent reflection from reflector
+            question_context: Context for the current question
+            current_step: Current training step
+            total_samples: Total number of training samples
+            token_budget: Total token budget for playbook
+            playbook_stats: Statistics about current playbook
+            use_ground_truth: Whether ground truth is available
+            use_json_mode: Whether to use JSON mode
+            call_id: Unique identifier for this call
+            log_dir: Directory for logging
+            playbook_view: Text shown to the curator instead of the full playbook
+            
+        Returns:
+            Tuple of (operations, call_info); operations is None if the
+            response was empty or invalid (the failure is logged)
+        """
         # Format playbook stats as JSON string
         stats_str = json.dumps(playbook_stats, indent=2)
+        if playbook_view is not None:
+            current_playbook = playbook_view
         
         # Select the appropriate prompt
         if use_ground_truth:
@@ -109,13 +245,34 @@ class Curator:
             log_dir=log_dir,
             use_json_mode=use_json_mode
         )
+        return self.parse_operations(response, current_step, call_id, log_dir), call_info
+    
+    def parse_operations(
+        self,
+        response: str,
+        current_step: int,
+        call_id: str = "curate",
+        log_dir: Optional[str] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Extract and validate the operations of a curator-style response.
         
+        Args:
+            response: Raw LLM response containing an "operations" field
+            current_step: Current training step
+            call_id: Unique identifier of the call
+            log_dir: Directory for logging
+            
+        Returns:
+            List of operations, or None if the response was empty or invalid
+            (the failure is logged)
+        """
         # Check for empty response error
         if response.startswith("INCORRECT_DUE_TO_EMPTY_RESPONSE"):
-            print(f"[SKIP] Skipping curator operation due to empty response")
+            log.warning("[SKIP] Skipping curator operation due to empty response")
             log_curator_failure(log_dir, current_step, "empty_response", 
                                     response[:200], 0)
-            return current_playbook, next_global_id, [], call_info
+            return None
         
         # Extract and validate operations
         try:
@@ -123,69 +280,109 @@ class Curator:
             if not response or response.strip() == "":
                  raise ValueError("Curator returned an empty string")
 
-            operations_info = self._extract_and_validate_operations(response)
+            with trace_span("curator.parse", "curator", call_id=call_id):
+                operations_info = self._extract_and_validate_operations(response)
             
             if not operations_info or "operations" not in operations_info:
                 raise ValueError("Curator response missing 'operations' field")
 
             operations = operations_info["operations"]
-            print(f"✅ Curator JSON schema validated successfully: {len(operations)} operations")
-            
-            # Log detailed diff for each operation before applying
-            for op in operations:
-                try:
-                    log_curator_operation_diff(Path(log_dir).parent, op, current_playbook, call_id)
-                except Exception as e:
-                    print(f"Warning: Failed to log curator operation diff: {e}")
-            
-            # Apply operations to playbook
-            updated_playbook, next_global_id = apply_curator_operations(
-                current_playbook, operations, next_global_id
-            )
-            
-            # Log Playbook diff for audit trail
-            if log_dir:
-                try:
-                    log_playbook_diff(
-                        log_dir=Path(log_dir).parent,
-                        step=current_step,
-                        playbook_before=current_playbook,
-                        playbook_after=updated_playbook,
-                        operations=operations
-                    )
-                except Exception as e:
-                    print(f"[WARNING] Failed to log playbook diff: {e}")
-            
-            # Log operations
-            for op in operations:
-                try:
-                    op_type = op.get('type', 'UNKNOWN') if isinstance(op, dict) else 'INVALID'
-                    op_reason = op.get('reason', 'No reason given') if isinstance(op, dict) else 'Invalid operation format'
-                    print(f"  - {op_type}: {op_reason}")
-                except Exception as e:
-                    print(f"  - UNKNOWN: Error logging operation: {e}")
-            
-            return updated_playbook, next_global_id, operations, call_info
+            log.info(f"✅ Curator JSON schema validated successfully: {len(operations)} operations")
+            return operations
             
         except (ValueError, KeyError, TypeError, json.JSONDecodeError) as e:
-            print(f"[ERROR] Curator JSON parsing failed: {e}")
-            print(f"📄 Raw curator response preview: {response[:300] if response else 'NONE'}...")
+            log.error(f"Curator JSON parsing failed: {e}")
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(f"📄 Raw curator response preview: {response[:300] if response else 'NONE'}...")
             
             if log_dir:
                 log_curator_failure(log_dir, current_step, "json_parse_error", str(e), 
                                     response[:1000] if response else "NONE")
                 
-            return current_playbook, next_global_id, [], call_info
+            return None
             
         except Exception as e:
-            print(f"❌ Curator operation failed: {e}")
-            print(f"📄 Raw curator response preview: {response[:300]}...")
+            log.error(f"❌ Curator operation failed: {e}")
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(f"📄 Raw curator response preview: {response[:300]}...")
             
             log_curator_failure(log_dir, current_step, "operation_error", 
                                 response, 0, str(e))
             
-            print(f"[SKIP] Skipping curator operation and continuing training")
-            return current_playbook, next_global_id, [], call_info
+            log.warning("[SKIP] Skipping curator operation and continuing training")
+            return None
+    
+    def apply_operations(
+        self,
+        current_playbook: str,
+        operations: List[Dict[str, Any]],
+        next_global_id: int,
+        current_step: int,
+        call_id: str = "curate",
+        log_dir: Optional[str] = None
+    ) -> Tuple[Optional[str], int]:
+        """
+        Apply validated curator operations to the playbook and log the diffs.
+        
+        Args:
+            current_playbook: Playbook the operations were proposed against
+            operations: Operations from propose_operations (or merged from several)
+            next_global_id: Next available global ID for bullets
+            current_step: Current training step
+            call_id: Identifier used in the operation diff log
+            log_dir: Directory for logging
+            
+        Returns:
+            Tuple of (updated_playbook, next_global_id); updated_playbook is None
+            if applying failed (the failure is logged)
+        """
+        try:
+            # Log detailed diff for each operation before applying
+            with trace_span("curator.log_operation_diffs", "io", call_id=call_id):
+                bullet_index = build_bullet_index(current_playbook)
+                for op in operations:
+                    try:
+                        log_curator_operation_diff(Path(log_dir).parent, op, current_playbook, call_id,
+                                                   bullet_index=bullet_index)
+                    except Exception as e:
+                        log.warning(f"Failed to log curator operation diff: {e}")
+            
+            # Apply operations to playbook
+            with trace_span("curator.apply_operations", "curator", operations=len(operations)):
+                updated_playbook, updated_next_global_id = apply_curator_operations(
+                    current_playbook, operations, next_global_id
+                )
+        except Exception as e:
+            log.error(f"❌ Curator operation failed: {e}")
+            log_curator_failure(log_dir, current_step, "operation_error", 
+                                json.dumps(operations, default=str), 0, str(e))
+            log.warning("[SKIP] Skipping curator operation and continuing training")
+            return None, next_global_id
+        
+        # Log Playbook diff for audit trail
+        if log_dir:
+            try:
+                with trace_span("curator.log_playbook_diff", "io", call_id=call_id):
+                    log_playbook_diff(
+                        log_dir=Path(log_dir).parent,
+                        step=current_step,
+                        playbook_before=current_playbook,
+                        playbook_after=updated_playbook,
+                        operations=operations
+                    )
+            except Exception as e:
+                log.warning(f"Failed to log playbook diff: {e}")
+        
+        # Log operations
+        for op in operations:
+            try:
+                op_type = op.get('type', 'UNKNOWN') if isinstance(op, dict) else 'INVALID'
+                op_reason = op.get('reason', 'No reason given') if isinstance(op, dict) else 'Invalid operation format'
+                log.info(f"  - {op_type}: {op_reason}")
+            except Exception as e:
+                log.warning(f"  - UNKNOWN: Error logging operation: {e}")
+        
+        return updated_playbook, updated_next_global_id
     
     def _extract_and_validate_operations(
         self,
@@ -201,10 +398,16 @@ class Curator:
             Dictionary with 'reasoning' and 'operations' keys
             
         Raises:
-            ValueError: If JSON is invalid or missing required fields
+            ValueError: If JSON is invalid or missing required fields, or if the
+                response was cut off and truncation recovery is disabled
         """
-        # Extract operations info
-        operations_info = extract_json_from_text(response, "operations")
+        # Extract operations info (the decode is shared with the fused reflector parse)
+        parsed = parse_curator_response(response)
+        if parsed.truncated and not get_truncation_recovery().enabled:
+            # Partial operations are only applied when truncation recovery is on
+            raise ValueError("Curator response was cut off at max_tokens "
+                             "(set max_continuations to salvage its complete operations)")
+        operations_info = parsed.data
         
         # Validate JSON structure is correct
         if not operations_info:
@@ -237,7 +440,7 @@ class Curator:
             # Currently only ADD operations are fully supported
             # Note: You can add support for UPDATE, MERGE, DELETE operations here
             if op_type not in ["ADD", "UPDATE", "MERGE", "DELETE", "CREATE_META"]:
-                print(f"Warning: Operation type '{op_type}' may not be fully supported")
+                log.warning(f"Operation type '{op_type}' may not be fully supported")
             
             # Validate ADD operation structure
             if op_type == "ADD":
@@ -246,4 +449,5 @@ class Curator:
                 if missing_fields:
                     raise ValueError(f"ADD operation {i} missing fields: {list(missing_fields)}")
         
-        return operations_info
\ No newline at end of file
+        # Parsed responses are cached and shared; hand out private copies
+        return {**operations_info, "operations": [dict(op) for op in operations_info["operations"]]}
\ No newline at end of file
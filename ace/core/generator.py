@@ -3,11 +3,25 @@ Generator agent for ACE system.
 Generates answers to questions using playbook and reflection.
 """
 
-import json
 import re
+import threading
 from typing import Dict, List, Tuple, Optional, Any
-from ..prompts.generator import GENERATOR_PROMPT
+from ..prompts.generator import GENERATOR_PROMPT, GENERATOR_PACKED_PROMPT, GENERATOR_FOLLOWUP_PROMPT
 from llm import timed_llm_call
+from playbook_utils import render_playbook_for_prompt, extract_json_from_text
+from response_parsing import parse_generator_response
+from tracing import trace_span
+
+# Bullet citations as [id] or "id", for canonical IDs and compact aliases alike
+_CITATION_RE = re.compile(r'(?<=[\["])([a-z]{3,}-\d{5}|b\d+)(?=[\]"])')
+
+
+def map_citations(text: str, mapping: Optional[Dict[str, str]]) -> str:
+    """Replace bullet citations ([b12] or "b12") in text according to mapping"""
+    if not mapping or not text:
+        return text
+    return _CITATION_RE.sub(lambda match: mapping.get(match.group(1), match.group(1)), text)
+
 
 class Generator:
     """
@@ -15,7 +29,8 @@ class Generator:
     from a playbook and previous reflections.
     """
     
-    def __init__(self, api_client, api_provider, model: str, max_tokens: int = 4096):
+    def __init__(self, api_client, api_provider, model: str, max_tokens: int = 4096,
+                 playbook_format: str = "raw"):
         """
         Initialize the Generator agent.
         
@@ -24,11 +39,53 @@ class Generator:
             api_provider: API provider for LLM calls
             model: Model name to use for generation
             max_tokens: Maximum tokens for generation
+            playbook_format: How the playbook is shown in the prompt: 'raw', or
+                'compact' / 'compact_bucketed' (short aliases, counters omitted
+                or bucketed; see render_playbook_for_prompt)
         """
         self.api_client = api_client
         self.api_provider = api_provider
         self.model = model
         self.max_tokens = max_tokens
+        self.playbook_format = playbook_format
+        self._render_stats = {"calls": 0, "raw_tokens": 0, "rendered_tokens": 0}
+        self._render_lock = threading.Lock()
+    
+    def render_playbook(self, playbook: str, record: bool = True) -> Tuple[str, Optional[Dict[str, str]]]:
+        """
+        Render the playbook for the prompt according to playbook_format.
+        
+        Args:
+            playbook: The current playbook content
+            record: Count the render in the token savings stats
+            
+        Returns:
+            Tuple of (prompt_playbook, aliases); aliases maps short aliases to
+            canonical bullet IDs and is None for the raw format
+        """
+        if self.playbook_format == "raw":
+            return playbook, None
+        counters = "bucket" if self.playbook_format == "compact_bucketed" else "omit"
+        rendered = render_playbook_for_prompt(playbook, counters)
+        if not record:
+            return rendered["text"], rendered["aliases"]
+        with self._render_lock:
+            self._render_stats["calls"] += 1
+            self._render_stats["raw_tokens"] += rendered["raw_tokens"]
+            self._render_stats["rendered_tokens"] += rendered["rendered_tokens"]
+        return rendered["text"], rendered["aliases"]
+    
+    def playbook_render_summary(self) -> Dict[str, Any]:
+        """Playbook prompt tokens sent vs. the raw playbook text over all calls so far."""
+        with self._render_lock:
+            stats = dict(self._render_stats)
+        saved = stats["raw_tokens"] - stats["rendered_tokens"]
+        return {
+            "playbook_format": self.playbook_format,
+            **stats,
+            "tokens_saved": saved,
+            "savings_ratio": saved / stats["raw_tokens"] if stats["raw_tokens"] else 0.0,
+        }
     
     def generate(
         self,
@@ -38,7 +95,8 @@ class Generator:
         reflection: str = "(empty)",
         use_json_mode: bool = False,
         call_id: str = "gen",
-        log_dir: Optional[str] = None
+        log_dir: Optional[str] = None,
+        logprobs: bool = False
     ) -> Tuple[str, List[str], Dict[str, Any]]:
         """
         Generate an answer to a question using the playbook.
@@ -51,12 +109,16 @@ class Generator:
             use_json_mode: Whether to use JSON mode
             call_id: Unique identifier for this call
             log_dir: Directory for logging
+            logprobs: Request logprobs and record call_info["answer_logprob_margin"]
             
         Returns:
-            Tuple of (full_response, bullet_ids_used, call_info)
+            Tuple of (full_response, bullet_ids_used, call_info); with a compact
+            playbook format, aliases cited in the response are replaced by the
+            canonical bullet IDs, so the response can go to the reflector as is
         """
         # Format the prompt
-        prompt = GENERATOR_PROMPT.format(playbook, reflection, question, context)
+        prompt_playbook, aliases = self.render_playbook(playbook)
+        prompt = GENERATOR_PROMPT.format(prompt_playbook, reflection, question, context)
         
         response, call_info = timed_llm_call(
             self.api_client,
@@ -67,39 +129,263 @@ class Generator:
             call_id=call_id,
             max_tokens=self.max_tokens,
             log_dir=log_dir,
-            use_json_mode=use_json_mode
+            use_json_mode=use_json_mode,
+            logprobs=logprobs
         )
         
         # Extract bullet IDs if using retrieval and reason mode
-        bullet_ids = []
-        bullet_ids = self._extract_bullet_ids(response, use_json_mode)
+        with trace_span("generator.parse", "generator", call_id=call_id):
+            response = map_citations(response, aliases)
+            bullet_ids = self._extract_bullet_ids(response, use_json_mode)
         
         return response, bullet_ids, call_info
     
+    def start_session(self, question: str, playbook: str, context: str, response: str) -> Dict[str, Any]:
+        """
+        Start a multi-turn generation session from an initial answer.
+        
+        Args:
+            question: The question that was answered
+            playbook: The playbook the answer was generated with
+            context: Context for the question
+            response: The initial generator response (as returned by generate)
+            
+        Returns:
+            Session dict with the conversation so far (messages) and the
+            playbook's alias map, for generate_followup
+        """
+        prompt_playbook, aliases = self.render_playbook(playbook, record=False)
+        prompt = GENERATOR_PROMPT.format(prompt_playbook, "(empty)", question, context)
+        # The conversation cites bullets by the aliases the prompt shows
+        prompt_response = map_citations(response, {v: k for k, v in aliases.items()} if aliases else None)
+        return {
+            "messages": [
+                {"role": "user", "content": prompt},
+                {"role": "assistant", "content": prompt_response},
+            ],
+            "aliases": aliases,
+        }
+    
+    def generate_followup(
+        self,
+        session: Dict[str, Any],
+        reflection: str,
+        use_json_mode: bool = False,
+        call_id: str = "gen_followup",
+        log_dir: Optional[str] = None
+    ) -> Tuple[str, List[str], Dict[str, Any]]:
+        """
+        Answer again as the next turn of a session, given a reflection.
+        
+        Only the reflection is new; the earlier turns are resent unchanged so
+        providers can serve them from their prompt cache. The new turns are
+        appended to the session.
+        
+        Args:
+            session: Session from start_session
+            reflection: Reflection on the previous answer
+            use_json_mode: Whether to use JSON mode
+            call_id: Unique identifier for this call
+            log_dir: Directory for logging
+            
+        Returns:
+            Tuple of (full_response, bullet_ids_used, call_info)
+        """
+        prompt = GENERATOR_FOLLOWUP_PROMPT.format(reflection)
+        response, call_info = timed_llm_call(
+            self.api_client,
+            self.api_provider,
+            self.model,
+            prompt,
+            role="generator",
+            call_id=call_id,
+            max_tokens=self.max_tokens,
+            log_dir=log_dir,
+            use_json_mode=use_json_mode,
+            messages=session["messages"]
+        )
+        session["messages"].extend([
+            {"role": "user", "content": prompt},
+            {"role": "assistant", "content": response},
+        ])
+        
+        with trace_span("generator.parse", "generator", call_id=call_id):
+            response = map_citations(response, session["aliases"])
+            bullet_ids = self._extract_bullet_ids(response, use_json_mode)
+        return response, bullet_ids, call_info
+    
+    def generate_samples(
+        self,
+        question: str,
+        playbook: str,
+        n: int,
+        context: str = "",
+        reflection: str = "(empty)",
+        use_json_mode: bool = False,
+        call_id: str = "gen_samples",
+        log_dir: Optional[str] = None,
+        logprobs: bool = False,
+        temperature: Optional[float] = None
+    ) -> Tuple[List[str], List[List[str]], Dict[str, Any]]:
+        """
+        Sample several answers to the same prompt in one request.
+        
+        Uses the provider's n parameter, so the prompt is paid once. Combine the
+        samples with utils.vote_answers.
+        
+        Args:
+            question: The question to answer
+            playbook: The current playbook content
+            n: Number of completions
+            context: Additional context for the question
+            reflection: Previous reflection content
+            use_json_mode: Whether to use JSON mode
+            call_id: Unique identifier for this call
+            log_dir: Directory for logging
+            logprobs: Request logprobs; call_info["answer_logprob_margin"] is
+                then a list with one margin per sample
+            temperature: Sampling temperature; None leaves the provider default
+            
+        Returns:
+            Tuple of (responses, bullet_ids per response, call_info); fewer than
+            n responses are returned if the provider dropped empty choices
+        """
+        prompt_playbook, aliases = self.render_playbook(playbook)
+        prompt = GENERATOR_PROMPT.format(prompt_playbook, reflection, question, context)
+        
+        responses, call_info = timed_llm_call(
+            self.api_client,
+            self.api_provider,
+            self.model,
+            prompt,
+            role="generator",
+            call_id=call_id,
+            max_tokens=self.max_tokens,
+            log_dir=log_dir,
+            use_json_mode=use_json_mode,
+            temperature=temperature,
+            logprobs=logprobs,
+            n=n
+        )
+        if isinstance(responses, str):
+            responses = [responses]
+        
+        with trace_span("generator.parse", "generator", call_id=call_id, samples=len(responses)):
+            responses = [map_citations(response, aliases) for response in responses]
+            bullet_ids = [self._extract_bullet_ids(response, use_json_mode) for response in responses]
+        return responses, bullet_ids, call_info
+    
+    def generate_packed(
+        self,
+        questions: List[Tuple[str, str]],
+        playbook: str,
+        use_json_mode: bool = False,
+        call_id: str = "gen_packed",
+        log_dir: Optional[str] = None
+    ) -> Tuple[str, Optional[List[Dict[str, Any]]], Dict[str, Any]]:
+        """
+        Answer several independent questions in one call under a shared playbook.
+        
+        Args:
+            questions: (question, context) pairs
+            playbook: The current playbook content
+            use_json_mode: Whether to use JSON mode
+            call_id: Unique identifier for this call
+            log_dir: Directory for logging
+            
+        Returns:
+            Tuple of (full_response, answers, call_info); answers holds one dict
+            with reasoning, bullet_ids and final_answer per question, in order,
+            or is None if the response could not be unpacked
+        """
+        prompt_playbook, aliases = self.render_playbook(playbook)
+        blocks = [
+            f"**Question {i}:**\n{question}\n\n**Context {i}:**\n{context}"
+            for i, (question, context) in enumerate(questions, 1)
+        ]
+        prompt = GENERATOR_PACKED_PROMPT.format(
+            num_questions=len(questions),
+            playbook=prompt_playbook,
+            questions="\n\n".join(blocks)
+        )
+        
+        response, call_info = timed_llm_call(
+            self.api_client,
+            self.api_provider,
+            self.model,
+            prompt,
+            role="generator",
+            call_id=call_id,
+            max_tokens=self.max_tokens,
+            log_dir=log_dir,
+            use_json_mode=use_json_mode,
+            required_fields=("answers",)
+        )
+        
+        with trace_span("generator.parse_packed", "generator", call_id=call_id):
+            response = map_citations(response, aliases)
+            answers = self._unpack_answers(response, len(questions))
+        return response, answers, call_info
+    
+    def _unpack_answers(self, response: str, num_questions: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Split a packed response into per-question answers.
+        
+        Args:
+            response: The generator's packed response
+            num_questions: Number of questions in the packed prompt
+            
+        Returns:
+            List of answers in question order, or None if the response does not
+            contain exactly one answer with a final_answer per question, or if
+            its answer ids are not a permutation of 1..num_questions
+        """
+        parsed = extract_json_from_text(response, "answers") if response else None
+        if not isinstance(parsed, dict) or not isinstance(parsed.get("answers"), list):
+            return None
+        entries = parsed["answers"]
+        if len(entries) != num_questions:
+            return None
+        if any(not isinstance(entry, dict) or "final_answer" not in entry for entry in entries):
+            return None
+        
+        # Answers without ids are in question order; misnumbered ids make the mapping ambiguous
+        ids = [entry.get("id") for entry in entries]
+        if any(i is not None for i in ids):
+            if sorted(str(i) for i in ids) != sorted(str(i) for i in range(1, num_questions + 1)):
+                return None
+            entries = sorted(entries, key=lambda entry: int(entry["id"]))
+        
+        answers = []
+        for entry in entries:
+            bullet_ids = entry.get("bullet_ids") or []
+            if not isinstance(bullet_ids, list):
+                bullet_ids = []
+            bullet_ids = [str(bullet_id) for bullet_id in bullet_ids]
+            answers.append({
+                "reasoning": str(entry.get("reasoning", "")),
+                "bullet_ids": bullet_ids,
+                "final_answer": str(entry["final_answer"]),
+            })
+        return answers
+    
     def _extract_bullet_ids(self, response: str, use_json_mode: bool) -> List[str]:
         """
         Extract bullet IDs from generator response.
         
         Args:
-            response: The generator's response
+            response: The generator's response, with aliases already mapped back
+                by map_citations
             use_json_mode: Whether JSON mode was used
             
         Returns:
             List of bullet IDs
         """
-        bullet_ids = []
-        
-        if use_json_mode:
-            try:
-                response_json = json.loads(response)
-                bullet_ids = response_json.get("bullet_ids", [])
-            except (json.JSONDecodeError, KeyError):
-                # If parsing fails, try regex extraction
-                bullet_ids = self._extract_bullet_ids_regex(response)
-        else:
-            bullet_ids = self._extract_bullet_ids_regex(response)
-        
-        return bullet_ids
+        parsed = parse_generator_response(response)
+        if use_json_mode and parsed.bullet_ids is not None:
+            return list(parsed.bullet_ids)
+        # Not in JSON mode, or no bullet_ids list: use the IDs cited in the text
+        return self._extract_bullet_ids_regex(response)
     
     def _extract_bullet_ids_regex(self, text: str) -> List[str]:
         """
@@ -111,7 +397,5 @@ class Generator:
         Returns:
             List of bullet IDs
         """
-        # Pattern matches: [xxx-00001], [abc-00042], etc.
-        pattern = r'\[([a-z]{3,}-\d{5})\]'
-        matches = re.findall(pattern, text)
-        return matches
\ No newline at end of file
+        # Citations of [xxx-00001] IDs in citation order
+        return list(parse_generator_response(text).cited_ids)
\ No newline at end of file
@@ -0,0 +1,157 @@
+"""
+PlaybookFocus Component for ACE System
+
+Builds a focused, roughly constant-size view of the playbook for the curator:
+the bullets nearest to the reflection, the bullets cited in the sample and a
+compact section-level summary, instead of the entire playbook.
+"""
+
+import re
+import math
+import threading
+from typing import List, Dict, Any, Iterable, Optional
+from .bulletpoint_analyzer import DEDUP_AVAILABLE
+from playbook_utils import parse_playbook_line
+from tracing import trace_span
+from logging_utils import get_logger
+
+if DEDUP_AVAILABLE:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+
+log = get_logger("agents.playbook_focus")
+
+_WORD_RE = re.compile(r"[a-z0-9]+(?:[._%-][a-z0-9]+)*")
+_STOPWORDS = frozenset(
+    "the and for that with this from are was were have has had not but you your its "
+    "their they them what which when where why how all any can should would could into "
+    "than then there these those been being also only such use used using more most".split()
+)
+
+
+def _terms(text: str) -> set:
+    return {w for w in _WORD_RE.findall(text.lower()) if len(w) > 2 and w not in _STOPWORDS}
+
+
+def parse_playbook_sections(playbook: str) -> List[Dict[str, Any]]:
+    """
+    Parse bullets in playbook order together with their section.
+
+    Args:
+        playbook: Playbook content
+
+    Returns:
+        List of bullet dicts (see parse_playbook_line) with an added 'section'
+    """
+    bullets = []
+    section = "general"
+    for line in playbook.split('\n'):
+        stripped = line.strip()
+        if stripped.startswith('##'):
+            section = stripped.lstrip('#').strip()
+            continue
+        parsed = parse_playbook_line(line)
+        if parsed:
+            bullets.append({**parsed, 'section': section})
+    return bullets
+
+
+class PlaybookFocus:
+    """
+    Selects the playbook bullets relevant to a curator call.
+
+    Similarity uses sentence-transformer embeddings when available (bullet
+    embeddings are cached by content, so each call only encodes new bullets)
+    and falls back to lexical term overlap otherwise.
+    """
+
+    def __init__(self, top_k: int = 20, embedding_model_name: str = 'all-mpnet-base-v2'):
+        """
+        Initialize the focus component.
+
+        Args:
+            top_k: Number of nearest bullets to show besides the cited ones
+            embedding_model_name: Sentence transformer model for embeddings
+        """
+        self.top_k = top_k
+        self.embedding_model_name = embedding_model_name
+        self.embedding_model = None
+        self._embeddings = {}
+        self._lock = threading.Lock()
+
+    def _embed(self, texts: List[str]):
+        if self.embedding_model is None:
+            log.info(f"Loading embedding model: {self.embedding_model_name}")
+            self.embedding_model = SentenceTransformer(self.embedding_model_name)
+        vectors = self.embedding_model.encode(texts, convert_to_numpy=True, show_progress_bar=False)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def _similarities(self, query: str, bullets: List[Dict[str, Any]]) -> List[float]:
+        """Similarity of every bullet to the query."""
+        if DEDUP_AVAILABLE:
+            with self._lock:
+                missing = list(dict.fromkeys(b['content'] for b in bullets if b['content'] not in self._embeddings))
+                if missing:
+                    for content, vector in zip(missing, self._embed(missing)):
+                        self._embeddings[content] = vector
+                query_vector = self._embed([query])[0]
+                return [float(self._embeddings[b['content']] @ query_vector) for b in bullets]
+
+        query_terms = _terms(query)
+        scores = []
+        for bullet in bullets:
+            bullet_terms = _terms(bullet['content'])
+            overlap = len(query_terms & bullet_terms)
+            scores.append(overlap / math.sqrt(len(bullet_terms)) if overlap else 0.0)
+        return scores
+
+    def render(self, playbook: str, query: str, cited_ids: Optional[Iterable[str]] = None) -> str:
+        """
+        Render the focused playbook view.
+
+        Args:
+            playbook: Full playbook content
+            query: Text to find neighbors for (reflection and question context)
+            cited_ids: Bullet IDs cited by the generator in the curated sample(s)
+
+        Returns:
+            Section summary followed by the selected bullets grouped by section
+        """
+        bullets = parse_playbook_sections(playbook)
+        cited = set(cited_ids or [])
+
+        with trace_span("curator.focus", "curator", bullets=len(bullets)) as span:
+            selected = {b['id'] for b in bullets if b['id'] in cited}
+            if bullets and self.top_k > 0:
+                scores = self._similarities(query, bullets)
+                ranked = sorted(range(len(bullets)), key=lambda i: scores[i], reverse=True)
+                for i in ranked[:self.top_k]:
+                    if scores[i] > 0:
+                        selected.add(bullets[i]['id'])
+            span.set("selected", len(selected))
+
+        sections = {}
+        for bullet in bullets:
+            summary = sections.setdefault(bullet['section'], {"count": 0, "helpful": 0, "harmful": 0, "shown": []})
+            summary["count"] += 1
+            summary["helpful"] += bullet['helpful']
+            summary["harmful"] += bullet['harmful']
+            if bullet['id'] in selected:
+                summary["shown"].append(bullet['raw_line'].strip())
+
+        lines = [
+            f"(Focused view: {len(selected)} of {len(bullets)} bullets are shown - the ones cited in "
+            f"this sample and the ones most similar to the reflection. Bullets not shown still exist.)",
+            "",
+            "Section summary:",
+        ]
+        for name, summary in sections.items():
+            lines.append(f"- {name}: {summary['count']} bullets, helpful={summary['helpful']}, "
+                         f"harmful={summary['harmful']}, {len(summary['shown'])} shown")
+        for name, summary in sections.items():
+            if summary["shown"]:
+                lines.append("")
+                lines.append(f"## {name}")
+                lines.extend(summary["shown"])
+        return "\n".join(lines)
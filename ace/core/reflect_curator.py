@@ -0,0 +1,118 @@
+"""
+ReflectorCurator agent for ACE system.
+Fuses reflection and curation into a single LLM call that returns both the
+bullet tags and the playbook operations.
+"""
+
+import json
+from typing import Dict, List, Tuple, Optional, Any
+from ..prompts.reflect_curator import REFLECT_CURATOR_PROMPT, REFLECT_CURATOR_PROMPT_NO_GT
+from .reflector import Reflector
+from .curator import Curator
+from llm import timed_llm_call
+from logging_utils import get_logger
+from tracing import trace_span
+
+log = get_logger("agents.reflect_curator")
+
+
+class ReflectorCurator:
+    """
+    Fused agent that diagnoses a generator answer, tags the bullets it used
+    and proposes playbook operations in one round-trip.
+
+    The call goes to the curator's client and model, since the prompt carries
+    the whole playbook. Responses are parsed with the Reflector's bullet tag
+    extraction and the Curator's operation validation.
+    """
+
+    def __init__(self, reflector: Reflector, curator: Curator):
+        """
+        Initialize the ReflectorCurator agent.
+
+        Args:
+            reflector: Reflector whose bullet tag parsing is reused
+            curator: Curator whose client, model and operation parsing are used
+        """
+        self.reflector = reflector
+        self.curator = curator
+
+    def reflect_and_curate(
+        self,
+        question: str,
+        question_context: str,
+        reasoning_trace: str,
+        predicted_answer: str,
+        ground_truth: Optional[str],
+        environment_feedback: str,
+        bullets_used: str,
+        current_playbook: str,
+        current_step: int,
+        total_samples: int,
+        token_budget: int,
+        playbook_stats: Dict[str, Any],
+        use_ground_truth: bool = True,
+        use_json_mode: bool = False,
+        call_id: str = "reflect_curate",
+        log_dir: Optional[str] = None
+    ) -> Tuple[str, List[Dict[str, str]], Optional[List[Dict[str, Any]]], Dict[str, Any]]:
+        """
+        Reflect on the generator's output and propose playbook operations.
+
+        Args:
+            question: The original question
+            question_context: Context for the question
+            reasoning_trace: The generator's reasoning
+            predicted_answer: The generator's predicted answer
+            ground_truth: The ground truth answer (if available)
+            environment_feedback: Feedback about correctness
+            bullets_used: String representation of bullets used
+            current_playbook: Current playbook content
+            current_step: Current training step
+            total_samples: Total number of training samples
+            token_budget: Total token budget for playbook
+            playbook_stats: Statistics about current playbook
+            use_ground_truth: Whether to use ground truth
+            use_json_mode: Whether to use JSON mode
+            call_id: Unique identifier for this call
+            log_dir: Directory for logging
+
+        Returns:
+            Tuple of (reflection_content, bullet_tags, operations, call_info);
+            operations is None if they could not be parsed (the failure is logged)
+        """
+        fields = dict(
+            token_budget=token_budget,
+            current_step=current_step,
+            total_samples=total_samples,
+            playbook_stats=json.dumps(playbook_stats, indent=2),
+            question=question,
+            question_context=question_context,
+            reasoning_trace=reasoning_trace,
+            predicted_answer=predicted_answer,
+            environment_feedback=environment_feedback,
+            bullets_used=bullets_used,
+            current_playbook=current_playbook,
+        )
+        if use_ground_truth and ground_truth:
+            prompt = REFLECT_CURATOR_PROMPT.format(ground_truth=ground_truth, **fields)
+        else:
+            prompt = REFLECT_CURATOR_PROMPT_NO_GT.format(**fields)
+
+        response, call_info = timed_llm_call(
+            self.curator.api_client,
+            self.curator.api_provider,
+            self.curator.model,
+            prompt,
+            role="reflect_curator",
+            call_id=call_id,
+            max_tokens=self.curator.max_tokens,
+            log_dir=log_dir,
+            use_json_mode=use_json_mode
+        )
+
+        with trace_span("reflect_curator.parse", "reflect_curator", call_id=call_id):
+            bullet_tags = self.reflector._extract_bullet_tags(response, use_json_mode)
+        operations = self.curator.parse_operations(response, current_step, call_id, log_dir)
+
+        return response, bullet_tags, operations, call_info
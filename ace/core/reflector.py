@@ -3,10 +3,14 @@ Reflector agent for ACE system.
 Analyzes generator outputs and provides feedback on bullet usage.
 """
 
-import json
 from typing import Dict, List, Tuple, Optional, Any
 from ..prompts.reflector import REFLECTOR_PROMPT, REFLECTOR_PROMPT_NO_GT
-from llm import timed_llm_call
+from llm import timed_llm_call, get_truncation_recovery
+from response_parsing import parse_reflector_response
+from logging_utils import get_logger
+from tracing import trace_span
+
+log = get_logger("agents.reflector")
 
 
 class Reflector:
@@ -41,7 +45,8 @@ class Reflector:
         use_ground_truth: bool = True,
         use_json_mode: bool = False,
         call_id: str = "reflect",
-        log_dir: Optional[str] = None
+        log_dir: Optional[str] = None,
+        temperature: Optional[float] = None
     ) -> Tuple[str, List[Dict[str, str]], Dict[str, Any]]:
         """
         Analyze the generator's output and tag bullets.
@@ -57,6 +62,7 @@ class Reflector:
             use_json_mode: Whether to use JSON mode
             call_id: Unique identifier for this call
             log_dir: Directory for logging
+            temperature: Sampling temperature (None uses the provider default)
             
         Returns:
             Tuple of (reflection_content, bullet_tags, call_info)
@@ -89,11 +95,13 @@ class Reflector:
             call_id=call_id,
             max_tokens=self.max_tokens,
             log_dir=log_dir,
-            use_json_mode=use_json_mode
+            use_json_mode=use_json_mode,
+            temperature=temperature
         )
         
         # Extract bullet tags
-        bullet_tags = self._extract_bullet_tags(response, use_json_mode)
+        with trace_span("reflector.parse", "reflector", call_id=call_id):
+            bullet_tags = self._extract_bullet_tags(response, use_json_mode)
         
         return response, bullet_tags, call_info
     
@@ -112,39 +120,12 @@ class Reflector:
         Returns:
             List of dicts with 'id' and 'tag' keys
         """
-        bullet_tags = []
-        
-        if use_json_mode:
-            try:
-                response_json = json.loads(response)
-                bullet_tags = response_json.get("bullet_tags", [])
-            except (json.JSONDecodeError, KeyError):
-                print(f"Warning: Failed to parse bullet tags from JSON response")
-        else:
-            # Try to extract from non-JSON response
-            # This is a fallback and may not always work
-            try:
-                # Look for JSON-like structure in the response
-                start_idx = response.find('"bullet_tags"')
-                if start_idx != -1:
-                    # Find the array
-                    bracket_idx = response.find('[', start_idx)
-                    if bracket_idx != -1:
-                        # Find matching closing bracket
-                        depth = 0
-                        end_idx = bracket_idx
-                        for i in range(bracket_idx, len(response)):
-                            if response[i] == '[':
-                                depth += 1
-                            elif response[i] == ']':
-                                depth -= 1
-                                if depth == 0:
-                                    end_idx = i + 1
-                                    break
-                        
-                        bullet_tags_str = response[bracket_idx:end_idx]
-                        bullet_tags = json.loads(bullet_tags_str)
-            except Exception as e:
-                print(f"Warning: Failed to extract bullet tags: {e}")
+        parsed = parse_reflector_response(response)
+        if parsed.truncated and not get_truncation_recovery().enabled:
+            # Without truncation recovery only a bullet_tags array written out in full counts
+            log.warning("Reflector response was cut off at max_tokens; using only a complete bullet_tags array")
+            return list(parsed.complete_bullet_tags or [])
+        if use_json_mode and not parsed.ok:
+            log.warning("Failed to parse bullet tags from JSON response")
         
-        return bullet_tags
\ No newline at end of file
+        return list(parsed.bullet_tags or [])
@@ -6,10 +6,13 @@ Contains all prompts for Generator, Reflector, and Curator agents.
 from .generator import *
 from .reflector import *
 from .curator import *
+from .reflect_curator import *
 
 __all__ = [
     # Generator prompts
     'GENERATOR_PROMPT',
+    'GENERATOR_PACKED_PROMPT',
+    'GENERATOR_FOLLOWUP_PROMPT',
     
     # Reflector prompts
     'REFLECTOR_PROMPT',
@@ -18,4 +21,8 @@ __all__ = [
     # Curator prompts
     'CURATOR_PROMPT',
     'CURATOR_PROMPT_NO_GT',
+    
+    # Fused reflector + curator prompts
+    'REFLECT_CURATOR_PROMPT',
+    'REFLECT_CURATOR_PROMPT_NO_GT',
 ]
\ No newline at end of file
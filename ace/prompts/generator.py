@@ -39,4 +39,50 @@ Your output should be a json object, which contains the following fields:
 }}
 
 ---
-"""
\ No newline at end of file
+"""
+# Packed variant: several independent questions answered under one shared playbook
+GENERATOR_PACKED_PROMPT = """You are an analysis expert tasked with answering questions using your knowledge and a curated playbook of strategies and insights.
+
+**Instructions:**
+- Read the playbook carefully and apply relevant strategies, formulas, and insights
+- Pay attention to common mistakes listed in the playbook and avoid them
+- You will receive {num_questions} independent questions, each with its own context. Answer each one on its own; do not carry information between questions
+- Show your reasoning step-by-step for each question
+- Double-check your calculations and logic before providing each final answer
+
+Your output should be a json object with an "answers" list containing exactly one entry per question, in order. Each entry contains:
+- id: the number of the question
+- reasoning: your chain of thought / reasoning / thinking process, detailed analysis and calculations
+- bullet_ids: each line in the playbook has a bullet_id. all bulletpoints in the playbook that's relevant, helpful for you to answer this question, you should include their bullet_id in this list
+- final_answer: your concise final answer
+
+
+**Playbook:**
+{playbook}
+
+{questions}
+
+**Answer in this exact JSON format:**
+{{
+  "answers": [
+    {{
+      "id": 1,
+      "reasoning": "[Your chain of thought / reasoning / thinking process, detailed analysis and calculations]",
+      "bullet_ids": ["calc-00001", "fin-00002"],
+      "final_answer": "[Your concise final answer here]"
+    }}
+  ]
+}}
+
+---
+"""
+
+# Follow-up turn of a generation session: the original prompt and previous
+# answer stay in the conversation, only the reflection is new
+GENERATOR_FOLLOWUP_PROMPT = """Your previous answer was reviewed. Here is a reflection that goes over the diagnosis of the mistakes made while answering the question:
+
+**Reflection:**
+{}
+
+Using the playbook, the question and the context from the first message together with this reflection, answer the question again. Answer in the exact same JSON format as before, with "reasoning", "bullet_ids" and "final_answer" fields.
+"""
@@ -0,0 +1,141 @@
+"""
+Fused reflector + curator prompts for ACE system.
+"""
+
+# Single prompt that diagnoses the generator's answer, tags the bullets it used
+# and proposes playbook operations in one response
+REFLECT_CURATOR_PROMPT = """You are an expert analyst and educator, and the Curator of a "living playbook" of insights in the Agentic Context Engineering (ACE) system. In one pass you diagnose a model's answer and update the playbook used by the model.
+
+**Instructions (diagnosis):**
+- Carefully analyze the model's reasoning trace, comparing the predicted answer with the ground truth
+- Take the environment feedback into account
+- If the answer is wrong, identify specific conceptual errors, calculation mistakes, or misapplied strategies and their root cause
+- If the answer is right, identify which strategies made it work
+- You will receive the bulletpoints of the playbook that the model used. Give the tag for each bulletpoint, tag can be ['helpful', 'harmful', 'neutral'] (for the generator to generate the correct answer)
+
+**Instructions (curation):**
+1. **DELTA UPDATES ONLY**: Do not rewrite what is already in the playbook. Only identify what is MISSING.
+2. **CONTEXT-LEAN**: Avoid generic advice. Provide specific, actionable heuristics (domain-specific rules).
+3. **NO CONTEXT COLLAPSE**: Bullet points should be exhaustive enough to be useful but atomic enough to be individual units of knowledge.
+4. Return an empty operations list if the playbook already covers the lesson.
+
+## CURRENT STATE
+- Token Budget: {token_budget}
+- Progress: Sample {current_step}/{total_samples}
+
+### Playbook Statistics
+{playbook_stats}
+
+**Question:**
+{question}
+
+**Question Context:**
+{question_context}
+
+**Model's Reasoning Trace:**
+{reasoning_trace}
+
+**Model's Predicted Answer:**
+{predicted_answer}
+
+**Ground Truth Answer:**
+{ground_truth}
+
+**Environment Feedback:**
+{environment_feedback}
+
+**Part of Playbook that's used by the generator to answer the question:**
+{bullets_used}
+
+**Current Playbook (The Knowledge Base):**
+{current_playbook}
+
+## OUTPUT FORMAT
+Output ONLY a valid JSON object. No markdown, no commentary.
+{{
+  "reasoning": "[Your chain of thought / reasoning / thinking process, detailed analysis and calculations, and why the current bullets did or did not cover this case]",
+  "error_identification": "[What specifically went wrong in the reasoning? 'None' if the answer is correct]",
+  "root_cause_analysis": "[Why did this error occur? What concept was misunderstood?]",
+  "correct_approach": "[What should the model have done instead?]",
+  "key_insight": "[What strategy, formula, or principle should be remembered?]",
+  "bullet_tags": [
+    {{"id": "calc-00001", "tag": "helpful"}},
+    {{"id": "fin-00002", "tag": "harmful"}}
+  ],
+  "operations": [
+    {{
+      "type": "ADD",
+      "section": "strategies_and_insights | formulas_and_calculations | code_snippets_and_templates | common_mistakes_to_avoid | problem-solving_heuristics | context_clues_and_indicators | others",
+      "content": "Specific, detailed heuristic content."
+    }}
+  ]
+}}
+
+---
+"""
+
+REFLECT_CURATOR_PROMPT_NO_GT = """You are an expert analyst and educator, and the Curator of a "living playbook" of insights in the Agentic Context Engineering (ACE) system. In one pass you diagnose a model's answer and update the playbook used by the model.
+
+**Instructions (diagnosis):**
+- Carefully analyze the model's reasoning trace to identify where it went wrong or what made it work
+- Take the environment feedback into account
+- Identify specific conceptual errors, calculation mistakes, or misapplied strategies and their root cause
+- You will receive the bulletpoints of the playbook that the model used. Give the tag for each bulletpoint, tag can be ['helpful', 'harmful', 'neutral'] (for the generator to generate the correct answer)
+
+**Instructions (curation):**
+1. **DELTA UPDATES ONLY**: Do not rewrite what is already in the playbook. Only identify what is MISSING.
+2. **CONTEXT-LEAN**: Avoid generic advice. Provide specific, actionable heuristics (domain-specific rules).
+3. **NO CONTEXT COLLAPSE**: Bullet points should be exhaustive enough to be useful but atomic enough to be individual units of knowledge.
+4. Return an empty operations list if the playbook already covers the lesson.
+
+## CURRENT STATE
+- Token Budget: {token_budget}
+- Progress: Sample {current_step}/{total_samples}
+
+### Playbook Statistics
+{playbook_stats}
+
+**Question:**
+{question}
+
+**Question Context:**
+{question_context}
+
+**Model's Reasoning Trace:**
+{reasoning_trace}
+
+**Model's Predicted Answer:**
+{predicted_answer}
+
+**Environment Feedback:**
+{environment_feedback}
+
+**Part of Playbook that's used by the generator to answer the question:**
+{bullets_used}
+
+**Current Playbook (The Knowledge Base):**
+{current_playbook}
+
+## OUTPUT FORMAT
+Output ONLY a valid JSON object. No markdown, no commentary.
+{{
+  "reasoning": "[Your chain of thought / reasoning / thinking process, detailed analysis and calculations, and why the current bullets did or did not cover this case]",
+  "error_identification": "[What specifically went wrong in the reasoning?]",
+  "root_cause_analysis": "[Why did this error occur? What concept was misunderstood?]",
+  "correct_approach": "[What should the model have done instead?]",
+  "key_insight": "[What strategy, formula, or principle should be remembered?]",
+  "bullet_tags": [
+    {{"id": "calc-00001", "tag": "helpful"}},
+    {{"id": "fin-00002", "tag": "harmful"}}
+  ],
+  "operations": [
+    {{
+      "type": "ADD",
+      "section": "strategies_and_insights | formulas_and_calculations | code_snippets_and_templates | common_mistakes_to_avoid | problem-solving_heuristics | context_clues_and_indicators | others",
+      "content": "Specific, detailed heuristic content."
+    }}
+  ]
+}}
+
+---
+"""
@@ -14,6 +14,8 @@ sys.path.append(os.getcwd())
 from ace.ace import ACE
 from eval.finance.data_processor import DataProcessor
 from playbook_utils import get_playbook_stats
+from checkpoint import save_checkpoint, load_checkpoint
+from llm import configure_output_budgets, configure_truncation_recovery
 
 # Azure OpenAI Pricing
 PRICING = {
@@ -53,6 +55,13 @@ class TokenBucket:
         self.total_consumed += tokens
         return True
 
+def estimate_sample_tokens(budgets, prompt_tokens=2000, default_output_tokens=1000):
+    """Tokens to reserve for one training sample: a prompt plus the learned output budget per agent"""
+    return sum(
+        prompt_tokens + (budgets.learned(role) or default_output_tokens)
+        for role in ("generator", "reflector", "curator")
+    )
+
 def get_model_price(model_name):
     for key in PRICING:
         if key in model_name.lower():
@@ -90,6 +99,11 @@ def main():
     DATA_FILE = "eval/finance/data/finer_train_batched_1000_samples.jsonl"
     # Log Directory (Persistent)
     BATCH_LOG_DIR = "logs/phase3_batch_run"
+    # Output budgets (same meaning and defaults as the ACE options). The rate
+    # limiter sizes its reservations from observed response lengths either way.
+    ADAPTIVE_MAX_TOKENS = False
+    MAX_TOKENS_MARGIN = 0.2
+    MAX_CONTINUATIONS = 0
     
     print("\n" + "="*80)
     print("🚀 ACE SMART BATCH RUNNER")
@@ -149,13 +163,22 @@ def main():
         initial_playbook=initial_playbook
     )
     
-    # 5. Initialize Token Bucket
-    bucket = TokenBucket(rate_per_minute=RATE_LIMIT_TPM, capacity=100000) # Bucket size smaller than 1 min rate
-    
-    # 6. Training Loop
-    print("\n▶️ Starting Batch Execution...")
+    # Resume from the batch checkpoint (playbook, bullet IDs and completed samples)
+    completed_samples = set()
+    checkpoint_file = Path(BATCH_LOG_DIR) / "checkpoint.json"
+    if checkpoint_file.exists():
+        checkpoint = load_checkpoint(str(checkpoint_file))
+        ace._restore_checkpoint_state(checkpoint)
+        completed_samples = set(checkpoint["completed_samples"])
+        print(f"✅ Resumed from checkpoint ({len(completed_samples)} samples done, saved {checkpoint['saved_at']})")
     
+    # 5. Initialize Token Bucket and per-role output budgets (max_tokens above is the cap)
     config_params = {
+        **ace._extract_config_params({
+            'adaptive_max_tokens': ADAPTIVE_MAX_TOKENS,
+            'max_tokens_margin': MAX_TOKENS_MARGIN,
+            'max_continuations': MAX_CONTINUATIONS,
+        }),
         'max_num_rounds': 1,
         'curator_frequency': 1,
         'token_budget': 1000, # Unused legcay param
@@ -163,6 +186,13 @@ def main():
         'no_ground_truth': False,
         'test_workers': 1
     }
+    bucket = TokenBucket(rate_per_minute=RATE_LIMIT_TPM, capacity=100000) # Bucket size smaller than 1 min rate
+    budgets = configure_output_budgets(enabled=config_params['adaptive_max_tokens'],
+                                       margin=config_params['max_tokens_margin'])
+    configure_truncation_recovery(max_continuations=config_params['max_continuations'])
+    
+    # 6. Training Loop
+    print("\n▶️ Starting Batch Execution...")
     
     skipped = 0
     executed = 0
@@ -172,17 +202,10 @@ def main():
         step_id = f"train_e_1_s_{global_sample_id}"
         
         # --- RESUMABILITY CHECK ---
-        # Check if post_curate log exists for this step
-        expected_log = list(detailed_log_dir.glob(f"*_{step_id}_post_curate_*.json"))
-        if expected_log:
+        # The checkpoint restored the playbook as of the last completed sample
+        if global_sample_id in completed_samples:
             print(f"⏭️  Skipping Sample {global_sample_id} (Already completed)")
             skipped += 1
-            # Update ACE playbook state from disk if needed? 
-            # Actually, if we skip, our in-memory playbook is stale.
-            # To be truly resumable, we should load the LATEST playbook from the logs.
-            # But simpler: Just proceed. The next curator step will use the current in-memory playbook.
-            # Ideally, we should restart from the *final* playbook of the last run.
-            # Ensure "initial_playbook" loaded above is the verified one.
             continue
             
         # --- BUDGET CHECK ---
@@ -192,10 +215,9 @@ def main():
             break
             
         # --- RATE LIMIT CHECK ---
-        # Estimate cost: 2k input + 1k output = 3000 tokens per agent
-        # 3 agents = 9000 tokens estimated worst case
-        # Consume upfront? Or simpler: consume a chunk now.
-        bucket.consume(6000) # Reserve 6k tokens
+        # Estimate: 2k input per agent plus its learned output budget
+        # (1k per agent until enough responses have been observed)
+        bucket.consume(estimate_sample_tokens(budgets))
         
         # --- EXECUTE ---
         print(f"\n📍 Processing Sample {global_sample_id} (Cost: ${current_cost:.4f})")
@@ -213,10 +235,16 @@ def main():
                 total_samples=len(processed_data)
             )
             executed += 1
+            completed_samples.add(global_sample_id)
             
-            # Save Playbook Checkpoint
-            checkpoint_path = Path(BATCH_LOG_DIR) / "final_playbook.txt"
-            with open(checkpoint_path, "w", encoding='utf-8') as f:
+            # Save Checkpoint (atomic) and the current playbook
+            save_checkpoint(BATCH_LOG_DIR, {
+                "mode": "batch",
+                **ace._checkpoint_state(),
+                "completed_samples": sorted(completed_samples),
+            })
+            playbook_path = Path(BATCH_LOG_DIR) / "final_playbook.txt"
+            with open(playbook_path, "w", encoding='utf-8') as f:
                 f.write(ace.playbook)
                 
         except Exception as e:
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON extraction (extract_json_from_text / decode_json) on large
+synthetic curator responses.
+
+Each response has long reasoning prose full of braces ({placeholders}, inline
+{"key": value} examples and an optional stray '{') followed by an operations
+object whose contents also contain braces. The time per KB should stay flat
+as the response size doubles; a growing time per KB means the scan is no
+longer linear.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_json_extraction --sizes 20000 40000 80000 160000 --repeats 5
+"""
+import json
+import time
+import random
+import argparse
+from response_parsing import decode_json
+from playbook_utils import extract_json_from_text
+
+
+def make_response(size: int, variant: str, seed: int = 0) -> str:
+    """
+    Build a synthetic curator response of roughly `size` characters.
+
+    Args:
+        size: Approximate response length in characters
+        variant: 'prose' (prose then a complete object), 'stray' (an unmatched
+            '{' in the prose), 'truncated' (the object is cut off) or 'json'
+            (the bare object)
+        seed: Random seed for the filler text
+
+    Returns:
+        The response text
+    """
+    rng = random.Random(seed)
+    words = ["rate", "cash", "flow", "{period}", "{rate}", "bond", "yield", "{x}", "total", "net"]
+    prose = []
+    while sum(len(part) for part in prose) < size // 2:
+        sentence = " ".join(rng.choice(words) for _ in range(12))
+        if rng.random() < 0.2:
+            sentence += ' e.g. {"example": {"value": %d}}' % rng.randint(0, 99)
+        prose.append(sentence + ".")
+    if variant == "stray":
+        prose.insert(len(prose) // 2, "Use the {formula described above")
+
+    operations = []
+    while len(json.dumps(operations)) < size // 2:
+        operations.append({
+            "type": "ADD",
+            "section": "formulas_and_calculations",
+            "content": "Compute {value} as {a} / {b}; keep \"quoted\" {braces} inside strings " * 2,
+        })
+    payload = json.dumps({"reasoning": "Adding formula bullets.", "operations": operations}, indent=2)
+    if variant == "json":
+        return payload
+    if variant == "truncated":
+        payload = payload[:int(len(payload) * 0.9)]
+    return "\n".join(prose) + "\n\nFinal answer:\n" + payload
+
+
+def time_call(fn, text: str, repeats: int) -> float:
+    """Best-of-`repeats` wall time of fn(text) in seconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON extraction from LLM responses")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20000, 40000, 80000, 160000, 320000],
+                        help="Response sizes in characters")
+    parser.add_argument("--variants", nargs="+", default=["json", "prose", "stray", "truncated"],
+                        choices=["json", "prose", "stray", "truncated"])
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    # Bypass the response cache so every run decodes from scratch
+    uncached = decode_json.__wrapped__
+
+    print(f"{'variant':<10} {'size':>9} {'ms':>9} {'us/KB':>8} {'source':<10} {'operations':>10}")
+    for variant in args.variants:
+        previous = None
+        for size in args.sizes:
+            text = make_response(size, variant)
+            seconds = time_call(uncached, text, args.repeats)
+            result, source = uncached(text)
+            found = len(result.get("operations", [])) if isinstance(result, dict) else 0
+            per_kb = seconds * 1e6 / (len(text) / 1024)
+            growth = f"  x{per_kb / previous:.2f}" if previous else ""
+            previous = per_kb
+            print(f"{variant:<10} {len(text):>9} {seconds * 1000:>9.2f} {per_kb:>8.1f} {source:<10} {found:>10}{growth}")
+
+    # Sanity check of the public entry point on one response
+    result = extract_json_from_text(make_response(args.sizes[0], "prose"), "operations")
+    assert isinstance(result, dict) and result.get("operations"), "extract_json_from_text found no operations"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+==============================================================================
+checkpoint.py
+==============================================================================
+
+This file contains crash-safe checkpointing for offline and online training.
+
+A checkpoint is a single JSON document written atomically (temp file, fsync,
+os.replace) to `<run folder>/checkpoint.json`, so a crash mid-write leaves the
+previous checkpoint intact. It holds everything ACE needs to continue a run
+exactly where it stopped: playbook state, position and the RNG state.
+
+Accumulated per-step results (append-only lists) would make every checkpoint
+rewrite the whole run history. They are appended to a journal instead
+(`<run folder>/checkpoint_journal.jsonl`, see CheckpointJournal); the
+checkpoint only records the journal length it is consistent with and the few
+trailing items that may still change.
+
+"""
+import os
+import json
+from datetime import datetime
+
+CHECKPOINT_FILENAME = "checkpoint.json"
+JOURNAL_FILENAME = "checkpoint_journal.jsonl"
+CHECKPOINT_VERSION = 2
+
+
+def rng_state_to_json(state):
+    """Convert random.Random.getstate() output to JSON-serializable lists"""
+    version, internal_state, gauss_next = state
+    return [version, list(internal_state), gauss_next]
+
+
+def rng_state_from_json(data):
+    """Inverse of rng_state_to_json"""
+    version, internal_state, gauss_next = data
+    return (version, tuple(internal_state), gauss_next)
+
+
+def save_checkpoint(save_path, state):
+    """
+    Atomically write a checkpoint into a run folder.
+
+    Args:
+        save_path: Run folder (the checkpoint is written as save_path/checkpoint.json)
+        state: JSON-serializable checkpoint state
+
+    Returns:
+        Path of the written checkpoint
+    """
+    checkpoint_path = os.path.join(save_path, CHECKPOINT_FILENAME)
+    tmp_path = checkpoint_path + ".tmp"
+    payload = dict(state)
+    payload["checkpoint_version"] = CHECKPOINT_VERSION
+    payload["saved_at"] = datetime.now().isoformat()
+
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, checkpoint_path)
+    return checkpoint_path
+
+
+def load_checkpoint(path):
+    """
+    Load a checkpoint.
+
+    Args:
+        path: Path to a checkpoint.json file or to the run folder containing it
+
+    Returns:
+        Checkpoint state dictionary
+    """
+    if os.path.isdir(path):
+        path = os.path.join(path, CHECKPOINT_FILENAME)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Checkpoint not found: {path}")
+
+    with open(path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+
+    version = state.get("checkpoint_version")
+    if version != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version: {version} (expected {CHECKPOINT_VERSION})")
+    return state
+
+
+class CheckpointJournal:
+    """
+    Append-only journal of the result lists of a training loop.
+    
+    Each checkpoint writes only the list items added since the previous one, so
+    checkpoint cost stays proportional to the step instead of the run. A list
+    is identified by name and by the list object: passing a different object
+    under the same name (e.g. the answer lists of a new epoch) starts it over.
+    
+    Journal lines are {"list": name, "item": item} or {"list": name, "reset": true}.
+    The checkpoint stores the journal size at sync time; lines past it were
+    written after the last checkpoint and are dropped on restore.
+    """
+    
+    def __init__(self, save_path):
+        self.path = os.path.join(save_path, JOURNAL_FILENAME)
+        # name -> [list object, number of its items already journaled]
+        self._lists = {}
+    
+    def sync(self, lists, stable=None):
+        """
+        Append new items of `lists` to the journal and fsync it.
+        
+        Args:
+            lists: Dictionary of list name -> list
+            stable: Optional number of leading items per list name that will not
+                change any more; later items are returned as the list's tail
+                instead of being journaled (default: all items are stable)
+        
+        Returns:
+            JSON-serializable journal state to store in the checkpoint
+        """
+        stable = stable or {}
+        lines = []
+        tails = {}
+        for name, items in lists.items():
+            tracked = self._lists.get(name)
+            if tracked is None or tracked[0] is not items:
+                tracked = self._lists[name] = [items, 0]
+                lines.append(json.dumps({"list": name, "reset": True}))
+            limit = min(stable.get(name, len(items)), len(items))
+            for item in items[tracked[1]:limit]:
+                lines.append(json.dumps({"list": name, "item": item}, ensure_ascii=False))
+            tracked[1] = max(tracked[1], limit)
+            tails[name] = items[tracked[1]:]
+        
+        with open(self.path, "a", encoding="utf-8") as f:
+            if lines:
+                f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+            offset = f.tell()
+        return {"offset": offset, "tails": tails}
+    
+    def restore(self, state):
+        """
+        Rebuild the lists saved by sync and continue journaling them.
+        
+        Args:
+            state: Journal state returned by sync (from the checkpoint), or None
+                to start an empty journal
+        
+        Returns:
+            Dictionary of list name -> list (journaled items followed by the tail)
+        """
+        self._lists = {}
+        offset = state["offset"] if state else 0
+        lists = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r+b") as f:
+                data = f.read(offset)
+                f.truncate(offset)
+            for line in data.decode("utf-8").splitlines():
+                entry = json.loads(line)
+                if entry.get("reset"):
+                    lists[entry["list"]] = []
+                else:
+                    lists[entry["list"]].append(entry["item"])
+        
+        restored = {}
+        for name, tail in (state["tails"] if state else {}).items():
+            items = lists.get(name, [])
+            self._lists[name] = [items, len(items)]
+            items.extend(tail)
+            restored[name] = items
+        return restored
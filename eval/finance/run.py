@@ -53,6 +53,86 @@ def parse_args():
                         help="Update playbook every N samples for evaluation in online mode")
     parser.add_argument("--save_steps", type=int, default=50,
                         help="Save intermediate playbooks every N steps")
+    parser.add_argument("--checkpoint_steps", type=int, default=0,
+                        help="Write a resumable checkpoint every N steps (0 disables checkpoints)")
+    parser.add_argument("--resume_from", type=str, default=None,
+                        help="Run folder (or its checkpoint.json) of an interrupted run to resume")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed for ACE's training RNG")
+    parser.add_argument("--pipeline_depth", type=int, default=0,
+                        help="Offline mode: prefetch initial generations for the next N samples while "
+                             "the current one is reflected on and curated (0 = serial)")
+    parser.add_argument("--max_staleness", type=int, default=4,
+                        help="Max playbook versions a prefetched generation may lag before it is regenerated")
+    parser.add_argument("--post_curate_generation", type=str, default="sync",
+                        choices=["sync", "deferred", "off"],
+                        help="Post-curate generation for post-train tracking: every step ('sync'), batched in "
+                             "parallel at each eval interval / online window ('deferred'), or not at all ('off')")
+    parser.add_argument("--batch_size", type=int, default=1,
+                        help="Offline mode: train on mini-batches of N samples concurrently against one "
+                             "playbook version, merging their curator operations into one update")
+    parser.add_argument("--async_validation", action="store_true",
+                        help="Offline mode: run periodic validation in the background on a snapshot of the "
+                             "playbook while training continues")
+    parser.add_argument("--max_concurrent_validations", type=int, default=1,
+                        help="Max background validations running at once (each uses --test_workers threads)")
+    parser.add_argument("--sequential_validation", action="store_true",
+                        help="Offline mode: validate random stratified chunks and stop early once the accuracy "
+                             "confidence interval is clearly above or below the best so far")
+    parser.add_argument("--validation_confidence", type=float, default=0.95,
+                        help="Confidence of the sequential validation early-stop decision")
+    parser.add_argument("--validation_chunk_size", type=int, default=None,
+                        help="Samples per sequential validation chunk (default: --test_workers)")
+    parser.add_argument("--reflect_on_correct_skip_rate", type=float, default=0.0,
+                        help="Fraction of correct answers citing only consistently helpful bullets whose "
+                             "reflector call is replaced by tagging those bullets helpful (0 = always reflect)")
+    parser.add_argument("--skip_min_helpful", type=int, default=3,
+                        help="Min helpful count (and no harmful tags) for a bullet to count as consistently helpful")
+    parser.add_argument("--speculative_reflections", type=int, default=1,
+                        help="Reflection candidates run in parallel per round for incorrect answers; the first "
+                             "whose regeneration fixes the answer wins (1 = sequential rounds). Without "
+                             "--reflection_temperatures all candidates sample at the model's default temperature")
+    parser.add_argument("--reflection_temperatures", type=float, nargs="+", default=None,
+                        help="Sampling temperature per speculative reflection candidate (cycled); "
+                             "omit for models that only accept the default temperature. When omitted, "
+                             "all candidates use the model's default temperature and differ only by "
+                             "sampling randomness")
+    parser.add_argument("--fused_reflect_curate", action="store_true",
+                        help="Reflect and curate in a single LLM call that returns both bullet tags and "
+                             "curator operations (requires --curator_frequency 1)")
+    parser.add_argument("--curator_context", type=str, default="full", choices=["full", "focused"],
+                        help="Playbook shown to the curator: the full playbook, or only the bullets nearest "
+                             "to the reflection, the cited bullets and a per-section summary")
+    parser.add_argument("--curator_neighbors", type=int, default=20,
+                        help="Number of nearest bullets shown to the curator with --curator_context focused")
+    parser.add_argument("--playbook_format", type=str, default="raw",
+                        choices=["raw", "compact", "compact_bucketed"],
+                        help="Playbook rendering in generator prompts: raw text, or short bullet aliases with "
+                             "helpful/harmful counters omitted (compact) or bucketed (compact_bucketed)")
+    parser.add_argument("--eval_pack_size", type=int, default=1,
+                        help="Max test/validation questions answered per generator call (1 = one request per sample)")
+    parser.add_argument("--eval_pack_token_budget", type=int, default=4000,
+                        help="Max question + context tokens per packed evaluation call")
+    parser.add_argument("--cascade_model", type=str, default=None,
+                        help="Cheap generator model tried first for evaluation and initial generations; "
+                             "escalates to --generator_model when its answer is not confident")
+    parser.add_argument("--cascade_samples", type=int, default=1,
+                        help="Cheap-model samples per question, drawn in one request (provider n parameter); "
+                             "escalate if their answers disagree")
+    parser.add_argument("--cascade_min_logprob_margin", type=float, default=None,
+                        help="Escalate when the cheap answer's top-1 vs top-2 token logprob margin is "
+                             "below this (requires provider logprobs support)")
+    parser.add_argument("--adaptive_max_tokens", action="store_true",
+                        help="Learn per-role max_tokens from the p99 of observed response lengths "
+                             "(capped at --max_tokens); truncated responses are retried at the cap")
+    parser.add_argument("--max_tokens_margin", type=float, default=0.2,
+                        help="Safety margin added to the observed p99 with --adaptive_max_tokens")
+    parser.add_argument("--reflection_session", action="store_true",
+                        help="Send regenerations after a reflection as follow-up turns of the initial "
+                             "generation's conversation so the unchanged prefix can hit prompt caches")
+    parser.add_argument("--max_continuations", type=int, default=0,
+                        help="Salvage responses truncated at max_tokens and request up to this many "
+                             "continuations when a required field is missing (0 disables)")
     
     # System configuration
     parser.add_argument("--max_tokens", type=int, default=4096,
@@ -78,6 +158,22 @@ def parse_args():
     parser.add_argument("--save_path", type=str, required=True,
                         help="Directory to save results")
     
+    # Logging configuration
+    parser.add_argument("--log_level", type=str, default="INFO",
+                        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="Console log level for the ACE logger hierarchy")
+    parser.add_argument("--quiet", action="store_true",
+                        help="Production mode: only print warnings and errors")
+    parser.add_argument("--log_file", type=str, default=None,
+                        help="Optional file that receives all log records at --log_level")
+    parser.add_argument("--metrics_port", type=int, default=None,
+                        help="Serve live Prometheus metrics on http://127.0.0.1:PORT/metrics during the run")
+    parser.add_argument("--trace_format", type=str, default=None,
+                        choices=["chrome", "otlp"],
+                        help="Write pipeline trace spans to the run folder (Chrome trace-event or OTLP-JSON)")
+    parser.add_argument("--trace_max_spans", type=int, default=100000,
+                        help="Most recent trace spans kept in memory (about 1 KB each); older ones are dropped")
+    
     return parser.parse_args()
 
 def load_data(data_path: str):
@@ -212,6 +308,34 @@ def main():
         'eval_steps': args.eval_steps,
         'online_eval_frequency': args.online_eval_frequency,
         'save_steps': args.save_steps,
+        'checkpoint_steps': args.checkpoint_steps,
+        'seed': args.seed,
+        'pipeline_depth': args.pipeline_depth,
+        'max_staleness': args.max_staleness,
+        'batch_size': args.batch_size,
+        'post_curate_generation': args.post_curate_generation,
+        'async_validation': args.async_validation,
+        'max_concurrent_validations': args.max_concurrent_validations,
+        'sequential_validation': args.sequential_validation,
+        'validation_confidence': args.validation_confidence,
+        'validation_chunk_size': args.validation_chunk_size,
+        'reflect_on_correct_skip_rate': args.reflect_on_correct_skip_rate,
+        'skip_min_helpful': args.skip_min_helpful,
+        'speculative_reflections': args.speculative_reflections,
+        'reflection_temperatures': args.reflection_temperatures,
+        'fused_reflect_curate': args.fused_reflect_curate,
+        'curator_context': args.curator_context,
+        'curator_neighbors': args.curator_neighbors,
+        'playbook_format': args.playbook_format,
+        'eval_pack_size': args.eval_pack_size,
+        'eval_pack_token_budget': args.eval_pack_token_budget,
+        'cascade_model': args.cascade_model,
+        'cascade_samples': args.cascade_samples,
+        'cascade_min_logprob_margin': args.cascade_min_logprob_margin,
+        'adaptive_max_tokens': args.adaptive_max_tokens,
+        'max_tokens_margin': args.max_tokens_margin,
+        'reflection_session': args.reflection_session,
+        'max_continuations': args.max_continuations,
         'playbook_token_budget': args.playbook_token_budget,
         'task_name': args.task_name,
         'mode': args.mode,
@@ -222,7 +346,13 @@ def main():
         'initial_playbook_path': args.initial_playbook_path,
         'use_bulletpoint_analyzer': args.use_bulletpoint_analyzer,
         'bulletpoint_analyzer_threshold': args.bulletpoint_analyzer_threshold,
-        'api_provider': args.api_provider
+        'api_provider': args.api_provider,
+        'log_level': args.log_level,
+        'quiet': args.quiet,
+        'log_file': args.log_file,
+        'trace_format': args.trace_format,
+        'trace_max_spans': args.trace_max_spans,
+        'metrics_port': args.metrics_port
     }
     
     # Execute using the unified run method
@@ -232,7 +362,8 @@ def main():
         val_samples=val_samples,
         test_samples=test_samples,
         data_processor=data_processor,
-        config=config
+        config=config,
+        resume_from=args.resume_from
     )
         
 
@@ -6,14 +6,170 @@ llm.py
 This file contains the LLM class for the project.
 
 """
+import math
 import time
 import random
+import threading
+from collections import deque
 from datetime import datetime
+import logging
 import openai
 from logger import log_llm_call, log_problematic_request
+from logging_utils import get_logger
+from tracing import trace_span
+from response_parsing import REQUIRED_FIELDS, missing_fields
+import metrics
+
+CONTINUATION_PROMPT = (
+    "Your previous response was cut off by the output length limit. Continue exactly where it "
+    "stopped: output only the remaining text, without repeating anything already written and "
+    "without any preamble, so that the two parts joined together form the complete response."
+)
+
+class OutputBudgets:
+    """
+    Per-role max_tokens learned from observed response lengths.
+    
+    The budget of a role is the p99 of its last `window` response lengths
+    (per choice) plus a `margin` safety factor, clamped to [min_tokens, cap],
+    where cap is the max_tokens the caller passed. Until `min_samples`
+    responses were seen, or when disabled, the cap is used unchanged.
+    """
+    
+    def __init__(self, enabled=False, margin=0.2, window=200, min_samples=20, min_tokens=256):
+        self.enabled = enabled
+        self.margin = margin
+        self.min_samples = min_samples
+        self.min_tokens = min_tokens
+        self._window = window
+        self._observed = {}
+        self._truncations = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, role, response_tokens, truncated=False):
+        """Record the length of one response (per choice) for a role"""
+        with self._lock:
+            self._observed.setdefault(role, deque(maxlen=self._window)).append(response_tokens)
+            if truncated:
+                self._truncations[role] = self._truncations.get(role, 0) + 1
+    
+    def learned(self, role):
+        """Learned budget of a role (p99 plus margin, uncapped), or None before min_samples responses"""
+        with self._lock:
+            observed = sorted(self._observed.get(role, ()))
+        if len(observed) < self.min_samples:
+            return None
+        p99 = observed[min(len(observed) - 1, math.ceil(0.99 * len(observed)) - 1)]
+        return max(self.min_tokens, math.ceil(p99 * (1 + self.margin)))
+    
+    def budget(self, role, cap):
+        """max_tokens to request for a role, never above cap"""
+        learned = self.learned(role) if self.enabled else None
+        return cap if learned is None else min(cap, learned)
+    
+    def summary(self, cap):
+        """Learned budget, observations and truncation retries per role"""
+        with self._lock:
+            roles = {role: len(observed) for role, observed in self._observed.items()}
+            truncations = dict(self._truncations)
+        return {
+            role: {"budget": self.budget(role, cap), "observed": count, "truncation_retries": truncations.get(role, 0)}
+            for role, count in roles.items()
+        }
+
+
+_output_budgets = OutputBudgets()
+
+
+def get_output_budgets():
+    """Return the process-wide output budgets"""
+    return _output_budgets
+
+
+def configure_output_budgets(enabled=False, margin=0.2, **kwargs):
+    """
+    Install new process-wide output budgets.
+    
+    Args:
+        enabled: Learn per-role max_tokens (False always uses the caller's max_tokens)
+        margin: Safety factor added on top of the observed p99
+        **kwargs: window, min_samples, min_tokens (see OutputBudgets)
+    
+    Returns:
+        The new OutputBudgets
+    """
+    global _output_budgets
+    _output_budgets = OutputBudgets(enabled=enabled, margin=margin, **kwargs)
+    return _output_budgets
+
+
+class TruncationRecovery:
+    """
+    Recovery of responses cut off at max_tokens (finish_reason 'length').
+    
+    A truncated response whose required fields (REQUIRED_FIELDS of its role)
+    survive the truncation is salvaged as is: the parsers close it after its
+    last complete value, keeping e.g. every complete curator operation. When
+    a required field is missing, up to `max_continuations` follow-up requests
+    ask the model to continue the partial response (prompt, partial answer,
+    continuation request) instead of re-running the whole call, and the parts
+    are joined. Disabled (max_continuations=0), truncated responses are left
+    to the callers as before: the curator rejects a cut-off response instead
+    of applying its salvaged operations, and the reflector keeps only a
+    bullet_tags array that was written out in full.
+    """
+    
+    def __init__(self, max_continuations=0):
+        self.max_continuations = max_continuations
+        self._stats = {}
+        self._lock = threading.Lock()
+    
+    @property
+    def enabled(self):
+        return self.max_continuations > 0
+    
+    def record(self, role, outcome, continuations=0):
+        """Count one truncated response of a role: 'salvaged', 'continued' or 'unrecovered'"""
+        with self._lock:
+            stats = self._stats.setdefault(
+                role, {"truncated": 0, "salvaged": 0, "continued": 0, "unrecovered": 0, "continuation_calls": 0})
+            stats["truncated"] += 1
+            stats[outcome] += 1
+            stats["continuation_calls"] += continuations
+    
+    def summary(self):
+        """Truncated responses per role and how they were recovered"""
+        with self._lock:
+            return {role: dict(stats) for role, stats in self._stats.items()}
+
+
+_truncation_recovery = TruncationRecovery()
+
+
+def get_truncation_recovery():
+    """Return the process-wide truncation recovery"""
+    return _truncation_recovery
+
+
+def configure_truncation_recovery(max_continuations=0):
+    """
+    Install a new process-wide truncation recovery.
+    
+    Args:
+        max_continuations: Continuation requests per truncated response
+            (0 disables salvaging and continuations)
+    
+    Returns:
+        The new TruncationRecovery
+    """
+    global _truncation_recovery
+    _truncation_recovery = TruncationRecovery(max_continuations=max_continuations)
+    return _truncation_recovery
+
 
 def timed_llm_call(client, api_provider, model, prompt, role, call_id, max_tokens=4096, log_dir=None,
-                   sleep_seconds=15, retries_on_timeout=1000, attempt=1, use_json_mode=False):
+                   sleep_seconds=15, retries_on_timeout=1000, attempt=1, use_json_mode=False,
+                   temperature=None, logprobs=False, n=1, messages=None, required_fields=None):
     """
     Make a timed LLM call with error handling and retry logic.
     
@@ -37,18 +193,162 @@ def timed_llm_call(client, api_provider, model, prompt, role, call_id, max_token
         retries_on_timeout: Maximum number of retries for timeouts/rate limits/empty responses
         attempt: Current attempt number (for recursive calls)
         use_json_mode: Whether to use JSON mode for structured output
+        temperature: Sampling temperature; None leaves the provider default
+        logprobs: Request token logprobs and record the answer's logprob margin
+            (see answer_logprob_margin) as call_info["answer_logprob_margin"];
+            only for providers that support the logprobs parameter
+        n: Number of completions to sample in one request (the prompt is billed
+            once); with n > 1 the response is a list of the choices' texts and
+            the logprob margin is recorded per choice
+        messages: Earlier turns of a multi-turn session ({"role", "content"}
+            dicts); `prompt` is sent as the next user turn after them, so the
+            unchanged prefix can be served from the provider's prompt cache
+        required_fields: Top-level JSON fields the response must contain to be
+            usable after a truncation (default: REQUIRED_FIELDS of the role)
+    
+    With adaptive output budgets enabled (configure_output_budgets) max_tokens
+    is the cap: the request uses the role's learned budget, and a response
+    cut off by it (finish_reason 'length') is retried once at the cap. With
+    truncation recovery enabled (configure_truncation_recovery) a truncated
+    response is salvaged or continued instead (see TruncationRecovery), and a
+    response cut off before producing any content is returned as an empty
+    string rather than retried with the same limit; disabled, it is retried
+    like any other empty response.
     
     Returns:
-        tuple: (response_text, call_info_dict)
+        tuple: (response_text, call_info_dict); response_text is a list of
+        texts when n > 1 (a single string on the empty-response fallbacks)
         
     Special return values for empty responses:
         - Training: ("INCORRECT_DUE_TO_EMPTY_RESPONSE, INCORRECT_DUE_TO_EMPTY_RESPONSE, ...", call_info)
         - Testing: ("INCORRECT_DUE_TO_EMPTY_RESPONSE, INCORRECT_DUE_TO_EMPTY_RESPONSE, ...", call_info)
     """
+    # Metrics are recorded once per request attempt, timed from its own start
+    attempt_start = time.time()
+    budgets = _output_budgets
+    metrics.LLM_IN_FLIGHT.inc(role=role, provider=api_provider)
+    try:
+        with trace_span("llm_call", "llm", role=role, call_id=call_id, model=model) as span:
+            request_max_tokens = budgets.budget(role, max_tokens)
+            response_content, call_info = _timed_llm_call(
+                client, api_provider, model, prompt, role, call_id, max_tokens=request_max_tokens,
+                log_dir=log_dir, sleep_seconds=sleep_seconds, retries_on_timeout=retries_on_timeout,
+                attempt=attempt, use_json_mode=use_json_mode, temperature=temperature,
+                logprobs=logprobs, n=n, messages=messages
+            )
+            truncated = call_info.get("finish_reason") == "length"
+            recovery = _truncation_recovery
+            if truncated and recovery.enabled and isinstance(response_content, str) and response_content:
+                required = REQUIRED_FIELDS.get(role, ()) if required_fields is None else required_fields
+                response_content, call_info = _recover_truncated(
+                    recovery, client, api_provider, model, prompt, role, call_id, max_tokens,
+                    response_content, call_info, required, log_dir=log_dir, sleep_seconds=sleep_seconds,
+                    retries_on_timeout=retries_on_timeout, use_json_mode=use_json_mode,
+                    temperature=temperature, messages=messages
+                )
+            elif truncated and request_max_tokens < max_tokens:
+                get_logger(f"llm.{role}").info(
+                    f"[{role.upper()}] Call {call_id} hit the learned budget of {request_max_tokens} tokens, "
+                    f"retrying with {max_tokens}")
+                budgets.observe(role, request_max_tokens, truncated=True)
+                metrics.record_llm_call(role, api_provider, model, call_info, time.time() - attempt_start)
+                attempt_start = time.time()
+                request_max_tokens = max_tokens
+                response_content, call_info = _timed_llm_call(
+                    client, api_provider, model, prompt, role, call_id, max_tokens=request_max_tokens,
+                    log_dir=log_dir, sleep_seconds=sleep_seconds, retries_on_timeout=retries_on_timeout,
+                    attempt=attempt, use_json_mode=use_json_mode, temperature=temperature,
+                    logprobs=logprobs, n=n, messages=messages
+                )
+            if call_info.get("response_num_tokens") is not None:
+                budgets.observe(role, call_info["response_num_tokens"] / call_info.get("n", 1))
+            span.set("max_tokens", request_max_tokens)
+            span.set("prompt_num_tokens", call_info.get("prompt_num_tokens"))
+            span.set("response_num_tokens", call_info.get("response_num_tokens"))
+    except Exception:
+        metrics.record_llm_call(role, api_provider, model, {}, time.time() - attempt_start, status="error")
+        raise
+    finally:
+        metrics.LLM_IN_FLIGHT.dec(role=role, provider=api_provider)
+    status = "empty_response" if "error" in call_info else "ok"
+    metrics.record_llm_call(role, api_provider, model, call_info, time.time() - attempt_start, status=status)
+    return response_content, call_info
+
+
+def _recover_truncated(recovery, client, api_provider, model, prompt, role, call_id, max_tokens,
+                       response, call_info, required, messages=None, **call_kwargs):
+    """
+    Salvage or continue a truncated response (see TruncationRecovery).
+    
+    Returns:
+        tuple: (response_text, call_info); on continuation the text is the
+        joined parts and the token counts and times cover every request
+    """
+    log = get_logger(f"llm.{role}")
+    missing = missing_fields(response, required)
+    if not missing:
+        log.info(f"[{role.upper()}] Call {call_id} was truncated at {call_info.get('max_tokens')} tokens; "
+                 f"salvaged its complete fields")
+        recovery.record(role, "salvaged")
+        return response, {**call_info, "truncation": {"salvaged": True, "continuations": 0}}
+    
+    parts, infos = [response], [call_info]
+    for continuation in range(1, recovery.max_continuations + 1):
+        log.info(f"[{role.upper()}] Call {call_id} was truncated without {', '.join(missing)}; "
+                 f"requesting continuation {continuation}/{recovery.max_continuations}")
+        history = list(messages or []) + [
+            {"role": "user", "content": prompt},
+            {"role": "assistant", "content": "".join(parts)},
+        ]
+        # JSON mode would force the continuation to be a complete object on its own
+        text, info = _timed_llm_call(
+            client, api_provider, model, CONTINUATION_PROMPT, role, f"{call_id}_continue_{continuation}",
+            max_tokens=max_tokens, messages=history, **{**call_kwargs, "use_json_mode": False}
+        )
+        infos.append(info)
+        if "error" in info or not text:
+            break
+        if text.lstrip().startswith(("{", "```")) and not missing_fields(text, required):
+            # The model started over instead of continuing
+            parts = [text]
+        else:
+            parts.append(text)
+        missing = missing_fields("".join(parts), required)
+        if not missing or info.get("finish_reason") != "length":
+            break
+    
+    response = "".join(parts)
+    continuations = len(infos) - 1
+    recovery.record(role, "unrecovered" if missing else "continued", continuations)
+    if missing:
+        log.warning(f"[{role.upper()}] Call {call_id} still lacks {', '.join(missing)} after "
+                    f"{continuations} continuation(s)")
+    
+    def total(key):
+        return sum(info.get(key) or 0 for info in infos)
+    
+    return response, {
+        **call_info,
+        "response": response,
+        "response_length": len(response),
+        "total_time": total("total_time"),
+        "prompt_num_tokens": total("prompt_num_tokens"),
+        "response_num_tokens": total("response_num_tokens"),
+        "cached_prompt_tokens": total("cached_prompt_tokens"),
+        "finish_reason": infos[-1].get("finish_reason", call_info.get("finish_reason")),
+        "truncation": {"salvaged": False, "continuations": continuations, "missing": missing},
+    }
+
+
+def _timed_llm_call(client, api_provider, model, prompt, role, call_id, max_tokens=4096, log_dir=None,
+                    sleep_seconds=15, retries_on_timeout=1000, attempt=1, use_json_mode=False,
+                    temperature=None, logprobs=False, n=1, messages=None):
+    """Implementation of timed_llm_call (see there); runs inside the llm_call trace span."""
     start_time = time.time()
     prompt_time = time.time()
+    log = get_logger(f"llm.{role}")
     
-    print(f"[{role.upper()}] Starting call {call_id}...")
+    log.debug(f"[{role.upper()}] Starting call {call_id}...")
     
     # Check if we're using API key mixer for dynamic key rotation on retries
     using_key_mixer = False
@@ -67,20 +367,27 @@ def timed_llm_call(client, api_provider, model, prompt, role, call_id, max_token
                 # SambaNova and Together use max_tokens
                 max_tokens_key = "max_tokens"
 
-            # Debug: print parameter selection
-            print(f"[DEBUG] API Provider: {api_provider}, Using parameter: {max_tokens_key}")
+            log.debug(f"API Provider: {api_provider}, Using parameter: {max_tokens_key}")
 
             api_params = {
                 "model": model,
-                "messages": [{"role": "user", "content": prompt}],
+                "messages": list(messages or []) + [{"role": "user", "content": prompt}],
                 max_tokens_key: max_tokens
             }
             
             # Add JSON mode if requested
             if use_json_mode:
                 api_params["response_format"] = {"type": "json_object"}
+            if temperature is not None:
+                api_params["temperature"] = temperature
+            if logprobs:
+                api_params["logprobs"] = True
+                api_params["top_logprobs"] = 2
+            if n > 1:
+                api_params["n"] = n
             call_start = time.time()
-            response = active_client.chat.completions.create(**api_params)
+            with trace_span("llm_request", "llm", role=role, call_id=call_id, attempt=attempt):
+                response = active_client.chat.completions.create(**api_params)
             call_end = time.time()
             
             # Check if response is valid
@@ -89,18 +396,38 @@ def timed_llm_call(client, api_provider, model, prompt, role, call_id, max_token
             
             response_time = time.time()
             total_time = response_time - start_time
-            response_content = response.choices[0].message.content
+            finish_reason = _finish_reason(response.choices)
+            # Cut off at max_tokens before any content (e.g. reasoning used the
+            # whole budget): with truncation recovery the same request would be
+            # cut off again, so return the empty text instead of retrying it
+            cut_off_empty = _truncation_recovery.enabled and finish_reason == "length" and not any(
+                choice.message.content for choice in response.choices)
+            if cut_off_empty:
+                log.warning(f"[{role.upper()}] Call {call_id} hit max_tokens={max_tokens} before producing "
+                            f"any content; not retrying the same request")
+            if n > 1:
+                # Keep the usable choices; retry only if none came back
+                choices = [choice for choice in response.choices if choice.message.content]
+                if not choices and not cut_off_empty:
+                    raise Exception("API returned empty string content for all choices")
+                response_content = [choice.message.content for choice in choices] or [""]
+            else:
+                response_content = response.choices[0].message.content
+                if cut_off_empty:
+                    response_content = ""
             
             if response_content is None:
                 raise Exception("API returned None content")
             
             # Debug: Verify response content is not empty
-            if response_content == "":
+            if response_content == "" and not cut_off_empty:
                 # Raise exception instead of just warning to trigger retry logic
                 raise Exception("API returned empty string content")
             
-            print(f"[DEBUG] Response content length: {len(response_content)} chars")
-            print(f"[DEBUG] Response preview: {response_content[:200]}...")
+            # Only build the preview when debug output is actually enabled
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(f"Response content length: {len(response_content)} chars")
+                log.debug(f"Response preview: {response_content[:200]}...")
             
             call_info = {
                 "role": role,
@@ -113,12 +440,26 @@ def timed_llm_call(client, api_provider, model, prompt, role, call_id, max_token
                 "total_time": total_time,
                 "call_time": call_end - call_start,
                 "prompt_length": len(prompt),
-                "response_length": len(response_content),
+                "response_length": len(response_content) if n == 1 else sum(map(len, response_content)),
                 "prompt_num_tokens": response.usage.prompt_tokens,
                 "response_num_tokens": response.usage.completion_tokens,
+                "cached_prompt_tokens": _cached_prompt_tokens(response.usage),
+                "max_tokens": max_tokens,
+                "finish_reason": finish_reason,
             }
+            if temperature is not None:
+                call_info["temperature"] = temperature
+            if messages:
+                call_info["history_messages"] = len(messages)
+            if n > 1:
+                call_info["n"] = len(response_content)
+            if logprobs:
+                call_info["answer_logprob_margin"] = (
+                    answer_logprob_margin(response.choices[0]) if n == 1
+                    else [answer_logprob_margin(choice) for choice in choices]
+                )
             
-            print(f"[{role.upper()}] Call {call_id} completed in {total_time:.2f}s")
+            log.debug(f"[{role.upper()}] Call {call_id} completed in {total_time:.2f}s")
             
             if log_dir:
                 log_llm_call(log_dir, call_info)
@@ -138,42 +479,41 @@ def timed_llm_call(client, api_provider, model, prompt, role, call_id, max_token
                     status_code = getattr(e.response, 'status_code', None)
                     if status_code and status_code >= 500:
                         is_server_error = True
-                        print(f"[{role.upper()}] Server error detected: HTTP {status_code}")
+                        log.warning(f"[{role.upper()}] Server error detected: HTTP {status_code}")
                 except:
                     pass
             
             # Also check for 500 errors in the error message itself
             if any(k in str(e).lower() for k in ["500 internal server error", "internal server error", "502 bad gateway", "503 service unavailable"]):
                 is_server_error = True
-                print(f"[{role.upper()}] Server error detected in message: {str(e)[:100]}...")
+                log.warning(f"[{role.upper()}] Server error detected in message: {str(e)[:100]}...")
             
             # Also check for specific OpenAI exceptions
             if hasattr(openai, 'RateLimitError') and isinstance(e, openai.RateLimitError):
                 is_rate_limit = True
+            if is_rate_limit:
+                metrics.LLM_RATE_LIMITED.inc(role=role, provider=api_provider)
             
             # Check for OpenAI InternalServerError
             if hasattr(openai, 'InternalServerError') and isinstance(e, openai.InternalServerError):
                 is_server_error = True
-                print(f"[{role.upper()}] OpenAI InternalServerError detected")
+                log.warning(f"[{role.upper()}] OpenAI InternalServerError detected")
             
             # Debug empty response issues
             if is_empty_response:
-                print(f"\n🚨 DEBUG: Empty response detected for {call_id}")
-                print(f"📝 Exception type: {type(e).__name__}")
-                print(f"📝 Exception message: {str(e)}")
-                print(f"📝 Using JSON mode: {use_json_mode}")
-                print(f"📝 Model: {model}")
-                print(f"📝 Prompt length: {len(prompt)}")
-                print(f"📝 Prompt preview (first 500 chars):")
-                print(f"    {prompt[:500]}...")
-                print(f"📝 Full exception details: {repr(e)}")
-                if hasattr(e, 'response'):
-                    print(f"📝 Raw response object: {e.response}")
-                    if hasattr(e.response, 'text'):
-                        print(f"📝 Raw response text: {e.response.text}")
-                    if hasattr(e.response, 'content'):
-                        print(f"📝 Raw response content: {e.response.content}")
-                print("-" * 60)
+                log.warning(f"🚨 Empty response detected for {call_id} ({type(e).__name__}: {e})")
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug(f"📝 Using JSON mode: {use_json_mode}")
+                    log.debug(f"📝 Model: {model}")
+                    log.debug(f"📝 Prompt length: {len(prompt)}")
+                    log.debug(f"📝 Prompt preview (first 500 chars):\n    {prompt[:500]}...")
+                    log.debug(f"📝 Full exception details: {repr(e)}")
+                    if hasattr(e, 'response'):
+                        log.debug(f"📝 Raw response object: {e.response}")
+                        if hasattr(e.response, 'text'):
+                            log.debug(f"📝 Raw response text: {e.response.text}")
+                        if hasattr(e.response, 'content'):
+                            log.debug(f"📝 Raw response content: {e.response.content}")
                 
                 # Log problematic requests for SambaNova support
                 log_problematic_request(call_id, prompt, model, api_params, e, log_dir, using_key_mixer, 
@@ -188,7 +528,7 @@ def timed_llm_call(client, api_provider, model, prompt, role, call_id, max_token
                 # Check if this is a training or test call to decide behavior
                 if call_id.startswith('train_'):
                     # In training: Mark as incorrect answer (same as testing)
-                    print(f"[{role.upper()}] 🚨 Empty response in training - marking as INCORRECT for {call_id} after {attempt} attempts")
+                    log.error(f"[{role.upper()}] 🚨 Empty response in training - marking as INCORRECT for {call_id} after {attempt} attempts")
                     error_time = time.time()
                     call_info = {
                         "role": role,
@@ -212,7 +552,7 @@ def timed_llm_call(client, api_provider, model, prompt, role, call_id, max_token
                 
                 elif call_id.startswith('test_'):
                     # In testing: Treat as incorrect answer
-                    print(f"[{role.upper()}] 🚨 Empty response in testing - marking as INCORRECT for {call_id} after {attempt} attempts")
+                    log.error(f"[{role.upper()}] 🚨 Empty response in testing - marking as INCORRECT for {call_id} after {attempt} attempts")
                     error_time = time.time()
                     call_info = {
                         "role": role,
@@ -249,11 +589,14 @@ def timed_llm_call(client, api_provider, model, prompt, role, call_id, max_token
                 else:
                     error_type = "timed out"
                     base_sleep = sleep_seconds
+                metrics.LLM_RETRIES.inc(role=role, provider=api_provider, reason=error_type)
                 jitter = random.uniform(0.5, 1.5)  # Add jitter to avoid thundering herd
                 sleep_time = base_sleep * jitter
-                print(f"[{role.upper()}] Call {call_id} {error_type}, sleeping {sleep_time:.1f}s then retrying "
+                log.warning(f"[{role.upper()}] Call {call_id} {error_type}, sleeping {sleep_time:.1f}s then retrying "
                       f"({attempt}/{retries_on_timeout})...")
-                time.sleep(sleep_time)
+                with trace_span("retry_sleep", "llm", role=role, call_id=call_id,
+                                reason=error_type, seconds=round(sleep_time, 3)):
+                    time.sleep(sleep_time)
                 continue
             
             error_time = time.time()
@@ -268,9 +611,54 @@ def timed_llm_call(client, api_provider, model, prompt, role, call_id, max_token
                 "attempt": attempt,
             }
             
-            print(f"[{role.upper()}] Call {call_id} failed after {error_time - start_time:.2f}s: {e}")
+            log.error(f"[{role.upper()}] Call {call_id} failed after {error_time - start_time:.2f}s: {e}")
             
             if log_dir:
                 log_llm_call(log_dir, call_info)
             
             raise e
+
+
+def answer_logprob_margin(choice, marker="final_answer"):
+    """
+    Smallest top-1 minus top-2 logprob gap over the answer tokens of a choice.
+    
+    Answer tokens are the ones after the last occurrence of `marker` in the
+    generated text (all tokens if it does not occur). A small margin means the
+    model was close to emitting a different answer.
+    
+    Args:
+        choice: Chat completion choice returned with logprobs and top_logprobs >= 2
+        marker: Text after which the answer starts
+    
+    Returns:
+        float margin, or None if the choice carries no usable logprobs
+    """
+    content = getattr(getattr(choice, "logprobs", None), "content", None)
+    if not content:
+        return None
+    offsets, position = [], 0
+    for token in content:
+        offsets.append(position)
+        position += len(token.token)
+    start = "".join(token.token for token in content).rfind(marker)
+    answer_start = start + len(marker) if start >= 0 else 0
+    margins = [
+        token.top_logprobs[0].logprob - token.top_logprobs[1].logprob
+        for token, offset in zip(content, offsets)
+        if offset >= answer_start and len(token.top_logprobs or []) >= 2
+    ]
+    return min(margins) if margins else None
+
+
+def _finish_reason(choices):
+    """finish_reason of the response; 'length' if any choice was truncated"""
+    reasons = [getattr(choice, "finish_reason", None) for choice in choices]
+    return "length" if "length" in reasons else reasons[0]
+
+
+def _cached_prompt_tokens(usage):
+    """Prompt tokens served from the provider's prompt cache (0 if not reported)"""
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None) if details is not None else None
+    return cached or 0
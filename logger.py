@@ -8,8 +8,123 @@ This file contains functions for logging various events and information during t
 """
 import os
 import json
+import atexit
+import threading
 from datetime import datetime
-from playbook_utils import parse_playbook_line
+from playbook_utils import build_bullet_index
+from logging_utils import get_logger
+from tracing import trace_span
+
+log = get_logger("logger")
+
+
+class BufferedJsonlSink:
+    """Thread-safe append-only JSONL writer that batches lines in memory.
+    
+    Entries are serialized on write() and appended to disk in one go every
+    `flush_every` entries, on flush(), and at interpreter exit.
+    """
+    
+    def __init__(self, path, flush_every=50):
+        self.path = path
+        self.flush_every = flush_every
+        self._buffer = []
+        self._lock = threading.Lock()
+    
+    def write(self, entry):
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= self.flush_every:
+                self._flush_locked()
+    
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+    
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        with trace_span("log.flush", "io", path=os.path.basename(self.path), lines=len(self._buffer)):
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.writelines(self._buffer)
+        self._buffer = []
+
+
+_jsonl_sinks = {}
+_jsonl_sinks_lock = threading.Lock()
+
+def get_jsonl_sink(path, flush_every=50):
+    """Return the shared buffered sink for a JSONL log path"""
+    key = os.path.abspath(str(path))
+    with _jsonl_sinks_lock:
+        sink = _jsonl_sinks.get(key)
+        if sink is None:
+            sink = BufferedJsonlSink(key, flush_every=flush_every)
+            _jsonl_sinks[key] = sink
+        return sink
+
+def flush_log_sinks():
+    """Flush every buffered JSONL sink to disk"""
+    with _jsonl_sinks_lock:
+        sinks = list(_jsonl_sinks.values())
+    for sink in sinks:
+        try:
+            sink.flush()
+        except Exception as e:
+            log.warning(f"Failed to flush log sink {sink.path}: {e}")
+
+atexit.register(flush_log_sinks)
+
+
+class BulletUsageTable:
+    """Per-bullet usage statistics kept in memory during a run.
+    
+    Tracks how often each bullet was cited by the generator, the last step it
+    was cited at, and how often it co-occurred with a correct or incorrect
+    initial answer, so these can be queried without rescanning the usage JSONL.
+    """
+    
+    def __init__(self):
+        self._table = {}
+        self._lock = threading.Lock()
+    
+    def record(self, bullet_ids, epoch, step, is_correct=None):
+        """Record one generator call that cited `bullet_ids`"""
+        with self._lock:
+            for bullet_id in dict.fromkeys(bullet_ids or []):
+                entry = self._table.setdefault(bullet_id, {
+                    "count": 0, "last_epoch": None, "last_step": None,
+                    "correct": 0, "incorrect": 0
+                })
+                entry["count"] += 1
+                entry["last_epoch"] = epoch
+                entry["last_step"] = step
+                if is_correct is True:
+                    entry["correct"] += 1
+                elif is_correct is False:
+                    entry["incorrect"] += 1
+    
+    def get(self, bullet_id):
+        """Return a copy of the usage entry for a bullet, or None if never cited"""
+        with self._lock:
+            entry = self._table.get(bullet_id)
+            return dict(entry) if entry else None
+    
+    def to_dict(self):
+        with self._lock:
+            return {bid: dict(entry) for bid, entry in self._table.items()}
+    
+    def load_dict(self, data):
+        with self._lock:
+            self._table = {bid: dict(entry) for bid, entry in (data or {}).items()}
+    
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
 
 
 def log_llm_call(log_dir, call_info):
@@ -27,18 +142,23 @@ def log_llm_call(log_dir, call_info):
     # Debug: Validate response field
     response_text = call_info.get('response', '')
     if response_text == '':
-        print(f"[LOGGER WARNING] Saving empty response for {call_info['call_id']}")
+        log.warning(f"Saving empty response for {call_info['call_id']}")
     else:
-        print(f"[LOGGER DEBUG] Saving response ({len(response_text)} chars) for {call_info['call_id']}")
+        log.debug(f"Saving response ({len(response_text)} chars) for {call_info['call_id']}")
     
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(call_info, f, indent=2, ensure_ascii=False)
+    with trace_span("log.llm_call", "io", call_id=call_info['call_id']):
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(call_info, f, indent=2, ensure_ascii=False)
     
-    print(f"[LOG] {call_info['role']} call logged to {filename}")
+    log.debug(f"{call_info['role']} call logged to {filename}")
 
-def log_bullet_usage(usage_log_path, epoch, step, sample_data, bullet_ids_used, playbook=None, reflection_content=None, is_correct=None):
+def log_bullet_usage(usage_log_path, epoch, step, sample_data, bullet_ids_used, playbook=None, reflection_content=None, is_correct=None, usage_table=None):
     """Log which bullets were used in each training sample for future curator reference
     
+    Bullet contents are resolved through the cached bullet index of `playbook`, and
+    the entry is written through the buffered JSONL sink for `usage_log_path`.
+    If `usage_table` (a BulletUsageTable) is given, the usage is also recorded there.
+    
     TODO: Future curator enhancement - when updating a bullet, the curator can:
     1. Look up all training samples that used this bullet (via this log)
     2. Review the reflection content for those samples 
@@ -46,30 +166,22 @@ def log_bullet_usage(usage_log_path, epoch, step, sample_data, bullet_ids_used,
     4. Write a better version based on all the usage history and feedback
     """
     # Extract bullet contents from the playbook
-    bullets_with_content = []
     if playbook and bullet_ids_used:
-        playbook_lines = playbook.split('\n')
+        bullet_index = build_bullet_index(playbook)
+        bullets_with_content = []
         for bullet_id in bullet_ids_used:
-            # Find the line containing this bullet ID
-            bullet_content = None
-            for line in playbook_lines:
-                if f'[{bullet_id}]' in line:
-                    # Extract content after the bullet ID pattern
-                    # Format: [bullet_id] helpful=X harmful=Y :: content
-                    if '::' in line:
-                        bullet_content = line.split('::', 1)[1].strip()
-                    else:
-                        bullet_content = line.strip()
-                    break
-            
+            parsed = bullet_index.get(bullet_id)
             bullets_with_content.append({
                 "bullet_id": bullet_id,
-                "content": bullet_content if bullet_content else "Content not found"
+                "content": parsed['content'] if parsed else "Content not found"
             })
     else:
         # If no playbook provided or no bullets used, just log the IDs
         bullets_with_content = [{"bullet_id": bid, "content": None} for bid in bullet_ids_used]
     
+    if usage_table is not None:
+        usage_table.record(bullet_ids_used, epoch, step, is_correct)
+    
     log_entry = {
         "timestamp": datetime.now().isoformat(),
         "epoch": epoch,
@@ -84,11 +196,14 @@ def log_bullet_usage(usage_log_path, epoch, step, sample_data, bullet_ids_used,
         "bullet_count": len(bullet_ids_used),
     }
     
-    with open(usage_log_path, 'a', encoding='utf-8') as f:
-        f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+    get_jsonl_sink(usage_log_path).write(log_entry)
 
-def log_curator_operation_diff(log_dir, operation, playbook_text, call_id):
-    """Log detailed diff for curator operations, especially MERGE operations"""
+def log_curator_operation_diff(log_dir, operation, playbook_text, call_id, bullet_index=None):
+    """Log detailed diff for curator operations, especially MERGE operations
+    
+    Pass `bullet_index` (from build_bullet_index) when logging several operations
+    against the same playbook to avoid re-parsing it.
+    """
     if not log_dir:
         return
     
@@ -100,7 +215,7 @@ def log_curator_operation_diff(log_dir, operation, playbook_text, call_id):
             op_type = operation.get('type', 'UNKNOWN')
             reason = operation.get('reason', '')
         else:
-            print(f"Warning: Invalid operation format for logging: {type(operation)}")
+            log.warning(f"Invalid operation format for logging: {type(operation)}")
             return
         
         operation_diff = {
@@ -109,7 +224,7 @@ def log_curator_operation_diff(log_dir, operation, playbook_text, call_id):
             "reason": reason,
         }
     except Exception as e:
-        print(f"Warning: Error setting up curator operation diff logging: {e}")
+        log.warning(f"Error setting up curator operation diff logging: {e}")
         return
     
     if op_type == 'MERGE':
@@ -117,18 +232,17 @@ def log_curator_operation_diff(log_dir, operation, playbook_text, call_id):
         source_bullets = []
         source_ids = operation.get('source_ids', [])
         
-        lines = playbook_text.strip().split('\n')
+        if bullet_index is None:
+            bullet_index = build_bullet_index(playbook_text)
         for source_id in source_ids:
-            for line in lines:
-                parsed = parse_playbook_line(line)
-                if parsed and parsed['id'] == source_id:
-                    source_bullets.append({
-                        "bullet_id": source_id,
-                        "content": parsed['content'],
-                        "helpful": parsed['helpful'],
-                        "harmful": parsed['harmful']
-                    })
-                    break
+            parsed = bullet_index.get(source_id)
+            if parsed:
+                source_bullets.append({
+                    "bullet_id": source_id,
+                    "content": parsed['content'],
+                    "helpful": parsed['helpful'],
+                    "harmful": parsed['harmful']
+                })
         
         merged_content = operation.get('content', '')
         operation_diff.update({
@@ -147,13 +261,10 @@ def log_curator_operation_diff(log_dir, operation, playbook_text, call_id):
         new_content = operation.get('content', '')
         
         # Find old content
-        old_content = None
-        lines = playbook_text.strip().split('\n')
-        for line in lines:
-            parsed = parse_playbook_line(line)
-            if parsed and parsed['id'] == bullet_id:
-                old_content = parsed['content']
-                break
+        if bullet_index is None:
+            bullet_index = build_bullet_index(playbook_text)
+        parsed = bullet_index.get(bullet_id)
+        old_content = parsed['content'] if parsed else None
         
         operation_diff.update({
             "bullet_id": bullet_id,
@@ -187,10 +298,9 @@ def log_curator_operation_diff(log_dir, operation, playbook_text, call_id):
     operation_diff["call_id"] = call_id
     # Write to diff log
     try:
-        with open(curator_diff_log_path, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(operation_diff, ensure_ascii=False) + '\n')
+        get_jsonl_sink(curator_diff_log_path).write(operation_diff)
     except Exception as e:
-        print(f"Warning: Failed to write curator operation diff log: {e}")
+        log.warning(f"Failed to write curator operation diff log: {e}")
 
 
 def log_problematic_request(call_id, prompt, model, api_params, exception, log_dir, using_key_mixer, key_mixer):
@@ -263,7 +373,7 @@ def log_problematic_request(call_id, prompt, model, api_params, exception, log_d
     with open(filepath, 'w') as f:
         json.dump(problem_info, f, indent=2, ensure_ascii=False)
     
-    print(f"[PROBLEM LOG] Saved problematic request to: problematic_requests/{filename}")
+    log.warning(f"[PROBLEM LOG] Saved problematic request to: problematic_requests/{filename}")
     
     # Also create a summary log
     summary_file = os.path.join(problem_log_dir, "summary.jsonl")
@@ -313,9 +423,9 @@ Full Raw Curator Response:
     try:
         with open(curator_failure_log_path, 'a', encoding='utf-8') as f:
             f.write(log_entry)
-        print(f"📝 Curator failure logged to: {curator_failure_log_path}")
+        log.warning(f"📝 Curator failure logged to: {curator_failure_log_path}")
     except Exception as e:
-        print(f"⚠️  Failed to write curator failure log: {e}")
+        log.error(f"⚠️  Failed to write curator failure log: {e}")
 
 def log_playbook_diff(log_dir, step, playbook_before, playbook_after, operations):
     """Log the step-by-step evolution of the Playbook
@@ -337,8 +447,10 @@ def log_playbook_diff(log_dir, step, playbook_before, playbook_after, operations
     lines_after = playbook_after.split('\n')
     
     # Simple diff: count added/removed lines
-    added_lines = [line for line in lines_after if line not in lines_before]
-    removed_lines = [line for line in lines_before if line not in lines_after]
+    before_set = set(lines_before)
+    after_set = set(lines_after)
+    added_lines = [line for line in lines_after if line not in before_set]
+    removed_lines = [line for line in lines_before if line not in after_set]
     
     diff_entry = {
         "timestamp": datetime.now().isoformat(),
@@ -356,8 +468,7 @@ def log_playbook_diff(log_dir, step, playbook_before, playbook_after, operations
     }
     
     try:
-        with open(diff_log_path, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(diff_entry, ensure_ascii=False) + '\n')
-        print(f"[PLAYBOOK DIFF] Logged step {step}: +{len(added_lines)} -{len(removed_lines)} lines")
+        get_jsonl_sink(diff_log_path).write(diff_entry)
+        log.info(f"[PLAYBOOK DIFF] Logged step {step}: +{len(added_lines)} -{len(removed_lines)} lines")
     except Exception as e:
-        print(f"[WARNING] Failed to log playbook diff: {e}")
+        log.warning(f"Failed to log playbook diff: {e}")
@@ -0,0 +1,120 @@
+"""
+==============================================================================
+logging_utils.py
+==============================================================================
+
+This file contains the leveled console logging setup for the project.
+
+All loggers live under the "ace" hierarchy, one per module and role, e.g.
+"ace.llm.generator", "ace.agents.curator", "ace.eval", "ace.orchestrator".
+Per-call chatter (request start/finish, response previews) is emitted at DEBUG
+so it costs nothing unless enabled; INFO carries per-step progress, WARNING and
+above carry retries and failures.
+
+"""
+import sys
+import time
+import logging
+import threading
+
+ROOT_LOGGER_NAME = "ace"
+DEFAULT_FORMAT = "%(message)s"
+DEBUG_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+
+_root_logger = logging.getLogger(ROOT_LOGGER_NAME)
+_default_handler = None
+
+
+def _ensure_default_handler():
+    """Attach a stdout handler to the "ace" root logger once"""
+    global _default_handler
+    if _default_handler is None:
+        _default_handler = logging.StreamHandler(sys.stdout)
+        _default_handler.setFormatter(logging.Formatter(DEFAULT_FORMAT))
+        _root_logger.addHandler(_default_handler)
+        _root_logger.setLevel(logging.INFO)
+        # Keep ACE output independent of the host application's root logger
+        _root_logger.propagate = False
+
+
+def get_logger(name):
+    """
+    Return a logger in the "ace" hierarchy.
+
+    Args:
+        name: Dotted name below "ace" (e.g. "llm.generator")
+
+    Returns:
+        logging.Logger
+    """
+    _ensure_default_handler()
+    if name == ROOT_LOGGER_NAME or name.startswith(ROOT_LOGGER_NAME + "."):
+        return logging.getLogger(name)
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}")
+
+
+def configure_logging(level="INFO", quiet=False, log_file=None):
+    """
+    Configure the "ace" logger hierarchy.
+
+    Args:
+        level: Log level name or number for the whole hierarchy (e.g. "DEBUG", "INFO")
+        quiet: Production mode - only warnings and errors reach the console
+        log_file: Optional file that additionally receives every record at `level`
+    """
+    _ensure_default_handler()
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            level = logging.INFO
+
+    _root_logger.setLevel(level)
+    _default_handler.setLevel(logging.WARNING if quiet else level)
+    _default_handler.setFormatter(logging.Formatter(
+        DEBUG_FORMAT if level <= logging.DEBUG else DEFAULT_FORMAT
+    ))
+
+    if log_file:
+        for handler in _root_logger.handlers:
+            if isinstance(handler, logging.FileHandler) and handler.baseFilename == log_file:
+                break
+        else:
+            file_handler = logging.FileHandler(log_file, encoding="utf-8")
+            file_handler.setFormatter(logging.Formatter(DEBUG_FORMAT))
+            file_handler.setLevel(level)
+            _root_logger.addHandler(file_handler)
+
+
+class RateLimitedProgress:
+    """
+    Thread-safe progress reporter that logs at most once per `min_interval` seconds.
+
+    The final update (done == total) is always reported.
+    """
+
+    def __init__(self, logger, total, label="Progress", min_interval=10.0, level=logging.INFO):
+        self.logger = logger
+        self.total = total
+        self.label = label
+        self.min_interval = min_interval
+        self.level = level
+        self._last_report = 0.0
+        self._lock = threading.Lock()
+
+    def update(self, done, message_fn=None):
+        """
+        Report progress if enough time has passed since the last report.
+
+        Args:
+            done: Number of completed items
+            message_fn: Optional callable returning extra text; only called when a report is emitted
+        """
+        if not self.logger.isEnabledFor(self.level):
+            return
+        now = time.monotonic()
+        with self._lock:
+            if done < self.total and now - self._last_report < self.min_interval:
+                return
+            self._last_report = now
+        extra = f", {message_fn()}" if message_fn else ""
+        self.logger.log(self.level, f"{self.label}: {done}/{self.total}{extra}")
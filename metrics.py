@@ -0,0 +1,324 @@
+"""
+==============================================================================
+metrics.py
+==============================================================================
+
+This file contains live run metrics exposed in the Prometheus text format.
+
+Metrics are kept in a process-wide registry and are always collected (updates
+are a dict lookup under a lock). `start_metrics_server(port)` serves them on
+http://<host>:<port>/metrics from a daemon thread so long offline/online runs
+can be scraped and alerted on.
+
+"""
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# USD per 1M tokens, used for the estimated spend counter. Matched by substring
+# of the model name; override or extend with set_pricing().
+DEFAULT_PRICING = {
+    "gpt-5-mini": {"input": 0.25, "output": 2.00},
+    "gpt-4o-mini": {"input": 0.15, "output": 0.60},
+}
+
+DEFAULT_LATENCY_BUCKETS = (0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+DEFAULT_TOKEN_BUCKETS = (64, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames, labelvalues, extra=None):
+    pairs = list(zip(labelnames, labelvalues))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class for labelled metrics"""
+
+    metric_type = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key, value):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing value"""
+
+    metric_type = "counter"
+
+    def inc(self, amount=1, **labels):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def sum(self, **labels):
+        """Sum over all series matching the given subset of labels"""
+        positions = [(self.labelnames.index(k), str(v)) for k, v in labels.items()]
+        with self._lock:
+            return sum(value for key, value in self._values.items()
+                       if all(key[i] == v for i, v in positions))
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    metric_type = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def get(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram with sum and count"""
+
+    metric_type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+            state["counts"][bisect.bisect_left(self.buckets, value)] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+    def _render_sample(self, key, state):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), state["counts"]):
+            cumulative += count
+            labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(state['sum'])}")
+        lines.append(f"{self.name}_count{labels} {state['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds metrics and renders them in the Prometheus text exposition format"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collect_callback(self, callback):
+        """Register a callable run before every render (e.g. to refresh derived gauges)"""
+        with self._lock:
+            if callback not in self._callbacks:
+                self._callbacks.append(callback)
+
+    def render(self):
+        with self._lock:
+            callbacks = list(self._callbacks)
+            metrics = list(self._metrics.values())
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+LLM_CALLS = REGISTRY.counter(
+    "ace_llm_calls_total", "LLM calls by outcome", ["role", "provider", "model", "status"])
+LLM_TOKENS = REGISTRY.counter(
+    "ace_llm_tokens_total", "LLM tokens by kind (prompt, completion, cached_prompt)",
+    ["role", "provider", "model", "kind"])
+LLM_LATENCY = REGISTRY.histogram(
+    "ace_llm_call_latency_seconds", "End-to-end LLM call latency including retries",
+    ["role", "provider"])
+LLM_RESPONSE_TOKENS = REGISTRY.histogram(
+    "ace_llm_response_tokens", "Completion tokens per LLM call", ["role", "provider"],
+    buckets=DEFAULT_TOKEN_BUCKETS)
+LLM_RETRIES = REGISTRY.counter(
+    "ace_llm_retries_total", "LLM call retries by reason", ["role", "provider", "reason"])
+LLM_RATE_LIMITED = REGISTRY.counter(
+    "ace_llm_rate_limited_total", "LLM requests rejected with a rate limit (429)", ["role", "provider"])
+LLM_IN_FLIGHT = REGISTRY.gauge(
+    "ace_llm_in_flight_requests", "LLM calls currently in progress", ["role", "provider"])
+SPEND = REGISTRY.counter(
+    "ace_estimated_spend_usd_total", "Estimated spend in USD from token usage and pricing",
+    ["role", "model"])
+PLAYBOOK_BULLETS = REGISTRY.gauge("ace_playbook_bullets", "Bullets in the current playbook")
+PLAYBOOK_TOKENS = REGISTRY.gauge("ace_playbook_tokens", "Tokens in the current playbook")
+CACHE_HIT_RATIO = REGISTRY.gauge("ace_cache_hit_ratio", "Hit ratio per cache", ["cache"])
+ACCURACY = REGISTRY.gauge(
+    "ace_accuracy", "Latest accuracy by scope (rolling_train, validation, online_window, ...)", ["scope"])
+TRAIN_STEPS = REGISTRY.counter("ace_train_steps_total", "Training samples processed", ["mode"])
+
+_pricing = dict(DEFAULT_PRICING)
+_pricing_lock = threading.Lock()
+
+
+def set_pricing(pricing):
+    """Merge a {model_substring: {"input": usd_per_1m, "output": usd_per_1m}} table into the pricing"""
+    with _pricing_lock:
+        _pricing.update(pricing or {})
+
+
+def estimate_cost(model, prompt_tokens, completion_tokens):
+    """Estimate USD cost of a call; 0.0 if the model has no pricing entry"""
+    with _pricing_lock:
+        candidates = [key for key in _pricing if key in (model or "").lower()]
+        if not candidates:
+            return 0.0
+        price = _pricing[max(candidates, key=len)]
+    return prompt_tokens / 1_000_000 * price["input"] + completion_tokens / 1_000_000 * price["output"]
+
+
+def record_llm_call(role, provider, model, call_info, latency, status="ok"):
+    """Record counters, tokens, latency and spend for one finished LLM call"""
+    LLM_CALLS.inc(role=role, provider=provider, model=model, status=status)
+    LLM_LATENCY.observe(latency, role=role, provider=provider)
+    prompt_tokens = call_info.get("prompt_num_tokens") or 0
+    completion_tokens = call_info.get("response_num_tokens") or 0
+    cached_tokens = call_info.get("cached_prompt_tokens") or 0
+    if prompt_tokens or completion_tokens:
+        LLM_TOKENS.inc(prompt_tokens, role=role, provider=provider, model=model, kind="prompt")
+        LLM_TOKENS.inc(completion_tokens, role=role, provider=provider, model=model, kind="completion")
+        LLM_RESPONSE_TOKENS.observe(completion_tokens, role=role, provider=provider)
+        cost = estimate_cost(model, prompt_tokens, completion_tokens)
+        if cost:
+            SPEND.inc(cost, role=role, model=model)
+    if cached_tokens:
+        LLM_TOKENS.inc(cached_tokens, role=role, provider=provider, model=model, kind="cached_prompt")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes are frequent; keep them out of the console
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port, host="127.0.0.1"):
+    """
+    Start the /metrics HTTP server in a daemon thread (idempotent).
+
+    Args:
+        port: TCP port to listen on (0 picks a free port)
+        host: Interface to bind, localhost by default
+
+    Returns:
+        The running ThreadingHTTPServer
+    """
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return _server
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, name="ace-metrics", daemon=True)
+        thread.start()
+        _server = server
+        return server
+
+
+def stop_metrics_server():
+    """Stop the metrics server if it is running"""
+    global _server
+    with _server_lock:
+        if _server is not None:
+            _server.shutdown()
+            _server.server_close()
+            _server = None
@@ -6,9 +6,16 @@ playbook.py
 This file contains functions for parsing and manipulating the playbook.
 
 """
+import copy
 import json
 import re
-from utils import get_section_slug
+import logging
+from functools import lru_cache
+from utils import get_section_slug, count_tokens
+from logging_utils import get_logger
+from response_parsing import decode_json
+
+log = get_logger("playbook")
 
 def parse_playbook_line(line):
     """Parse a single playbook line to extract components"""
@@ -26,6 +33,30 @@ def parse_playbook_line(line):
         }
     return None
 
+@lru_cache(maxsize=16)
+def build_bullet_index(playbook_text):
+    """
+    Build a bullet_id -> parsed bullet lookup for a playbook.
+    
+    The index is cached per playbook text, so repeated lookups against the same
+    playbook version (usage logging, curator diffs) parse it only once.
+    Callers must treat the returned dict as read-only.
+    
+    Args:
+        playbook_text (str): The full playbook text
+    
+    Returns:
+        dict: Mapping of bullet id to the dict returned by parse_playbook_line
+    """
+    index = {}
+    if not playbook_text:
+        return index
+    for line in playbook_text.split('\n'):
+        parsed = parse_playbook_line(line)
+        if parsed and parsed['id'] not in index:
+            index[parsed['id']] = parsed
+    return index
+
 def get_next_global_id(playbook_text):
     """Extract highest global ID and return next one"""
     max_id = 0
@@ -64,7 +95,7 @@ def update_bullet_counts(playbook_text, bullet_tags):
                     tag_map[bullet_id] = tag_value
     
     if not tag_map:
-        print("Warning: No valid bullet tags found to update counts")
+        log.warning("No valid bullet tags found to update counts")
         return playbook_text
     
     for line in lines:
@@ -93,6 +124,159 @@ def update_bullet_counts(playbook_text, bullet_tags):
     return '\n'.join(updated_lines)
 
 
+@lru_cache(maxsize=16)
+def render_playbook_for_prompt(playbook_text, counters="omit"):
+    """
+    Compact generator view of a playbook with short per-version bullet aliases.
+    
+    Bullets are renumbered [b1], [b2], ... in playbook order and their
+    helpful/harmful counters are dropped ('omit') or reduced to a marker for
+    proven and risky bullets ('bucket'). Section headers and other lines are
+    kept as-is. The result is cached per playbook text; callers must treat it
+    as read-only.
+    
+    Args:
+        playbook_text (str): The full playbook text
+        counters (str): 'omit' or 'bucket'
+    
+    Returns:
+        dict: text (the rendered playbook), aliases (alias -> canonical bullet
+        id), raw_tokens and rendered_tokens
+    """
+    lines = []
+    aliases = {}
+    for line in playbook_text.split('\n'):
+        parsed = parse_playbook_line(line)
+        if not parsed:
+            lines.append(line)
+            continue
+        alias = f"b{len(aliases) + 1}"
+        aliases[alias] = parsed['id']
+        marker = ""
+        if counters == "bucket":
+            if parsed['helpful'] > 5 and parsed['harmful'] < 2:
+                marker = " (proven)"
+            elif parsed['harmful'] >= parsed['helpful'] and parsed['harmful'] > 0:
+                marker = " (risky)"
+        lines.append(f"[{alias}]{marker} {parsed['content']}")
+    text = '\n'.join(lines)
+    return {
+        "text": text,
+        "aliases": aliases,
+        "raw_tokens": count_tokens(playbook_text),
+        "rendered_tokens": count_tokens(text),
+    }
+
+
+def bullets_consistently_helpful(playbook_text, bullet_ids, min_helpful):
+    """
+    Whether every cited bullet has been tagged helpful at least `min_helpful`
+    times and never harmful.
+    
+    Args:
+        playbook_text (str): The full playbook text
+        bullet_ids (list): Bullet IDs cited by the generator
+        min_helpful (int): Minimum helpful count per bullet
+    
+    Returns:
+        bool: False if no bullets were cited or any of them is unknown
+    """
+    if not bullet_ids:
+        return False
+    index = build_bullet_index(playbook_text)
+    for bullet_id in bullet_ids:
+        bullet = index.get(bullet_id)
+        if bullet is None or bullet['harmful'] > 0 or bullet['helpful'] < min_helpful:
+            return False
+    return True
+
+
+def merge_bullet_tags(tag_lists):
+    """
+    Sum bullet tags from several reflections into per-bullet count deltas.
+    
+    Each reflection counts at most once per bullet (as in update_bullet_counts);
+    the result does not depend on the order of the reflections.
+    
+    Args:
+        tag_lists: Iterable of bullet_tags lists as returned by the reflector
+        
+    Returns:
+        Dict mapping bullet ID to {"helpful": n, "harmful": m}
+    """
+    deltas = {}
+    for bullet_tags in tag_lists:
+        tag_map = {}
+        for tag in bullet_tags or []:
+            if isinstance(tag, dict):
+                bullet_id = tag.get('id') or tag.get('bullet', '')
+                if bullet_id:
+                    tag_map[bullet_id] = tag.get('tag', 'neutral')
+        for bullet_id, tag in tag_map.items():
+            if tag in ('helpful', 'harmful'):
+                delta = deltas.setdefault(bullet_id, {"helpful": 0, "harmful": 0})
+                delta[tag] += 1
+    return deltas
+
+
+def apply_bullet_count_deltas(playbook_text, deltas):
+    """Add helpful/harmful count deltas (from merge_bullet_tags) to the playbook"""
+    if not deltas:
+        return playbook_text
+    
+    updated_lines = []
+    for line in playbook_text.strip().split('\n'):
+        parsed = parse_playbook_line(line)
+        delta = deltas.get(parsed['id']) if parsed else None
+        if delta:
+            line = format_playbook_line(
+                parsed['id'],
+                parsed['helpful'] + delta['helpful'],
+                parsed['harmful'] + delta['harmful'],
+                parsed['content']
+            )
+        updated_lines.append(line)
+    return '\n'.join(updated_lines)
+
+
+def _normalize_section_name(section):
+    """Normalize a section name the same way apply_curator_operations does"""
+    return section.lower().replace(' ', '_').replace('&', 'and')
+
+
+def merge_curator_operations(operation_lists):
+    """
+    Merge curator operations proposed independently against the same playbook version.
+    
+    Lists are merged in the given order (e.g. sample order within a mini-batch),
+    so the result does not depend on which curator call finished first. ADD
+    operations with the same section and content (case and whitespace
+    insensitive) are collapsed into the first one; other operations are
+    de-duplicated by their full content.
+    
+    Args:
+        operation_lists: Iterable of operation lists
+        
+    Returns:
+        Merged list of operations
+    """
+    merged = []
+    seen = set()
+    for operations in operation_lists:
+        for op in operations or []:
+            if op.get('type') == 'ADD':
+                key = ('ADD',
+                       _normalize_section_name(op.get('section', 'general')),
+                       ' '.join(str(op.get('content', '')).lower().split()))
+            else:
+                key = json.dumps(op, sort_keys=True)
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(op)
+    return merged
+
+
 def apply_curator_operations(playbook_text, operations, next_id):
     """
     Apply curator operations to playbook
@@ -147,7 +331,7 @@ def apply_curator_operations(playbook_text, operations, next_id):
             
             # Check if section exists, if not use 'others'
             if section not in sections and section != 'general':
-                print(f"Warning: Section '{section_raw}' not found, adding to OTHERS")
+                log.warning(f"Section '{section_raw}' not found, adding to OTHERS")
                 section = 'others'
             
             slug = get_section_slug(section)
@@ -158,7 +342,7 @@ def apply_curator_operations(playbook_text, operations, next_id):
             
             new_line = format_playbook_line(new_id, 0, 0, content)
             bullets_to_add.append((section, new_line))
-            print(f"  Added bullet {new_id} to section {section}")
+            log.info(f"  Added bullet {new_id} to section {section}")
             
 
     
@@ -196,7 +380,7 @@ def apply_curator_operations(playbook_text, operations, next_id):
     
     # If there are still bullets to add (for sections that don't exist), add them to OTHERS
     if bullets_to_add:
-        print(f"Warning: {len(bullets_to_add)} bullets have no matching section, adding to OTHERS")
+        log.warning(f"{len(bullets_to_add)} bullets have no matching section, adding to OTHERS")
         others_bullets = [b for s, b in bullets_to_add]
         # Find OTHERS section
         others_idx = -1
@@ -254,83 +438,18 @@ def get_playbook_stats(playbook_text):
     return stats
 
 def extract_json_from_text(text, json_key=None):
-    """Extract JSON object from text, handling various formats"""
-    try:
-        # First, try to parse the entire response as JSON (JSON mode)
-        try:
-            result = json.loads(text.strip())
-            return result
-        except json.JSONDecodeError:
-            pass
-        
-        # Fallback: Look for ```json blocks
-        json_pattern = r'```json\s*(.*?)\s*```'
-        matches = re.findall(json_pattern, text, re.DOTALL | re.IGNORECASE)
-        
-        if matches:
-            # Try each match until we find valid JSON
-            for match in matches:
-                try:
-                    json_str = match.strip()
-                    result = json.loads(json_str)
-                    return result
-                except json.JSONDecodeError:
-                    continue
-        
-        # Improved JSON extraction using balanced brace counting
-        # This handles deeply nested structures better
-        def find_json_objects(text):
-            """Find JSON objects using balanced brace counting"""
-            json_objects = []
-            i = 0
-            while i < len(text):
-                if text[i] == '{':
-                    # Found start of potential JSON object
-                    brace_count = 1
-                    start = i
-                    i += 1
-                    
-                    while i < len(text) and brace_count > 0:
-                        if text[i] == '{':
-                            brace_count += 1
-                        elif text[i] == '}':
-                            brace_count -= 1
-                        elif text[i] == '"':
-                            # Handle quoted strings to avoid counting braces inside strings
-                            i += 1
-                            while i < len(text) and text[i] != '"':
-                                if text[i] == '\\':
-                                    i += 1  # Skip escaped character
-                                i += 1
-                        i += 1
-                    
-                    if brace_count == 0:
-                        # Found complete JSON object
-                        json_candidate = text[start:i]
-                        json_objects.append(json_candidate)
-                else:
-                    i += 1
-            
-            return json_objects
-        
-        # Find all potential JSON objects
-        json_objects = find_json_objects(text)
-        
-        for json_str in json_objects:
-            try:
-                result = json.loads(json_str)
-                return result
-            except json.JSONDecodeError:
-                continue
-                
-    except Exception as e:
-        print(f"Failed to extract JSON: {e}")
+    """Extract JSON object from text, handling various formats (see response_parsing.decode_json)"""
+    if not isinstance(text, str):
+        log.warning(f"Failed to extract JSON: expected a string, got {type(text).__name__}")
+        return None
+    result, source = decode_json(text)
+    if result is None and log.isEnabledFor(logging.DEBUG):
         if len(text) > 500:
-            print(f"Raw content preview:\n{text[:500]}...")
+            log.debug(f"Raw content preview:\n{text[:500]}...")
         else:
-            print(f"Raw content:\n{text}")
-        
-    return None
+            log.debug(f"Raw content:\n{text}")
+    # Decoded values are cached and shared; hand out a private copy
+    return copy.deepcopy(result)
 
 def extract_playbook_bullets(playbook_text, bullet_ids):
     """
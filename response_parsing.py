@@ -0,0 +1,410 @@
+"""
+==============================================================================
+response_parsing.py
+==============================================================================
+
+This file contains the single-pass parsers for agent responses.
+
+A response is decoded once by `decode_json` (whole text, fenced ```json
+blocks, embedded objects, trailing commas and truncated objects) and wrapped
+in a per-role result (`GeneratorResponse`, `ReflectorResponse`,
+`CuratorResponse`). Results are cached by response text, so every consumer of
+the same response (answer extraction, bullet IDs, bullet tags, operations)
+shares one decode instead of re-running json.loads and regex passes over long
+reasoning text. Results are shared between callers and must not be mutated.
+
+"""
+import re
+import json
+from functools import lru_cache, cached_property
+from typing import Any, Dict, List, Optional, Tuple
+
+NO_ANSWER = "No final answer found"
+
+PARSE_CACHE_SIZE = 512
+
+# Unclosed objects tried as the start of a truncated payload
+TRUNCATED_REPAIR_ATTEMPTS = 3
+
+# Fields a response of each role must contain to be usable; a truncated
+# response that still has them (salvaged by decode_json) needs no continuation
+REQUIRED_FIELDS = {
+    "generator": ("final_answer",),
+    "reflector": ("bullet_tags",),
+    "curator": ("reasoning", "operations"),
+    "reflect_curator": ("bullet_tags", "reasoning", "operations"),
+}
+
+_FENCE_RE = re.compile(r'```(?:json)?\s*(.*?)\s*```', re.DOTALL | re.IGNORECASE)
+_STRUCTURAL_RE = re.compile(r'[{}"\\]')
+_TOKEN_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\],:]|[^\s{}\[\],:"]+|\s+', re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r'("[^"\\]*(?:\\.[^"\\]*)*")|,(?=\s*[}\]])', re.DOTALL)
+_CITED_ID_RE = re.compile(r'\[([a-z]{3,}-\d{5})\]')
+
+
+def _scan_objects(text: str) -> Tuple[List[Tuple[int, int]], List[int]]:
+    """
+    Find top-level JSON object candidates in one linear pass.
+
+    Braces are matched with a stack, skipping string contents (with escapes)
+    inside objects. A closed object swallows the candidates nested in it, so
+    only outermost complete objects are returned; an unmatched '{' in prose
+    does not hide the complete objects that follow it.
+
+    Returns:
+        Tuple of (complete (start, end) spans in text order, start positions
+        of objects still open at the end of the text, outermost first)
+    """
+    spans = []
+    stack = []
+    in_string = False
+    escaped_until = 0
+    # Only braces, quotes and backslashes matter; jump between them
+    for match in _STRUCTURAL_RE.finditer(text):
+        i = match.start()
+        if i < escaped_until:
+            continue
+        ch = text[i]
+        if in_string:
+            if ch == '\\':
+                escaped_until = i + 2
+            elif ch == '"':
+                in_string = False
+        elif ch == '{':
+            stack.append(i)
+        elif ch == '}':
+            if stack:
+                start = stack.pop()
+                while spans and spans[-1][0] > start:
+                    spans.pop()
+                spans.append((start, i + 1))
+        elif ch == '"' and stack:
+            in_string = True
+    return spans, stack
+
+
+def _strip_trailing_commas(text: str) -> str:
+    """Drop commas directly before a closing brace or bracket (outside strings)."""
+    return _TRAILING_COMMA_RE.sub(lambda match: match.group(1) or "", text)
+
+
+def close_truncated_json(text: str) -> Optional[str]:
+    """
+    Cut a truncated JSON object back to its last complete value and close it.
+
+    Values cut off mid-way (an unterminated string, a number or literal at the
+    very end, a key without its value, an unclosed nested object, an empty
+    unclosed array) are dropped, while the complete items of an open array are
+    kept, so every value kept is exactly what the model wrote.
+
+    Args:
+        text: Text starting with the object's opening brace
+
+    Returns:
+        The repaired JSON text, the complete object if the text is not
+        truncated, or None if nothing can be salvaged
+    """
+    stack = []         # open containers, '{' or '['
+    expect_key = []    # per container: next string is an object key
+    nested_objects = 0  # open objects besides the outermost one
+    clean = None       # (end index, closing brackets) after the last complete value
+    n = len(text)
+    i = 0
+
+    def closers():
+        return ''.join('}' if c == '{' else ']' for c in reversed(stack))
+
+    while i < n:
+        match = _TOKEN_RE.match(text, i)
+        if not match:
+            break  # unterminated string
+        token = match.group()
+        i = match.end()
+        ch = token[0]
+        if ch == '"':
+            if not nested_objects and not (stack and stack[-1] == '{' and expect_key[-1]):
+                clean = (i, closers())
+        elif ch in '{[':
+            if ch == '{' and stack:
+                nested_objects += 1
+            stack.append(ch)
+            expect_key.append(ch == '{')
+            if len(stack) == 1:
+                # A nested container only counts once it is closed
+                clean = (i, closers())
+        elif ch in '}]':
+            if not stack or (ch == '}') != (stack[-1] == '{'):
+                return None
+            stack.pop()
+            expect_key.pop()
+            if not stack:
+                return text[:i]
+            if ch == '}':
+                nested_objects -= 1
+            if not nested_objects:
+                clean = (i, closers())
+        elif ch == ',':
+            if stack and stack[-1] == '{':
+                expect_key[-1] = True
+        elif ch == ':':
+            if stack:
+                expect_key[-1] = False
+        elif not ch.isspace():
+            # Number or literal; only complete once a delimiter follows
+            if i >= n:
+                break
+            if not nested_objects:
+                clean = (i, closers())
+
+    if clean is None or not stack:
+        return None
+    end, closing = clean
+    return text[:end] + closing
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def decode_json(text: str) -> Tuple[Any, str]:
+    """
+    Decode the JSON payload of a response, tolerating common LLM formatting.
+
+    Tried in order: the whole text, fenced ```json blocks, then the objects
+    found by _scan_objects from largest to smallest (later first on ties),
+    where an object still open at the end of the text counts as its whole
+    tail and is closed after its last complete value, and last the complete
+    objects again with trailing commas removed. Every step is linear in the
+    length of the text.
+
+    Args:
+        text: Raw response text
+
+    Returns:
+        Tuple of (decoded value or None, source), source being one of 'json',
+        'fenced', 'embedded', 'lenient', 'truncated' or 'none'
+    """
+    if not text:
+        return None, "none"
+    try:
+        return json.loads(text.strip()), "json"
+    except ValueError:
+        pass
+
+    for match in _FENCE_RE.findall(text):
+        try:
+            return json.loads(match), "fenced"
+        except ValueError:
+            continue
+
+    spans, open_starts = _scan_objects(text)
+    # An unmatched '{' in the prose may precede the truncated object
+    candidates = spans + [(start, None) for start in open_starts[:TRUNCATED_REPAIR_ATTEMPTS]]
+    candidates.sort(key=lambda span: ((span[1] or len(text)) - span[0], span[0]), reverse=True)
+    for start, end in candidates:
+        if end is None:
+            repaired = close_truncated_json(text[start:])
+            candidate, source = _strip_trailing_commas(repaired) if repaired else None, "truncated"
+        else:
+            candidate, source = text[start:end], "embedded"
+        if candidate:
+            try:
+                return json.loads(candidate), source
+            except ValueError:
+                continue
+
+    for match in _FENCE_RE.findall(text) + [text[start:end] for start, end in candidates if end is not None]:
+        try:
+            return json.loads(_strip_trailing_commas(match)), "lenient"
+        except ValueError:
+            continue
+    return None, "none"
+
+
+def missing_fields(text: str, required) -> List[str]:
+    """
+    Required top-level fields absent from the decoded response.
+
+    Args:
+        text: Raw (possibly truncated) response text
+        required: Field names the response must contain
+
+    Returns:
+        The missing field names, in the order given (all of them if the
+        response has no decodable object)
+    """
+    value, _ = decode_json(text)
+    if not isinstance(value, dict):
+        return list(required)
+    return [key for key in required if key not in value]
+
+
+def extract_boxed_content(text):
+    """Helper function to extract content from \\boxed{} format"""
+    pattern = r'\\boxed\{'
+    match = re.search(pattern, text)
+    if not match:
+        return None
+
+    start = match.end() - 1  # Position of opening brace
+    brace_count = 0
+    i = start
+
+    while i < len(text):
+        if text[i] == '{':
+            brace_count += 1
+        elif text[i] == '}':
+            brace_count -= 1
+            if brace_count == 0:
+                return text[start + 1:i]  # Content between braces
+        i += 1
+    return None
+
+
+def _answer_from_text(response: str) -> str:
+    """Fallback final answer patterns for responses without a usable JSON payload."""
+    matches = re.findall(r"Finish\[(.*?)\]", response)
+    if matches:
+        return matches[-1]
+
+    # Try to get final answer from JSON style response with regex matching
+    # Try double quotes first
+    matches = re.findall(r'"final_answer"\s*:\s*"([^"]*)"', response)
+    if matches:
+        return matches[-1]
+
+    # Try single quotes
+    matches = re.findall(r"'final_answer'\s*:\s*'([^']*)'", response)
+    if matches:
+        return matches[-1]
+
+    # Handle JSON format without quotes (for simple expressions)
+    matches = re.findall(r'[\'"]final_answer[\'"]\s*:\s*([^,}]+)', response)
+    if matches:
+        answer = matches[-1].strip()
+        # Clean up trailing characters
+        return re.sub(r'[,}]*$', '', answer)
+
+    # Fallback for "The final answer is: X" pattern with boxed
+    match = re.search(r'[Tt]he final answer is:?\s*\$?\\boxed\{', response)
+    if match:
+        boxed_content = extract_boxed_content(response[match.start():])
+        if boxed_content:
+            return boxed_content
+
+    # More general pattern for "final answer is X"
+    matches = re.findall(r'[Tt]he final answer is:?\s*([^\n.]+)', response)
+    if matches:
+        answer = matches[-1].strip()
+        # Clean up common formatting
+        answer = re.sub(r'^\$?\\boxed\{([^}]+)\}\$?$', r'\1', answer)
+        answer = answer.replace('$', '').strip()
+        if answer:
+            return answer
+
+    return NO_ANSWER
+
+
+def _balanced_array(text: str, key: str) -> Optional[List[Any]]:
+    """Decode the array following `"key"` in text that has no decodable object."""
+    start_idx = text.find(f'"{key}"')
+    if start_idx == -1:
+        return None
+    bracket_idx = text.find('[', start_idx)
+    if bracket_idx == -1:
+        return None
+    depth = 0
+    for i in range(bracket_idx, len(text)):
+        if text[i] == '[':
+            depth += 1
+        elif text[i] == ']':
+            depth -= 1
+            if depth == 0:
+                try:
+                    value = json.loads(text[bracket_idx:i + 1])
+                except ValueError:
+                    return None
+                return value if isinstance(value, list) else None
+    return None
+
+
+class ParsedResponse:
+    """A response decoded once; `data` is the decoded object or None."""
+
+    def __init__(self, text: str):
+        self.text = text
+        value, self.source = decode_json(text)
+        self.data = value if isinstance(value, dict) else None
+
+    @property
+    def ok(self) -> bool:
+        return self.data is not None
+
+    @property
+    def truncated(self) -> bool:
+        """The payload was cut off and salvaged up to its last complete value."""
+        return self.source == "truncated"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default) if self.data is not None else default
+
+    @property
+    def reasoning(self) -> str:
+        return str(self.get("reasoning", ""))
+
+
+class GeneratorResponse(ParsedResponse):
+    """Generator response: final answer, listed bullet IDs and bullet IDs cited in the text."""
+
+    def __init__(self, text: str):
+        super().__init__(text)
+        if self.data is not None and "final_answer" in self.data:
+            self.final_answer = str(self.data["final_answer"])
+        else:
+            self.final_answer = _answer_from_text(text)
+        bullet_ids = self.get("bullet_ids")
+        self.bullet_ids = [str(b) for b in bullet_ids] if isinstance(bullet_ids, list) else None
+
+    @cached_property
+    def cited_ids(self) -> List[str]:
+        """Bullet IDs cited as [xxx-00001], in order."""
+        return _CITED_ID_RE.findall(self.text)
+
+
+class ReflectorResponse(ParsedResponse):
+    """Reflector response: bullet tags (list of dicts with 'id' and 'tag')."""
+
+    def __init__(self, text: str):
+        super().__init__(text)
+        bullet_tags = self.get("bullet_tags")
+        if bullet_tags is None:
+            bullet_tags = _balanced_array(text, "bullet_tags")
+        self.bullet_tags = bullet_tags if isinstance(bullet_tags, list) else None
+        # The array only if the response contains it in full (not cut off by a truncation)
+        self.complete_bullet_tags = self.bullet_tags
+        if self.truncated:
+            self.complete_bullet_tags = _balanced_array(text, "bullet_tags")
+
+
+class CuratorResponse(ParsedResponse):
+    """Curator response: the operations list, if present."""
+
+    def __init__(self, text: str):
+        super().__init__(text)
+        operations = self.get("operations")
+        self.operations = operations if isinstance(operations, list) else None
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_generator_response(text: str) -> GeneratorResponse:
+    """Parse a generator response (cached by text)."""
+    return GeneratorResponse(text or "")
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_reflector_response(text: str) -> ReflectorResponse:
+    """Parse a reflector response (cached by text)."""
+    return ReflectorResponse(text or "")
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_curator_response(text: str) -> CuratorResponse:
+    """Parse a curator or fused reflect-curator response (cached by text)."""
+    return CuratorResponse(text or "")
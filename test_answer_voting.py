@@ -0,0 +1,78 @@
+
+import os
+import sys
+import json
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from utils import vote_answers
+from llm import timed_llm_call
+
+
+def response(answer):
+    return json.dumps({"reasoning": "r", "final_answer": answer})
+
+
+def test_majority_answer_wins():
+    vote = vote_answers([response("41"), response("42"), response("42")])
+    assert vote["answer"] == "42" and vote["index"] == 1
+    assert vote["agreement"] == 2 / 3
+    assert vote["votes"] == {"41": 1.0, "42": 2.0}
+
+
+def test_answers_are_compared_normalized():
+    vote = vote_answers([response("Yes "), response("yes"), response("no")])
+    # The answer is returned as first extracted
+    assert vote["answer"] == "Yes " and vote["agreement"] == 2 / 3
+
+
+def test_tie_goes_to_the_answer_sampled_first():
+    assert vote_answers([response("b"), response("a"), response("a"), response("b")])["answer"] == "b"
+    assert vote_answers([response("a"), response("b")])["index"] == 0
+
+
+def test_weights_can_outvote_the_majority():
+    vote = vote_answers([response("41"), response("42"), response("42")], weights=[3.0, 1.0, 1.0])
+    assert vote["answer"] == "41" and vote["agreement"] == 0.6
+    # Weighted ties also go to the first sample
+    assert vote_answers([response("41"), response("42")], weights=[2.0, 2.0])["answer"] == "41"
+
+
+def test_missing_answers_only_win_if_no_sample_has_one():
+    vote = vote_answers(["garbled", "garbled", response("42")])
+    assert vote["answer"] == "42" and vote["index"] == 2
+    assert vote["agreement"] == 1 / 3
+    assert vote_answers(["garbled", "garbled"])["answer"] == "No final answer found"
+
+
+def test_zero_total_weight_has_no_agreement():
+    assert vote_answers([response("42")], weights=[0.0])["agreement"] == 0.0
+
+
+class FakeClient:
+    """OpenAI-style client answering every request with the given choice texts; records each request"""
+
+    def __init__(self, *contents):
+        self.contents = contents
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **params):
+        self.requests.append(params)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content), finish_reason="stop")
+                     for content in self.contents],
+            usage=SimpleNamespace(prompt_tokens=100, completion_tokens=30)
+        )
+
+
+def test_samples_come_from_one_request():
+    client = FakeClient(response("41"), "", response("42"))
+    responses, call_info = timed_llm_call(client, "openai", "model", "Answer.", "generator", "gen_samples",
+                                          max_tokens=50, sleep_seconds=0, n=3)
+    assert len(client.requests) == 1 and client.requests[0]["n"] == 3
+    # Empty choices are dropped
+    assert responses == [response("41"), response("42")]
+    assert call_info["n"] == 2
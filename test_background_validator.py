@@ -0,0 +1,110 @@
+
+import os
+import sys
+import json
+import time
+import threading
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+import pytest
+from ace.ace import _BackgroundValidator
+
+
+class Validation:
+    """validate(job) for the validator: blocks until the job's step is released, records calls"""
+
+    def __init__(self):
+        self.calls = []
+        self.released = {}
+        self.lock = threading.Lock()
+
+    def gate(self, step):
+        with self.lock:
+            return self.released.setdefault(step, threading.Event())
+
+    def release(self, *steps):
+        for step in steps:
+            self.gate(step).set()
+
+    def __call__(self, job):
+        self.gate(job["step"]).wait(5)
+        with self.lock:
+            self.calls.append(job["step"])
+        return {"accuracy": job["step"] / 10}, {"step": job["step"]}
+
+
+@pytest.fixture
+def validator():
+    """A validator with at most two concurrent validations; closed afterwards"""
+    validation = Validation()
+    validators = []
+
+    def make(max_concurrent=2):
+        validators.append(_BackgroundValidator(validation, max_concurrent))
+        return validators[-1]
+
+    yield validation, make
+    validation.release(*range(100))
+    for background in validators:
+        background.close()
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def steps(finished):
+    return [job["step"] for job, _, _ in finished]
+
+
+def test_submit_blocks_only_beyond_max_concurrent(validator):
+    validation, make = validator
+    background = make(max_concurrent=2)
+    validation.release(1)
+    assert background.submit({"step": 1}) == []
+    assert background.submit({"step": 2}) == []
+    # A third validation waits for the oldest one
+    finished = background.submit({"step": 3})
+    assert steps(finished) == [1]
+    assert finished[0][1] == {"accuracy": 0.1}
+
+
+def test_results_come_back_in_submission_order(validator):
+    validation, make = validator
+    background = make(max_concurrent=3)
+    for step in (1, 2, 3):
+        background.submit({"step": step})
+    # The later validations finish first; poll hands nothing back past the unfinished oldest one
+    validation.release(2, 3)
+    wait_until(lambda: len(validation.calls) == 2)
+    assert background.poll() == []
+    validation.release(1)
+    assert steps(background.drain()) == [1, 2, 3]
+
+
+def test_checkpointed_validations_resume_without_rerunning_finished_ones(validator):
+    validation, make = validator
+    background = make(max_concurrent=2)
+    validation.release(1)
+    background.submit({"step": 1})
+    background.submit({"step": 2})
+    wait_until(lambda: background._jobs[0][1].done())
+    entries = json.loads(json.dumps(background.checkpoint_jobs()))
+    assert entries == [
+        {"job": {"step": 1}, "val_results": {"accuracy": 0.1}, "val_error_log": {"step": 1}},
+        {"job": {"step": 2}},
+    ]
+
+    resumed = make(max_concurrent=2)
+    assert resumed.resume(entries) == []
+    validation.release(2)
+    finished = resumed.drain()
+    assert steps(finished) == [1, 2]
+    assert [result for _, result, _ in finished] == [{"accuracy": 0.1}, {"accuracy": 0.2}]
+    # Step 1 ran only before the checkpoint
+    assert validation.calls.count(1) == 1
@@ -0,0 +1,144 @@
+
+import os
+import sys
+import json
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+import pytest
+import ace.ace as ace_module
+import ace.core.generator as generator_module
+import ace.core.reflector as reflector_module
+import ace.core.curator as curator_module
+from ace.core.generator import Generator
+from ace.core.cascade_generator import CascadeGenerator
+
+PLAYBOOK = """## STRATEGIES & INSIGHTS
+[str-00001] helpful=2 harmful=0 :: Read the question twice."""
+
+
+class ExactMatch:
+    def answer_is_correct(self, predicted, target):
+        return predicted == target
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Replace every agent's LLM call; generators answer with their model name. Records (model, call_id)"""
+    calls = []
+
+    def fake_call(api_client, api_provider, model, prompt, role, call_id, **kwargs):
+        calls.append((model, call_id))
+        if role == "reflector":
+            return json.dumps({"reasoning": "r", "bullet_tags": []}), {}
+        if role == "curator":
+            return json.dumps({"reasoning": "r", "operations": []}), {}
+        response = json.dumps({"reasoning": "r", "bullet_ids": [], "final_answer": model})
+        n = kwargs.get("n", 1)
+        return ([response] * n if n > 1 else response), {}
+
+    for module in (generator_module, reflector_module, curator_module):
+        monkeypatch.setattr(module, "timed_llm_call", fake_call)
+    monkeypatch.setattr(ace_module, "initialize_clients", lambda api_provider: (None, None, None))
+    return calls
+
+
+def make_ace(cascade):
+    ace = ace_module.ACE("openai", "strong", "reflector", "curator", initial_playbook=PLAYBOOK)
+    if cascade:
+        ace.cascade = CascadeGenerator(Generator(None, "openai", "cheap"), ace.generator)
+    return ace
+
+
+def train_step(ace, tmp_path, target):
+    return ace._train_single_sample(
+        {"question": "Q", "context": "C", "target": target}, ExactMatch(), "step_1", 1, 1,
+        str(tmp_path / "usage.jsonl"), str(tmp_path), ace._extract_config_params({}), 1
+    )
+
+
+def test_unchanged_playbook_reuses_the_initial_answer(llm, tmp_path):
+    pre_train_answer, post_train_answer, tracking = train_step(make_ace(cascade=False), tmp_path, "strong")
+    assert pre_train_answer == post_train_answer == "strong"
+    assert tracking["post_train_result"]["reused_pre_train"]
+    assert "step_1_post_curate" not in [call_id for _, call_id in llm]
+
+
+def test_cascade_answer_is_not_reused_as_post_curate_answer(llm, tmp_path):
+    # The cheap tier answered first; the post-curate answer must come from the strong generator
+    pre_train_answer, post_train_answer, tracking = train_step(make_ace(cascade=True), tmp_path, "strong")
+    assert pre_train_answer == "cheap"
+    assert post_train_answer == "strong"
+    assert "reused_pre_train" not in tracking["post_train_result"]
+    assert ("strong", "step_1_post_curate") in llm
+
+
+class FakeTier:
+    """Generator stand-in: generate_samples returns `answers`, with `margins` as the answer logprob margins"""
+
+    def __init__(self, model, answers, margins=None):
+        self.model = model
+        self.answers = answers
+        self.margins = margins
+        self.calls = []
+
+    def response(self, answer):
+        return json.dumps({"reasoning": "r", "bullet_ids": [], "final_answer": answer}) if answer else "No JSON"
+
+    def generate_samples(self, question, playbook, n, call_id, **kwargs):
+        self.calls.append(call_id)
+        info = {"prompt_num_tokens": 10, "response_num_tokens": 2 * n, "answer_logprob_margin": self.margins}
+        return [self.response(answer) for answer in self.answers[:n]], [[] for _ in range(n)], info
+
+    def generate(self, question, playbook, call_id, **kwargs):
+        self.calls.append(call_id)
+        return self.response(self.answers[0]), [], {"prompt_num_tokens": 10, "response_num_tokens": 5}
+
+
+def cascade(cheap_answers, margins=None, cheap_samples=1, min_logprob_margin=None):
+    return CascadeGenerator(FakeTier("cheap", cheap_answers, margins), FakeTier("strong", ["42"]),
+                            cheap_samples=cheap_samples, min_logprob_margin=min_logprob_margin)
+
+
+def answer(result):
+    return json.loads(result[0])["final_answer"]
+
+
+def test_agreeing_cheap_answer_is_accepted():
+    generator = cascade(["42", "42 "], cheap_samples=2)
+    result = generator.generate("Q", PLAYBOOK, call_id="gen")
+    assert answer(result) == "42"
+    assert result[2]["cascade"] == {"tier": "cheap", "reason": None}
+    assert generator.strong.calls == []
+
+
+@pytest.mark.parametrize("cheap_answers, margins, reason", [
+    ([None], None, "no_answer"),
+    (["41", "42", "42"], None, "disagreement"),
+    (["42", "42"], [0.5, 3.0], "low_margin"),
+])
+def test_untrustworthy_cheap_answers_escalate(cheap_answers, margins, reason):
+    generator = cascade(cheap_answers, margins, cheap_samples=len(cheap_answers), min_logprob_margin=1.0)
+    result = generator.generate("Q", PLAYBOOK, call_id="gen")
+    assert generator.strong.calls == ["gen_strong"]
+    assert result[2]["cascade"] == {"tier": "strong", "reason": reason}
+    # Tokens cover both tiers
+    assert result[2]["prompt_num_tokens"] == 20
+
+
+def test_margins_are_ignored_without_a_threshold():
+    generator = cascade(["42"], margins=[0.1])
+    assert generator.generate("Q", PLAYBOOK, call_id="gen")[2]["cascade"]["tier"] == "cheap"
+
+
+def test_summary_reports_escalations_per_reason():
+    generator = cascade(["42"], margins=[0.1], min_logprob_margin=1.0)
+    generator.generate("Q", PLAYBOOK, call_id="gen_1")
+    generator.cheap.margins = [2.0]
+    generator.generate("Q", PLAYBOOK, call_id="gen_2")
+
+    summary = generator.summary()
+    assert summary["requests"] == 2 and summary["escalation_rate"] == 0.5
+    assert summary["escalations"] == {"no_answer": 0, "disagreement": 0, "low_margin": 1}
+    assert summary["tiers"]["cheap"]["calls"] == 2 and summary["tiers"]["strong"]["calls"] == 1
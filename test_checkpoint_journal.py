@@ -0,0 +1,105 @@
+
+import os
+import sys
+import json
+import random
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+import pytest
+from checkpoint import (
+    CheckpointJournal, save_checkpoint, load_checkpoint, rng_state_to_json, rng_state_from_json,
+    JOURNAL_FILENAME, CHECKPOINT_FILENAME
+)
+
+
+def journal_lines(save_path):
+    with open(os.path.join(save_path, JOURNAL_FILENAME), encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_restore_rebuilds_the_synced_lists(tmp_path):
+    journal = CheckpointJournal(str(tmp_path))
+    answers, results = ["a"], [{"step": 1}]
+    journal.sync({"answers": answers, "results": results})
+    answers.extend(["b", "c"])
+    results.append({"step": 2})
+    state = journal.sync({"answers": answers, "results": results})
+
+    restored = CheckpointJournal(str(tmp_path)).restore(json.loads(json.dumps(state)))
+    assert restored == {"answers": ["a", "b", "c"], "results": [{"step": 1}, {"step": 2}]}
+    # Each item is journaled once
+    assert len(journal_lines(tmp_path)) == 2 + 5
+
+
+def test_lines_after_the_checkpoint_are_dropped(tmp_path):
+    journal = CheckpointJournal(str(tmp_path))
+    answers = ["a", "b"]
+    state = journal.sync({"answers": answers})
+    # Journaled after the last checkpoint, then the run crashed before saving the next one
+    answers.append("c")
+    journal.sync({"answers": answers})
+    with open(os.path.join(tmp_path, JOURNAL_FILENAME), "a", encoding="utf-8") as f:
+        f.write('{"list": "answers", "it')
+
+    resumed = CheckpointJournal(str(tmp_path))
+    restored = resumed.restore(state)
+    assert restored == {"answers": ["a", "b"]}
+    assert os.path.getsize(os.path.join(tmp_path, JOURNAL_FILENAME)) == state["offset"]
+
+    # The resumed run journals on top of the truncated file
+    restored["answers"].append("d")
+    state = resumed.sync(restored)
+    assert CheckpointJournal(str(tmp_path)).restore(state) == {"answers": ["a", "b", "d"]}
+
+
+def test_unstable_items_are_kept_in_the_checkpoint_tail(tmp_path):
+    journal = CheckpointJournal(str(tmp_path))
+    results = [{"i": 0}, {"i": 1, "post": None}, {"i": 2, "post": None}]
+    state = journal.sync({"results": results}, stable={"results": 1})
+    assert state["tails"] == {"results": results[1:]}
+    assert [line.get("item") for line in journal_lines(tmp_path)] == [None, {"i": 0}]
+
+    # The deferred items are completed later and journaled once they are stable
+    restored = CheckpointJournal(str(tmp_path))
+    results = restored.restore(state)["results"]
+    results[1]["post"] = results[2]["post"] = "done"
+    state = restored.sync({"results": results})
+    assert state["tails"] == {"results": []}
+    assert CheckpointJournal(str(tmp_path)).restore(state)["results"] == [
+        {"i": 0}, {"i": 1, "post": "done"}, {"i": 2, "post": "done"}
+    ]
+
+
+def test_new_list_object_starts_the_list_over(tmp_path):
+    journal = CheckpointJournal(str(tmp_path))
+    journal.sync({"epoch_answers": ["a", "b"]})
+    state = journal.sync({"epoch_answers": ["c"]})
+    assert CheckpointJournal(str(tmp_path)).restore(state) == {"epoch_answers": ["c"]}
+
+
+def test_restore_without_checkpoint_starts_an_empty_journal(tmp_path):
+    CheckpointJournal(str(tmp_path)).sync({"answers": ["a"]})
+    journal = CheckpointJournal(str(tmp_path))
+    assert journal.restore(None) == {}
+    assert os.path.getsize(os.path.join(tmp_path, JOURNAL_FILENAME)) == 0
+
+
+def test_checkpoint_round_trip_with_rng_state(tmp_path):
+    rng = random.Random(7)
+    rng.random()
+    save_checkpoint(str(tmp_path), {"step": 3, "rng_state": rng_state_to_json(rng.getstate())})
+    assert not os.path.exists(os.path.join(tmp_path, CHECKPOINT_FILENAME + ".tmp"))
+
+    state = load_checkpoint(str(tmp_path))
+    resumed = random.Random()
+    resumed.setstate(rng_state_from_json(state["rng_state"]))
+    assert state["step"] == 3 and resumed.random() == rng.random()
+
+
+def test_unsupported_checkpoint_version_is_rejected(tmp_path):
+    with open(os.path.join(tmp_path, CHECKPOINT_FILENAME), "w") as f:
+        json.dump({"checkpoint_version": 1}, f)
+    with pytest.raises(ValueError):
+        load_checkpoint(str(tmp_path))
@@ -0,0 +1,88 @@
+
+import os
+import sys
+import json
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+import pytest
+import ace.ace as ace_module
+import ace.core.generator as generator_module
+import ace.core.reflector as reflector_module
+import ace.core.curator as curator_module
+import ace.core.reflect_curator as reflect_curator_module
+
+PLAYBOOK = """## STRATEGIES & INSIGHTS
+[str-00001] helpful=2 harmful=0 :: Read the question twice."""
+
+ADD_LESSON = [{"type": "ADD", "section": "strategies_and_insights", "content": "Check the units."}]
+
+
+class ExactMatch:
+    def answer_is_correct(self, predicted, target):
+        return predicted == target
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Replace every agent's LLM call. Records (role, call_id); `fused` is the fused call's response"""
+    state = {"calls": [], "answer": "right", "fused": {
+        "reasoning": "r", "bullet_tags": [{"id": "str-00001", "tag": "helpful"}], "operations": ADD_LESSON
+    }}
+
+    def fake_call(api_client, api_provider, model, prompt, role, call_id, **kwargs):
+        state["calls"].append((role, call_id))
+        if role == "reflect_curator":
+            return state["fused"] if isinstance(state["fused"], str) else json.dumps(state["fused"]), {}
+        if role == "reflector":
+            return json.dumps({"reasoning": "r", "bullet_tags": []}), {}
+        if role == "curator":
+            return json.dumps({"reasoning": "r", "operations": []}), {}
+        return json.dumps({"reasoning": "r", "bullet_ids": ["str-00001"], "final_answer": state["answer"]}), {}
+
+    for module in (generator_module, reflector_module, curator_module, reflect_curator_module):
+        monkeypatch.setattr(module, "timed_llm_call", fake_call)
+    monkeypatch.setattr(ace_module, "initialize_clients", lambda api_provider: (None, None, None))
+    return state
+
+
+def train_step(tmp_path, **config):
+    ace = ace_module.ACE("openai", "generator", "reflector", "curator", initial_playbook=PLAYBOOK)
+    config_params = ace._extract_config_params({"json_mode": True, "fused_reflect_curate": True,
+                                                "post_curate_generation": "off", **config})
+    ace._train_single_sample(
+        {"question": "Question", "context": "", "target": "right"}, ExactMatch(), "step_1", 1, 1,
+        str(tmp_path / "usage.jsonl"), str(tmp_path), config_params, 1
+    )
+    return ace
+
+
+def test_reflect_on_correct_is_fused_with_curation(llm, tmp_path):
+    ace = train_step(tmp_path)
+    assert llm["calls"] == [("generator", "step_1_gen_initial"), ("reflect_curator", "step_1_reflect_on_correct_fused")]
+    assert "helpful=3 harmful=0 :: Read the question twice." in ace.playbook
+    assert "Check the units." in ace.playbook
+
+
+def test_only_the_first_error_round_is_fused(llm, tmp_path):
+    llm["answer"] = "wrong"
+    ace = train_step(tmp_path, max_num_rounds=2)
+    reflections = [call for call in llm["calls"] if call[0] in ("reflector", "reflect_curator", "curator")]
+    assert reflections == [("reflect_curator", "step_1_round_0_fused"), ("reflector", "step_1_round_1")]
+    assert "Check the units." in ace.playbook
+
+
+def test_unparseable_operations_fall_back_to_the_curator(llm, tmp_path):
+    llm["fused"] = json.dumps({"reasoning": "r", "bullet_tags": [{"id": "str-00001", "tag": "helpful"}]})
+    ace = train_step(tmp_path)
+    assert llm["calls"][-1] == ("curator", "step_1")
+    # The fused call's bullet tags still count
+    assert "helpful=3 harmful=0" in ace.playbook
+    assert "Check the units." not in ace.playbook
+
+
+def test_fusion_needs_a_curator_every_step(llm, tmp_path):
+    train_step(tmp_path, curator_frequency=2)
+    assert ("reflector", "step_1_reflect_on_correct") in llm["calls"]
+    assert not any(role == "reflect_curator" for role, _ in llm["calls"])
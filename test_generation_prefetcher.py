@@ -0,0 +1,121 @@
+
+import os
+import sys
+import threading
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+import pytest
+from ace.ace import _GenerationPrefetcher
+
+
+class FakeGenerator:
+    """Answers with the playbook it was given; counts calls"""
+
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def generate(self, question, playbook, call_id, **kwargs):
+        self.release.wait(5)
+        self.calls.append(call_id)
+        return f"answer with {playbook}", ["str-00001"], {}
+
+
+@pytest.fixture
+def prefetch():
+    """Prefetcher over a fake ACE whose playbook the test advances; closed afterwards"""
+    ace = SimpleNamespace(playbook="playbook v0", playbook_version=0, answer_generator=FakeGenerator())
+    prefetchers = []
+
+    def make(max_staleness, depth=2):
+        prefetcher = _GenerationPrefetcher(ace, depth, max_staleness, log_dir=None, use_json_mode=True)
+        prefetchers.append(prefetcher)
+        return prefetcher
+
+    yield ace, make
+    for prefetcher in prefetchers:
+        prefetcher.close()
+
+
+def advance(ace, versions=1):
+    ace.playbook_version += versions
+    ace.playbook = f"playbook v{ace.playbook_version}"
+
+
+def sample(i):
+    return {"question": f"Q{i}", "context": ""}
+
+
+def test_generation_within_the_staleness_bound_is_used(prefetch):
+    ace, make = prefetch
+    prefetcher = make(max_staleness=2)
+    prefetcher.schedule(1, sample(1), "step_1")
+    advance(ace, 2)
+
+    # The generation and the playbook it was generated with, not the current one
+    assert prefetcher.take(1) == ("answer with playbook v0", ["str-00001"], "playbook v0")
+    assert prefetcher.used == 1 and prefetcher.staleness == [2]
+
+
+def test_generation_beyond_the_staleness_bound_is_discarded(prefetch):
+    ace, make = prefetch
+    prefetcher = make(max_staleness=2)
+    prefetcher.schedule(1, sample(1), "step_1")
+    advance(ace, 3)
+
+    assert prefetcher.take(1) is None
+    assert prefetcher.discarded == 1 and prefetcher.used == 0
+
+
+def test_zero_staleness_only_uses_current_generations(prefetch):
+    ace, make = prefetch
+    prefetcher = make(max_staleness=0)
+    prefetcher.schedule(1, sample(1), "step_1")
+    prefetcher.schedule(2, sample(2), "step_2")
+    assert prefetcher.take(1) is not None
+    advance(ace)
+    assert prefetcher.take(2) is None
+
+
+def test_snapshot_is_taken_when_scheduled(prefetch):
+    ace, make = prefetch
+    prefetcher = make(max_staleness=4)
+    ace.answer_generator.release.clear()
+    prefetcher.schedule(1, sample(1), "step_1")
+    # The playbook changes while the generation is still running
+    advance(ace)
+    ace.answer_generator.release.set()
+    assert prefetcher.take(1)[2] == "playbook v0"
+    assert prefetcher.staleness == [1]
+
+
+def test_samples_are_scheduled_once_and_taken_once(prefetch):
+    ace, make = prefetch
+    prefetcher = make(max_staleness=1)
+    prefetcher.schedule(1, sample(1), "step_1")
+    prefetcher.schedule(1, sample(1), "step_1")
+    assert prefetcher.take(1) is not None
+    assert prefetcher.take(1) is None
+    assert prefetcher.take(2) is None
+    assert ace.answer_generator.calls == ["step_1_gen_initial"]
+
+
+def test_summary_reports_staleness(prefetch):
+    ace, make = prefetch
+    prefetcher = make(max_staleness=1)
+    for step in (1, 2, 3):
+        prefetcher.schedule(step, sample(step), f"step_{step}")
+    prefetcher.take(1)
+    advance(ace)
+    prefetcher.take(2)
+    advance(ace)
+    prefetcher.take(3)
+
+    summary = prefetcher.summary(wall_seconds=10.0)
+    assert summary["prefetched_used"] == 2 and summary["prefetched_discarded"] == 1
+    assert summary["max_observed_staleness"] == 1 and summary["mean_staleness"] == 0.5
+    assert summary["pipeline_depth"] == 2 and summary["max_staleness"] == 1
@@ -0,0 +1,119 @@
+
+import os
+import re
+import sys
+import json
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+import pytest
+import ace.core.generator as generator_module
+from ace.core.generator import Generator
+from ace.core.reflector import Reflector
+from playbook_utils import update_bullet_counts, parse_playbook_line
+
+PLAYBOOK = """## STRATEGIES & INSIGHTS
+[str-00001] helpful=2 harmful=0 :: Read the question twice.
+[str-00002] helpful=0 harmful=1 :: Guess when unsure.
+
+## FORMULAS & CALCULATIONS
+[cal-00003] helpful=5 harmful=0 :: Interest = principal * rate * time."""
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Replace the LLM call with canned responses; records the messages sent"""
+    calls = []
+    responses = []
+
+    def fake_call(api_client, api_provider, model, prompt, role, call_id, **kwargs):
+        calls.append({"prompt": prompt, "messages": kwargs.get("messages")})
+        return responses.pop(0), {}
+
+    monkeypatch.setattr(generator_module, "timed_llm_call", fake_call)
+    return calls, responses
+
+
+def make_generator(playbook_format="compact"):
+    return Generator(None, "openai", "model", playbook_format=playbook_format)
+
+
+def test_cited_aliases_become_bullet_ids(llm):
+    calls, responses = llm
+    responses.append(json.dumps({
+        "reasoning": "Per [b1] and [b3], compute the interest.",
+        "bullet_ids": ["b1", "b3"],
+        "final_answer": "42"
+    }))
+    response, bullet_ids, _ = make_generator().generate("Q", PLAYBOOK, use_json_mode=True)
+
+    # The prompt shows aliases; the caller only ever sees canonical IDs
+    assert "[b1]" in calls[0]["prompt"] and "str-00001" not in calls[0]["prompt"]
+    assert bullet_ids == ["str-00001", "cal-00003"]
+    assert "[str-00001]" in response and "[cal-00003]" in response
+    assert json.loads(response)["bullet_ids"] == ["str-00001", "cal-00003"]
+
+
+def test_alias_citations_in_text_mode(llm):
+    _, responses = llm
+    responses.append("Using [b2] and [b9] (not in the playbook). Final answer: 7")
+    response, bullet_ids, _ = make_generator().generate("Q", PLAYBOOK)
+    assert bullet_ids == ["str-00002"]
+    assert "[str-00002]" in response and "[b9]" in response
+
+
+def test_raw_format_is_unchanged(llm):
+    _, responses = llm
+    text = json.dumps({"reasoning": "See [str-00001] and [b1].", "bullet_ids": ["str-00001"], "final_answer": "1"})
+    responses.append(text)
+    response, bullet_ids, _ = make_generator("raw").generate("Q", PLAYBOOK, use_json_mode=True)
+    assert response == text
+    assert bullet_ids == ["str-00001"]
+
+
+def test_reflector_tags_from_the_trace_update_the_playbook(llm):
+    _, responses = llm
+    responses.append(json.dumps({
+        "reasoning": "Per [b2] I guessed.", "bullet_ids": ["b2"], "final_answer": "x"
+    }))
+    trace, bullet_ids, _ = make_generator().generate("Q", PLAYBOOK, use_json_mode=True)
+
+    # A reflector citing the bullets of the trace it was given tags canonical IDs
+    cited = list(dict.fromkeys(re.findall(r'\[([a-z]{3,}-\d{5})\]', trace)))
+    reflection = json.dumps({"reasoning": "r", "bullet_tags": [{"id": bullet_id, "tag": "harmful"} for bullet_id in cited]})
+    tags = Reflector(None, "openai", "model")._extract_bullet_tags(reflection, use_json_mode=True)
+    assert tags == [{"id": "str-00002", "tag": "harmful"}]
+    assert cited == bullet_ids
+
+    updated = {parsed["id"]: parsed["harmful"] for parsed in map(parse_playbook_line, update_bullet_counts(PLAYBOOK, tags).split("\n")) if parsed}
+    assert updated["str-00002"] == 2
+
+
+def test_session_keeps_aliases_in_the_conversation(llm):
+    calls, responses = llm
+    generator = make_generator()
+    responses.append(json.dumps({"reasoning": "Per [b1].", "bullet_ids": ["b1"], "final_answer": "1"}))
+    initial, _, _ = generator.generate("Q", PLAYBOOK, use_json_mode=True)
+
+    session = generator.start_session("Q", PLAYBOOK, "", initial)
+    assert "[b1]" in session["messages"][1]["content"]
+    assert "str-00001" not in session["messages"][1]["content"]
+
+    followup = json.dumps({"reasoning": "Now [b3].", "bullet_ids": ["b3"], "final_answer": "2"})
+    responses.append(followup)
+    response, bullet_ids, _ = generator.generate_followup(session, "Try the formula.", use_json_mode=True)
+    assert bullet_ids == ["cal-00003"]
+    assert "[cal-00003]" in response
+    assert session["messages"][-1]["content"] == followup
+
+
+def test_packed_answers_use_canonical_ids(llm):
+    _, responses = llm
+    responses.append(json.dumps({"answers": [
+        {"id": 1, "reasoning": "[b1]", "bullet_ids": ["b1"], "final_answer": "a"},
+        {"id": 2, "reasoning": "[b3]", "bullet_ids": ["b3", "b2"], "final_answer": "b"},
+    ]}))
+    _, answers, _ = make_generator().generate_packed([("Q1", ""), ("Q2", "")], PLAYBOOK, use_json_mode=True)
+    assert [answer["bullet_ids"] for answer in answers] == [["str-00001"], ["cal-00003", "str-00002"]]
+    assert answers[1]["reasoning"] == "[cal-00003]"
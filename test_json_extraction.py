@@ -0,0 +1,145 @@
+
+import os
+import sys
+import re
+import json
+import time
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+import pytest
+from playbook_utils import extract_json_from_text
+from response_parsing import decode_json
+from benchmarks.bench_json_extraction import make_response
+
+SIZES = [10000, 20000, 40000, 80000]
+
+
+def reference_extract_json(text):
+    """The previous extract_json_from_text: restart a brace scan at each '{', keep the first decodable object"""
+    try:
+        return json.loads(text.strip())
+    except json.JSONDecodeError:
+        pass
+    for match in re.findall(r'```json\s*(.*?)\s*```', text, re.DOTALL | re.IGNORECASE):
+        try:
+            return json.loads(match.strip())
+        except json.JSONDecodeError:
+            continue
+    i = 0
+    while i < len(text):
+        if text[i] != '{':
+            i += 1
+            continue
+        brace_count = 1
+        start = i
+        i += 1
+        while i < len(text) and brace_count > 0:
+            if text[i] == '{':
+                brace_count += 1
+            elif text[i] == '}':
+                brace_count -= 1
+            elif text[i] == '"':
+                i += 1
+                while i < len(text) and text[i] != '"':
+                    if text[i] == '\\':
+                        i += 1
+                    i += 1
+            i += 1
+        if brace_count == 0:
+            try:
+                return json.loads(text[start:i])
+            except json.JSONDecodeError:
+                continue
+    return None
+
+
+OPERATIONS = '{"reasoning": "Add one.", "operations": [{"type": "ADD", "content": "Use {rate} / 12"}]}'
+
+# Responses both scanners decode to the same value
+AGREEING = {
+    "bare": OPERATIONS,
+    "array": '[{"id": "str-00001", "tag": "helpful"}]',
+    "fenced": 'Here it is:\n```json\n' + OPERATIONS + '\n```\nDone.',
+    "prose": 'Reasoning with a {placeholder} first.\n' + OPERATIONS + '\nThanks.',
+    "nested": 'Result: {"a": {"b": {"c": "x } \\" {"}}, "d": [{"e": 1}, {"f": {}}]} end',
+    "first_is_largest": 'First {"a": {"b": 1}} then {"c": 2}',
+    "escaped": '{"text": "a \\\\ backslash and \\"quotes\\" with } braces {"}',
+    "placeholders_only": 'Use {rate} and {period} only',
+    "no_json": 'Final answer: 42',
+    "bench_json": make_response(SIZES[0], "json"),
+}
+
+# Responses the linear scanner decodes differently, by design
+DIVERGING = {
+    # Largest object first: the payload wins over an inline example
+    "example_before_payload": (
+        'e.g. {"example": 1}\n' + OPERATIONS,
+        {"example": 1}, json.loads(OPERATIONS)),
+    # An unmatched '{' in the prose no longer hides the payload
+    "stray_brace": (
+        'Use the {formula described above.\n' + OPERATIONS,
+        None, json.loads(OPERATIONS)),
+    # A cut-off payload is closed after its last complete value
+    "truncated": (
+        '{"operations": [{"type": "ADD", "content": "a"}, {"type": "ADD", "con',
+        None, {"operations": [{"type": "ADD", "content": "a"}]}),
+    "trailing_commas": (
+        'Answer: {"bullet_ids": ["str-00001",], "final_answer": "42",}',
+        None, {"bullet_ids": ["str-00001"], "final_answer": "42"}),
+}
+
+
+@pytest.mark.parametrize("name", sorted(AGREEING))
+def test_matches_previous_extraction(name):
+    text = AGREEING[name]
+    assert extract_json_from_text(text) == reference_extract_json(text)
+
+
+@pytest.mark.parametrize("name", sorted(DIVERGING))
+def test_differs_from_previous_extraction_by_design(name):
+    text, previous, current = DIVERGING[name]
+    assert reference_extract_json(text) == previous
+    assert extract_json_from_text(text) == current
+
+
+@pytest.mark.parametrize("variant", ["json", "prose", "stray", "truncated"])
+def test_bench_responses_yield_the_operations(variant):
+    text = make_response(SIZES[0], variant)
+    result, source = decode_json.__wrapped__(text)
+    assert source == {"json": "json", "truncated": "truncated"}.get(variant, "embedded")
+    assert result["operations"] and all(op["type"] == "ADD" for op in result["operations"])
+
+
+@pytest.mark.parametrize("variant", ["json", "prose", "stray", "truncated"])
+def test_decoded_characters_grow_linearly(monkeypatch, variant):
+    """Every candidate handed to json.loads is bounded by a constant number of passes over the text"""
+    loads = json.loads
+    decoded = []
+
+    def counting_loads(text, *args, **kwargs):
+        decoded.append(len(text))
+        return loads(text, *args, **kwargs)
+
+    monkeypatch.setattr(json, "loads", counting_loads)
+    for size in SIZES:
+        text = make_response(size, variant)
+        decoded.clear()
+        decode_json.__wrapped__(text)
+        assert sum(decoded) <= 3 * len(text)
+
+
+def test_time_per_character_stays_flat():
+    def seconds_per_char(text):
+        best = float("inf")
+        for _ in range(5):
+            start = time.perf_counter()
+            decode_json.__wrapped__(text)
+            best = min(best, time.perf_counter() - start)
+        return best / len(text)
+
+    for variant in ["prose", "stray", "truncated"]:
+        small, large = (seconds_per_char(make_response(size, variant)) for size in (SIZES[0], SIZES[-1]))
+        # 8x the text; a quadratic scan would take ~8x longer per character
+        assert large < 3 * small, variant
@@ -0,0 +1,84 @@
+
+import os
+import sys
+import json
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+import pytest
+import ace.ace as ace_module
+import ace.core.generator as generator_module
+import ace.core.reflector as reflector_module
+import ace.core.curator as curator_module
+
+PLAYBOOK = """## STRATEGIES & INSIGHTS
+[str-00001] helpful=2 harmful=0 :: Read the question twice."""
+
+
+class ExactMatch:
+    def answer_is_correct(self, predicted, target):
+        return predicted == target
+
+    def evaluate_accuracy(self, answers, targets):
+        return sum(a == t for a, t in zip(answers, targets)) / len(targets)
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Replace every agent's LLM call. Records call IDs; `curate` maps a curator call ID to its operations"""
+    calls = []
+    curate = {}
+
+    def fake_call(api_client, api_provider, model, prompt, role, call_id, **kwargs):
+        calls.append(call_id)
+        if role == "reflector":
+            return json.dumps({"reasoning": "r", "bullet_tags": []}), {}
+        if role == "curator":
+            return json.dumps({"reasoning": "r", "operations": curate.get(call_id, [])}), {}
+        if call_id.startswith("test_eval_packed"):
+            return json.dumps({"answers": [{"id": i + 1, "final_answer": "A"} for i in range(2)]}), {}
+        return json.dumps({"reasoning": "r", "bullet_ids": [], "final_answer": "A"}), {}
+
+    for module in (generator_module, reflector_module, curator_module):
+        monkeypatch.setattr(module, "timed_llm_call", fake_call)
+    monkeypatch.setattr(ace_module, "initialize_clients", lambda api_provider: (None, None, None))
+    return calls, curate
+
+
+def run_online(tmp_path, **config):
+    ace = ace_module.ACE("openai", "generator", "reflector", "curator", initial_playbook=PLAYBOOK)
+    samples = [{"question": f"Question {i}", "context": "", "target": "A"} for i in range(4)]
+    return ace.run("online", test_samples=samples, data_processor=ExactMatch(), config={
+        "save_dir": str(tmp_path), "task_name": "t", "online_eval_frequency": 2, "test_workers": 1,
+        "quiet": True, **config
+    })
+
+
+def initial_generations(calls):
+    return [call_id for call_id in calls if call_id.endswith("_gen_initial")]
+
+
+def test_window_test_generations_are_reused_for_training(llm, tmp_path):
+    calls, _ = llm
+    results = run_online(tmp_path)
+    assert results["online_test_results"]["accuracy"] == 1.0
+    assert initial_generations(calls) == []
+
+
+def test_generations_are_not_reused_after_the_playbook_changed(llm, tmp_path):
+    calls, curate = llm
+    # The first training step of each window adds a bullet
+    for step in (1, 3):
+        curate[f"online_train_s_{step}"] = [
+            {"type": "ADD", "section": "strategies_and_insights", "content": f"Lesson {step}."}
+        ]
+    run_online(tmp_path)
+    assert initial_generations(calls) == ["online_train_s_2_gen_initial", "online_train_s_4_gen_initial"]
+
+
+def test_packed_test_answers_are_not_reused(llm, tmp_path):
+    calls, _ = llm
+    run_online(tmp_path, eval_pack_size=2, eval_pack_token_budget=10000)
+    assert "test_eval_packed_0_1" in calls
+    assert initial_generations(calls) == [f"online_train_s_{step}_gen_initial" for step in (1, 2, 3, 4)]
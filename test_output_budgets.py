@@ -0,0 +1,138 @@
+
+import os
+import sys
+import json
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+import pytest
+import llm
+from llm import timed_llm_call, configure_output_budgets, OutputBudgets
+
+ANSWER = json.dumps({"reasoning": "r", "bullet_ids": [], "final_answer": "42"})
+
+
+class FakeClient:
+    """OpenAI-style client returning queued (content, finish_reason, seconds) responses on a fake clock"""
+
+    def __init__(self, clock, *responses):
+        self.clock = clock
+        self.responses = list(responses)
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **params):
+        self.requests.append(params)
+        content, finish_reason, seconds = self.responses.pop(0)
+        self.clock.now += seconds
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content), finish_reason=finish_reason)],
+            usage=SimpleNamespace(prompt_tokens=100, completion_tokens=params["max_completion_tokens"])
+        )
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake time in llm that only advances while the fake client answers"""
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(llm, "time", SimpleNamespace(time=lambda: clock.now, sleep=lambda seconds: None))
+    return clock
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    """Calls to metrics.record_llm_call as (call_info, latency, status)"""
+    calls = []
+    monkeypatch.setattr(llm.metrics, "record_llm_call",
+                        lambda role, provider, model, call_info, latency, status="ok":
+                        calls.append((call_info, latency, status)))
+    return calls
+
+
+@pytest.fixture
+def budgets():
+    """Configure output budgets for one test and restore the disabled default afterwards"""
+    yield configure_output_budgets
+    configure_output_budgets()
+
+
+def test_no_budget_is_learned_before_min_samples():
+    output_budgets = OutputBudgets(enabled=True, min_samples=3, min_tokens=10)
+    for tokens in (100, 200):
+        output_budgets.observe("generator", tokens)
+    assert output_budgets.learned("generator") is None
+    assert output_budgets.budget("generator", 1000) == 1000
+    output_budgets.observe("generator", 150)
+    assert output_budgets.learned("generator") == 240
+
+
+def test_budget_is_p99_plus_margin():
+    output_budgets = OutputBudgets(enabled=True, margin=0.5, min_samples=1, min_tokens=10)
+    for tokens in range(1, 201):
+        output_budgets.observe("curator", tokens)
+    # The 198th of 200 sorted lengths
+    assert output_budgets.learned("curator") == 297
+    # Roles are learned separately
+    assert output_budgets.learned("generator") is None
+
+
+def test_budget_is_clamped_to_min_tokens_and_the_cap():
+    output_budgets = OutputBudgets(enabled=True, margin=0.2, min_samples=1, min_tokens=256)
+    output_budgets.observe("generator", 10)
+    assert output_budgets.budget("generator", 1000) == 256
+    output_budgets.observe("generator", 5000)
+    assert output_budgets.learned("generator") == 6000
+    assert output_budgets.budget("generator", 1000) == 1000
+
+
+def test_disabled_budgets_use_the_cap():
+    output_budgets = OutputBudgets(enabled=False, min_samples=1, min_tokens=10)
+    output_budgets.observe("generator", 100)
+    assert output_budgets.budget("generator", 1000) == 1000
+    assert output_budgets.summary(1000) == {"generator": {"budget": 1000, "observed": 1, "truncation_retries": 0}}
+
+
+def test_old_observations_leave_the_window():
+    output_budgets = OutputBudgets(enabled=True, margin=0.0, window=2, min_samples=2, min_tokens=10)
+    for tokens in (900, 100, 100):
+        output_budgets.observe("generator", tokens)
+    assert output_budgets.learned("generator") == 100
+    assert output_budgets.summary(1000)["generator"]["observed"] == 2
+
+
+def generate(client, max_tokens=1000):
+    return timed_llm_call(client, "openai", "model", "Q", "generator", "train_gen_1",
+                          max_tokens=max_tokens, sleep_seconds=0)
+
+
+def test_budget_retry_records_each_attempt_once(clock, recorded, budgets):
+    output_budgets = budgets(enabled=True, margin=0.2, min_samples=1, min_tokens=10)
+    output_budgets.observe("generator", 100)
+    client = FakeClient(clock, ('{"reasoning": "cut', "length", 5.0), (ANSWER, "stop", 7.0))
+    response, call_info = generate(client)
+
+    assert response == ANSWER
+    assert [request["max_completion_tokens"] for request in client.requests] == [120, 1000]
+    # One record per request, each timed from its own start
+    assert [(info["max_tokens"], latency, status) for info, latency, status in recorded] == [
+        (120, 5.0, "ok"), (1000, 7.0, "ok")
+    ]
+
+
+def test_calls_teach_the_budget_and_count_truncation_retries(clock, recorded, budgets):
+    output_budgets = budgets(enabled=True, margin=0.0, min_samples=1, min_tokens=10)
+    # The fake client's responses use the whole max_tokens they were given
+    generate(FakeClient(clock, (ANSWER, "stop", 1.0)), max_tokens=300)
+    assert output_budgets.budget("generator", 1000) == 300
+
+    generate(FakeClient(clock, ('{"reasoning": "cut', "length", 1.0), (ANSWER, "stop", 1.0)))
+    assert output_budgets.summary(1000)["generator"] == {"budget": 1000, "observed": 3, "truncation_retries": 1}
+
+
+def test_cap_is_not_retried(clock, recorded, budgets):
+    budgets(enabled=True, min_samples=1, min_tokens=10)
+    client = FakeClient(clock, ('{"reasoning": "cut', "length", 1.0))
+    generate(client, max_tokens=50)
+    assert [request["max_completion_tokens"] for request in client.requests] == [50]
@@ -0,0 +1,169 @@
+
+import os
+import sys
+import json
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+import pytest
+import ace.core.generator as generator_module
+from ace.core.generator import Generator
+from utils import pack_test_samples, evaluate_packed_test_samples, evaluate_test_set, count_tokens
+
+PLAYBOOK = """## STRATEGIES & INSIGHTS
+[str-00001] helpful=2 harmful=0 :: Read the question twice."""
+
+PACKED_CALL_INFO = {"prompt_num_tokens": 900, "response_num_tokens": 300}
+SINGLE_CALL_INFO = {"prompt_num_tokens": 400, "response_num_tokens": 100}
+
+
+class ExactMatch:
+    def answer_is_correct(self, predicted, target):
+        return predicted == target
+
+    def evaluate_accuracy(self, answers, targets):
+        return sum(a == t for a, t in zip(answers, targets)) / len(targets)
+
+
+def make_samples(n, context="Some context."):
+    return [{"question": f"Question {i}?", "context": context, "target": f"answer {i}"} for i in range(n)]
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Replace the LLM call: packed prompts get the next canned response, single prompts answer correctly"""
+    calls = {"packed": 0, "single": []}
+    packed_responses = []
+
+    def fake_call(api_client, api_provider, model, prompt, role, call_id, **kwargs):
+        if call_id.startswith("test_eval_packed"):
+            calls["packed"] += 1
+            response = packed_responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response, dict(PACKED_CALL_INFO)
+        index = int(call_id.rsplit("_", 1)[1])
+        calls["single"].append(index)
+        return json.dumps({"reasoning": "r", "bullet_ids": [], "final_answer": f"answer {index}"}), dict(SINGLE_CALL_INFO)
+
+    monkeypatch.setattr(generator_module, "timed_llm_call", fake_call)
+    return calls, packed_responses
+
+
+def packed(*answers):
+    return json.dumps({"answers": list(answers)})
+
+
+def evaluate(indices, samples):
+    return evaluate_packed_test_samples(indices, samples, Generator(None, "openai", "model"), PLAYBOOK,
+                                        1000, None, True, ExactMatch())
+
+
+def test_pack_size_bounds_packs():
+    assert pack_test_samples(make_samples(7), 3, 10000) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert pack_test_samples(make_samples(2), 1, 10000) == [[0], [1]]
+
+
+def test_token_budget_splits_packs():
+    samples = make_samples(4)
+    tokens = count_tokens(samples[0]["question"]) + count_tokens(samples[0]["context"])
+    assert pack_test_samples(samples, 10, 2 * tokens) == [[0, 1], [2, 3]]
+
+
+def test_oversize_context_gets_its_own_pack():
+    samples = make_samples(4)
+    samples[1]["context"] = "A very long filing excerpt. " * 200
+    assert pack_test_samples(samples, 10, 100) == [[0], [1], [2, 3]]
+
+
+def test_packed_answers_are_attributed_by_id(llm):
+    calls, packed_responses = llm
+    samples = make_samples(3)
+    packed_responses.append(packed(
+        {"id": 2, "reasoning": "r", "bullet_ids": ["str-00001"], "final_answer": "answer 1"},
+        {"id": 1, "reasoning": "r", "bullet_ids": [], "final_answer": "answer 0"},
+        {"id": 3, "reasoning": "r", "bullet_ids": [], "final_answer": "wrong"},
+    ))
+    outputs, fell_back = evaluate([0, 1, 2], samples)
+
+    assert not fell_back and calls["single"] == []
+    results = [result for result, error in outputs]
+    assert [result["index"] for result in results] == [0, 1, 2]
+    assert [result["is_correct"] for result in results] == [True, True, False]
+    assert results[1]["bullet_ids"] == ["str-00001"]
+    # The packed call's tokens are split evenly over its samples
+    assert [result["num_tokens"] for result in results] == [400, 400, 400]
+    assert sum(result["num_tokens"] for result in results) == 1200
+
+
+@pytest.mark.parametrize("response", [
+    # Missing answer
+    packed({"id": 1, "final_answer": "answer 0"}, {"id": 2, "final_answer": "answer 1"}),
+    # Misnumbered answers
+    packed({"id": 1, "final_answer": "answer 0"}, {"id": 1, "final_answer": "answer 1"},
+           {"id": 3, "final_answer": "answer 2"}),
+    packed({"id": 1, "final_answer": "answer 0"}, {"id": 2, "final_answer": "answer 1"},
+           {"id": 4, "final_answer": "answer 2"}),
+    # Answer without a final_answer
+    packed({"id": 1, "final_answer": "answer 0"}, {"id": 2, "reasoning": "r"},
+           {"id": 3, "final_answer": "answer 2"}),
+    "The answers are 0, 1 and 2.",
+    RuntimeError("rate limited"),
+])
+def test_bad_pack_falls_back_to_single_requests(llm, response):
+    calls, packed_responses = llm
+    packed_responses.append(response)
+    outputs, fell_back = evaluate([0, 1, 2], make_samples(3))
+
+    assert fell_back
+    assert sorted(calls["single"]) == [0, 1, 2]
+    results = [result for result, error in outputs]
+    assert all(result["is_correct"] for result in results)
+    # Single requests report their own tokens
+    assert [result["num_tokens"] for result in results] == [500, 500, 500]
+
+
+def test_answers_without_ids_keep_question_order(llm):
+    _, packed_responses = llm
+    packed_responses.append(packed({"final_answer": "answer 0"}, {"final_answer": "answer 1"}))
+    outputs, fell_back = evaluate([0, 1], make_samples(2))
+    assert not fell_back
+    assert [result["final_answer"] for result, _ in outputs] == ["answer 0", "answer 1"]
+
+
+def test_evaluate_test_set_reports_packing(llm):
+    calls, packed_responses = llm
+    samples = make_samples(5)
+    samples[2]["context"] = "A very long filing excerpt. " * 200
+    packed_responses.extend([
+        packed({"id": 1, "final_answer": "answer 0"}, {"id": 2, "final_answer": "answer 1"}),
+        packed({"id": 1, "final_answer": "answer 3"}),
+    ])
+    results, _ = evaluate_test_set(ExactMatch(), Generator(None, "openai", "model"), PLAYBOOK, samples,
+                                   max_tokens=1000, max_workers=1, use_json_mode=True,
+                                   pack_size=2, pack_token_budget=100)
+
+    # [0, 1] packed, [2] alone (oversize), [3, 4] packed but the response is missing an answer
+    assert results["packing"] == {"requests": 3, "packed_requests": 2, "fallbacks": 1}
+    assert sorted(calls["single"]) == [2, 3, 4]
+    assert results["total"] == 5 and results["correct"] == 5
+
+
+def test_only_single_request_generations_are_recorded(llm):
+    # Packed answers were not produced by the single-sample prompt, so they are not reusable
+    _, packed_responses = llm
+    samples = make_samples(5)
+    samples[2]["context"] = "A very long filing excerpt. " * 200
+    packed_responses.extend([
+        packed({"id": 1, "final_answer": "answer 0"}, {"id": 2, "final_answer": "answer 1"}),
+        "not json",
+    ])
+    generations = {}
+    evaluate_test_set(ExactMatch(), Generator(None, "openai", "model"), PLAYBOOK, samples,
+                      max_tokens=1000, max_workers=1, use_json_mode=True, generations=generations,
+                      pack_size=2, pack_token_budget=100)
+
+    # [0, 1] answered by a packed call; [2] alone; [3, 4] fell back to single requests
+    assert sorted(generations) == [2, 3, 4]
+    assert json.loads(generations[3]["response"])["final_answer"] == "answer 3"
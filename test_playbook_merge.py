@@ -0,0 +1,130 @@
+
+import os
+import sys
+import time
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from playbook_utils import (
+    merge_bullet_tags, apply_bullet_count_deltas, merge_curator_operations,
+    update_bullet_counts, parse_playbook_line
+)
+
+PLAYBOOK = """## STRATEGIES & INSIGHTS
+[str-00001] helpful=2 harmful=0 :: Read the question twice.
+[str-00002] helpful=0 harmful=1 :: Guess when unsure.
+
+## FORMULAS & CALCULATIONS
+[cal-00003] helpful=5 harmful=0 :: Interest = principal * rate * time."""
+
+TAG_LISTS = [
+    [{"id": "str-00001", "tag": "helpful"}, {"id": "str-00002", "tag": "harmful"}],
+    [{"id": "str-00001", "tag": "helpful"}, {"id": "cal-00003", "tag": "neutral"}],
+    [{"id": "cal-00003", "tag": "helpful"}, {"id": "str-00002", "tag": "harmful"}],
+    [{"id": "str-00001", "tag": "harmful"}],
+]
+
+OPERATION_LISTS = [
+    [{"type": "ADD", "section": "formulas_and_calculations", "content": "Annualize monthly rates."}],
+    [{"type": "ADD", "section": "Formulas & Calculations", "content": "annualize  monthly rates."},
+     {"type": "ADD", "section": "strategies_and_insights", "content": "Check the units."}],
+    [{"type": "ADD", "section": "strategies_and_insights", "content": "Check the units."}],
+]
+
+
+def counts(playbook_text):
+    """Bullet ID -> (helpful, harmful)"""
+    parsed = (parse_playbook_line(line) for line in playbook_text.split('\n'))
+    return {bullet['id']: (bullet['helpful'], bullet['harmful']) for bullet in parsed if bullet}
+
+
+def complete_in_order(values, finish_order):
+    """Collect values through executor.map while the calls finish in finish_order"""
+    delays = {index: 0.02 * rank for rank, index in enumerate(finish_order)}
+    with ThreadPoolExecutor(max_workers=len(values)) as executor:
+        return list(executor.map(
+            lambda index: time.sleep(delays[index]) or values[index], range(len(values))
+        ))
+
+
+def test_merge_bullet_tags_is_order_independent():
+    expected = merge_bullet_tags(TAG_LISTS)
+    assert expected == {
+        "str-00001": {"helpful": 2, "harmful": 1},
+        "str-00002": {"helpful": 0, "harmful": 2},
+        "cal-00003": {"helpful": 1, "harmful": 0},
+    }
+    for permutation in itertools.permutations(TAG_LISTS):
+        assert merge_bullet_tags(permutation) == expected
+
+
+def test_merge_bullet_tags_counts_each_reflection_once_per_bullet():
+    # The last tag of a bullet within one reflection wins, as in update_bullet_counts
+    deltas = merge_bullet_tags([[{"id": "str-00001", "tag": "helpful"},
+                                 {"id": "str-00001", "tag": "harmful"}]])
+    assert deltas == {"str-00001": {"helpful": 0, "harmful": 1}}
+
+
+def test_apply_bullet_count_deltas_matches_sequential_updates():
+    merged = counts(apply_bullet_count_deltas(PLAYBOOK, merge_bullet_tags(TAG_LISTS)))
+    for permutation in itertools.permutations(TAG_LISTS):
+        playbook = PLAYBOOK
+        for bullet_tags in permutation:
+            playbook = update_bullet_counts(playbook, bullet_tags)
+        assert counts(playbook) == merged
+    assert merged == {"str-00001": (4, 1), "str-00002": (0, 3), "cal-00003": (6, 0)}
+
+
+def test_apply_bullet_count_deltas_keeps_other_lines():
+    updated = apply_bullet_count_deltas(PLAYBOOK, {"missing-00009": {"helpful": 1, "harmful": 0}})
+    assert updated == PLAYBOOK
+    assert apply_bullet_count_deltas(PLAYBOOK, {}) == PLAYBOOK
+
+
+def test_merged_counts_do_not_depend_on_completion_order():
+    expected = counts(apply_bullet_count_deltas(PLAYBOOK, merge_bullet_tags(TAG_LISTS)))
+    for finish_order in ([0, 1, 2, 3], [3, 2, 1, 0], [2, 0, 3, 1]):
+        tag_lists = complete_in_order(TAG_LISTS, finish_order)
+        assert counts(apply_bullet_count_deltas(PLAYBOOK, merge_bullet_tags(tag_lists))) == expected
+
+
+def test_merged_operations_do_not_depend_on_completion_order():
+    expected = merge_curator_operations(OPERATION_LISTS)
+    for finish_order in ([0, 1, 2], [2, 1, 0], [1, 2, 0]):
+        assert merge_curator_operations(complete_in_order(OPERATION_LISTS, finish_order)) == expected
+
+
+def test_duplicate_adds_collapse_into_the_first_listed():
+    merged = merge_curator_operations(OPERATION_LISTS)
+    # Section names are normalized and content compared case and whitespace insensitively
+    assert merged == [
+        {"type": "ADD", "section": "formulas_and_calculations", "content": "Annualize monthly rates."},
+        {"type": "ADD", "section": "strategies_and_insights", "content": "Check the units."},
+    ]
+    # Listing order decides which spelling is kept; the set of bullets is the same
+    reordered = merge_curator_operations(OPERATION_LISTS[::-1])
+    assert reordered[0] == {"type": "ADD", "section": "strategies_and_insights", "content": "Check the units."}
+    assert reordered[1]["section"] == "Formulas & Calculations"
+
+
+def test_adds_in_different_sections_are_kept():
+    operations = [[{"type": "ADD", "section": "general", "content": "Check the units."}],
+                  [{"type": "ADD", "section": "strategies_and_insights", "content": "Check the units."}]]
+    assert len(merge_curator_operations(operations)) == 2
+
+
+def test_other_operations_deduplicate_by_full_content():
+    update = {"type": "UPDATE", "bullet_id": "str-00002", "content": "Never guess."}
+    variant = {"type": "UPDATE", "bullet_id": "str-00002", "content": "never guess."}
+    merged = merge_curator_operations([[update], [dict(reversed(list(update.items())))], [variant], None])
+    assert merged == [update, variant]
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: ok")
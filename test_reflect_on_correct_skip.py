@@ -0,0 +1,111 @@
+
+import os
+import sys
+import json
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+import pytest
+import ace.ace as ace_module
+import ace.core.generator as generator_module
+import ace.core.reflector as reflector_module
+import ace.core.curator as curator_module
+from playbook_utils import bullets_consistently_helpful
+
+PLAYBOOK = """## STRATEGIES & INSIGHTS
+[str-00001] helpful=3 harmful=0 :: Read the question twice.
+[str-00002] helpful=5 harmful=1 :: Round at the end."""
+
+
+class ExactMatch:
+    def answer_is_correct(self, predicted, target):
+        return predicted == target
+
+
+def test_consistently_helpful_requires_every_cited_bullet():
+    assert bullets_consistently_helpful(PLAYBOOK, ["str-00001"], 3)
+    assert not bullets_consistently_helpful(PLAYBOOK, ["str-00001"], 4)
+    # Harmful tags, unknown bullets and citing nothing all make a sample ineligible
+    assert not bullets_consistently_helpful(PLAYBOOK, ["str-00001", "str-00002"], 3)
+    assert not bullets_consistently_helpful(PLAYBOOK, ["str-00009"], 0)
+    assert not bullets_consistently_helpful(PLAYBOOK, [], 0)
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Replace every agent's LLM call. The generator answers correctly citing `cited`; the reflector tags `tags`"""
+    state = {"calls": [], "cited": ["str-00001"], "tags": [{"id": "str-00001", "tag": "helpful"}]}
+
+    def fake_call(api_client, api_provider, model, prompt, role, call_id, **kwargs):
+        state["calls"].append(call_id)
+        if role == "reflector":
+            return json.dumps({"reasoning": "r", "bullet_tags": state["tags"]}), {
+                "prompt_num_tokens": 100, "response_num_tokens": 20
+            }
+        if role == "curator":
+            return json.dumps({"reasoning": "r", "operations": []}), {}
+        return json.dumps({"reasoning": "r", "bullet_ids": state["cited"], "final_answer": "right"}), {}
+
+    for module in (generator_module, reflector_module, curator_module):
+        monkeypatch.setattr(module, "timed_llm_call", fake_call)
+    monkeypatch.setattr(ace_module, "initialize_clients", lambda api_provider: (None, None, None))
+    return state
+
+
+@pytest.fixture
+def reflect(llm, tmp_path):
+    """Run one correct sample through generation and reflection with the given skip draw"""
+    ace = ace_module.ACE("openai", "generator", "reflector", "curator", initial_playbook=PLAYBOOK)
+    config_params = ace._extract_config_params({"json_mode": True, "reflect_on_correct_skip_rate": 0.5,
+                                                "skip_min_helpful": 3})
+
+    def run(skip_draw, step=1):
+        return ace._generate_and_reflect(
+            {"question": "Question", "context": "", "target": "right"}, ExactMatch(), ace.playbook,
+            f"step_{step}", 1, step, str(tmp_path / "usage.jsonl"), str(tmp_path), config_params,
+            skip_draw=skip_draw
+        )
+
+    return ace, run
+
+
+def test_eligible_sample_below_the_skip_rate_skips_the_reflector(llm, reflect):
+    ace, run = reflect
+    reflected = run(skip_draw=0.2)
+    assert "step_1_reflect_on_correct" not in llm["calls"]
+    # The cited bullet is tagged helpful directly
+    assert reflected["bullet_tags"] == [[{"id": "str-00001", "tag": "helpful"}]]
+    assert "[str-00001] helpful=4 harmful=0" in reflected["playbook"]
+    assert ace.reflection_skip_stats["skipped"] == 1 and ace.reflection_skip_stats["eligible"] == 1
+
+
+def test_eligible_sample_above_the_skip_rate_audits_the_rule(llm, reflect):
+    ace, run = reflect
+    run(skip_draw=0.7)
+    llm["tags"] = [{"id": "str-00001", "tag": "neutral"}]
+    run(skip_draw=0.9, step=2)
+    assert ["step_1_reflect_on_correct", "step_2_reflect_on_correct"] == [
+        call_id for call_id in llm["calls"] if call_id.endswith("_reflect_on_correct")
+    ]
+    stats = ace.reflection_skip_stats
+    assert (stats["eligible"], stats["skipped"], stats["audited"], stats["audit_agreed"]) == (2, 0, 2, 1)
+
+
+def test_ineligible_sample_is_always_reflected_on(llm, reflect):
+    ace, run = reflect
+    llm["cited"] = ["str-00001", "str-00002"]
+    run(skip_draw=0.0)
+    assert "step_1_reflect_on_correct" in llm["calls"]
+    assert ace.reflection_skip_stats["eligible"] == 0 and ace.reflection_skip_stats["audited"] == 0
+
+
+def test_summary_prices_skipped_calls_at_the_mean_reflection(llm, reflect):
+    ace, run = reflect
+    run(skip_draw=0.7)
+    run(skip_draw=0.1, step=2)
+    run(skip_draw=0.3, step=3)
+    summary = ace._reflection_skip_summary()
+    assert summary["skipped"] == 2 and summary["reflect_on_correct_calls"] == 1
+    assert summary["estimated_tokens_saved"] == 2 * 120
+    assert summary["audit_agreement"] == 1.0
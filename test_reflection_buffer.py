@@ -0,0 +1,103 @@
+
+import os
+import sys
+import json
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+import pytest
+import ace.ace as ace_module
+import ace.core.generator as generator_module
+import ace.core.reflector as reflector_module
+import ace.core.curator as curator_module
+from ace.core.curator import ReflectionBuffer, Curator
+
+PLAYBOOK = """## STRATEGIES & INSIGHTS
+[str-00001] helpful=2 harmful=0 :: Read the question twice."""
+
+
+class ExactMatch:
+    def answer_is_correct(self, predicted, target):
+        return predicted == target
+
+
+def test_buffer_keeps_non_empty_reflections_until_drained():
+    buffer = ReflectionBuffer()
+    buffer.add(1, "Check the units.", "Q1", ["str-00001"])
+    buffer.add(2, "(empty)", "Q2")
+    buffer.add(3, "", "Q3")
+    buffer.add(4, "Annualize rates.", "Q4")
+    assert len(buffer) == 2
+
+    entries = buffer.drain()
+    assert [(entry["step"], entry["bullet_ids"]) for entry in entries] == [(1, ["str-00001"]), (4, [])]
+    assert len(buffer) == 0 and buffer.drain() == []
+
+
+def test_buffer_round_trips_through_checkpoints():
+    buffer = ReflectionBuffer()
+    buffer.add(1, "Check the units.", "Q1", ["str-00001"])
+    saved = json.loads(json.dumps(buffer.to_list()))
+
+    restored = ReflectionBuffer()
+    restored.load_list(saved)
+    assert restored.drain() == buffer.drain()
+    restored.load_list(None)
+    assert len(restored) == 0
+
+
+def test_single_reflection_is_curated_as_is():
+    entries = [{"step": 3, "reflection": "Check the units.", "question_context": "Q3", "bullet_ids": []}]
+    assert Curator.format_reflection_batch(entries) == ("Check the units.", "Q3")
+
+
+def test_batched_reflections_keep_their_question_contexts():
+    entries = [
+        {"step": 1, "reflection": "Check the units.", "question_context": "Q1", "bullet_ids": []},
+        {"step": 2, "reflection": "Annualize rates.", "question_context": "Q2", "bullet_ids": []},
+    ]
+    recent_reflection, question_context = Curator.format_reflection_batch(entries)
+    assert recent_reflection.startswith("2 reflections were collected")
+    assert recent_reflection.index("Check the units.") < recent_reflection.index("Question Context 1:\nQ1") \
+        < recent_reflection.index("Annualize rates.") < recent_reflection.index("Question Context 2:\nQ2")
+    assert question_context == "(Included with each reflection above.)"
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Replace every agent's LLM call; reflections name their call. Records (role, call_id, prompt)"""
+    calls = []
+
+    def fake_call(api_client, api_provider, model, prompt, role, call_id, **kwargs):
+        calls.append((role, call_id, prompt))
+        if role == "reflector":
+            return json.dumps({"reasoning": f"Lesson from {call_id}", "key_insight": f"Insight of {call_id}",
+                               "bullet_tags": []}), {}
+        if role == "curator":
+            return json.dumps({"reasoning": "r", "operations": []}), {}
+        return json.dumps({"reasoning": "r", "bullet_ids": [], "final_answer": "wrong"}), {}
+
+    for module in (generator_module, reflector_module, curator_module):
+        monkeypatch.setattr(module, "timed_llm_call", fake_call)
+    monkeypatch.setattr(ace_module, "initialize_clients", lambda api_provider: (None, None, None))
+    return calls
+
+
+def test_curator_runs_once_on_all_buffered_reflections(llm, tmp_path):
+    ace = ace_module.ACE("openai", "generator", "reflector", "curator", initial_playbook=PLAYBOOK)
+    config_params = ace._extract_config_params({"curator_frequency": 2, "max_num_rounds": 1,
+                                                "post_curate_generation": "off"})
+    for step in (1, 2):
+        ace._train_single_sample(
+            {"question": f"Question {step}", "context": f"Filing excerpt {step}", "target": "right"}, ExactMatch(),
+            f"step_{step}", 1, step, str(tmp_path / "usage.jsonl"), str(tmp_path), config_params, 2
+        )
+
+    curator_prompts = [prompt for role, _, prompt in llm if role == "curator"]
+    assert len(curator_prompts) == 1
+    assert "2 reflections were collected" in curator_prompts[0]
+    for step in (1, 2):
+        assert f"Lesson from step_{step}_round_0" in curator_prompts[0]
+        assert f"Question Context {step}:\nFiling excerpt {step}" in curator_prompts[0]
+    assert len(ace.reflection_buffer) == 0
@@ -0,0 +1,123 @@
+
+import os
+import sys
+import json
+import copy
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+import pytest
+import ace.ace as ace_module
+import ace.core.generator as generator_module
+import ace.core.reflector as reflector_module
+import ace.core.curator as curator_module
+from ace.core.generator import Generator
+from llm import timed_llm_call
+
+PLAYBOOK = """## STRATEGIES & INSIGHTS
+[str-00001] helpful=2 harmful=0 :: Read the question twice.
+
+## FORMULAS & CALCULATIONS
+[cal-00002] helpful=5 harmful=0 :: Interest = principal * rate * time."""
+
+
+class ExactMatch:
+    def answer_is_correct(self, predicted, target):
+        return predicted == target
+
+
+def answer(final_answer, bullet_ids=()):
+    return json.dumps({"reasoning": "r", "bullet_ids": list(bullet_ids), "final_answer": final_answer})
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Replace every agent's LLM call. Generators answer from `answers` in order; records each call"""
+    state = {"calls": [], "answers": []}
+
+    def fake_call(api_client, api_provider, model, prompt, role, call_id, **kwargs):
+        messages = kwargs.get("messages")
+        state["calls"].append({"role": role, "call_id": call_id, "prompt": prompt,
+                               "messages": copy.deepcopy(messages) if messages is not None else None})
+        if role == "reflector":
+            return json.dumps({"reasoning": f"Reflection {call_id}", "bullet_tags": []}), {}
+        if role == "curator":
+            return json.dumps({"reasoning": "r", "operations": []}), {}
+        return state["answers"].pop(0), {"prompt_num_tokens": 500, "cached_prompt_tokens": 400 if messages else 0}
+
+    for module in (generator_module, reflector_module, curator_module):
+        monkeypatch.setattr(module, "timed_llm_call", fake_call)
+    monkeypatch.setattr(ace_module, "initialize_clients", lambda api_provider: (None, None, None))
+    return state
+
+
+def test_followup_resends_the_conversation_in_aliases(llm):
+    generator = Generator(None, "openai", "model", playbook_format="compact")
+    llm["answers"] += [answer("41", ["b1"]), answer("42", ["b2"])]
+    response, _, _ = generator.generate("Q", PLAYBOOK, context="C", use_json_mode=True)
+    session = generator.start_session("Q", PLAYBOOK, "C", response)
+
+    # The session starts from the initial prompt and the answer as the model wrote it
+    initial = llm["calls"][0]
+    assert session["messages"] == [
+        {"role": "user", "content": initial["prompt"]},
+        {"role": "assistant", "content": answer("41", ["b1"])},
+    ]
+
+    followup, bullet_ids, _ = generator.generate_followup(session, "Use the formula.", use_json_mode=True,
+                                                          call_id="gen_followup_1")
+    assert llm["calls"][1]["messages"] == session["messages"][:2]
+    assert "Use the formula." in llm["calls"][1]["prompt"]
+    assert bullet_ids == ["cal-00002"] and json.loads(followup)["final_answer"] == "42"
+    # The new turns are appended for the next follow-up
+    assert [message["role"] for message in session["messages"]] == ["user", "assistant", "user", "assistant"]
+    assert session["messages"][3]["content"] == answer("42", ["b2"])
+
+
+class FakeClient:
+    """OpenAI-style client reporting cached prompt tokens; records each request"""
+
+    def __init__(self):
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **params):
+        self.requests.append(params)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=answer("42")), finish_reason="stop")],
+            usage=SimpleNamespace(prompt_tokens=500, completion_tokens=20,
+                                  prompt_tokens_details=SimpleNamespace(cached_tokens=384))
+        )
+
+
+def test_session_turns_precede_the_new_prompt():
+    client = FakeClient()
+    history = [{"role": "user", "content": "Q"}, {"role": "assistant", "content": "A"}]
+    _, call_info = timed_llm_call(client, "openai", "model", "Reflect.", "generator", "gen_followup",
+                                  max_tokens=50, sleep_seconds=0, messages=history)
+    assert client.requests[0]["messages"] == history + [{"role": "user", "content": "Reflect."}]
+    assert call_info["history_messages"] == 2 and call_info["cached_prompt_tokens"] == 384
+    # The caller's history is not modified
+    assert len(history) == 2
+
+
+def test_reflection_rounds_continue_one_session(llm, tmp_path):
+    ace = ace_module.ACE("openai", "generator", "reflector", "curator", initial_playbook=PLAYBOOK)
+    config_params = ace._extract_config_params({"json_mode": True, "reflection_session": True,
+                                                "max_num_rounds": 2, "post_curate_generation": "off"})
+    llm["answers"] += [answer("40"), answer("41"), answer("42")]
+    ace._train_single_sample(
+        {"question": "Question", "context": "", "target": "42"}, ExactMatch(), "step_1", 1, 1,
+        str(tmp_path / "usage.jsonl"), str(tmp_path), config_params, 1
+    )
+
+    regenerations = [call for call in llm["calls"] if "_post_reflect_round_" in call["call_id"]]
+    assert [len(call["messages"]) for call in regenerations] == [2, 4]
+    assert "Reflection step_1_round_0" in regenerations[0]["prompt"]
+    assert regenerations[1]["messages"][3]["content"] == answer("41")
+    assert ace.regeneration_token_stats == {
+        "0": {"calls": 1, "prompt_tokens": 500, "cached_prompt_tokens": 400},
+        "1": {"calls": 1, "prompt_tokens": 500, "cached_prompt_tokens": 400},
+    }
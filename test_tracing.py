@@ -0,0 +1,41 @@
+
+import os
+import sys
+import json
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+import pytest
+from tracing import Tracer
+
+
+def record(tracer, count):
+    for i in range(count):
+        with tracer.span(f"step_{i}", "train", step=i):
+            pass
+
+
+def test_only_the_most_recent_spans_are_kept(tmp_path):
+    tracer = Tracer(path=str(tmp_path / "trace.json"), max_spans=3)
+    record(tracer, 5)
+    trace = json.load(open(tracer.export()))
+
+    spans = [event["name"] for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert spans == ["step_2", "step_3", "step_4"]
+    assert trace["otherData"] == {"dropped_spans": 2}
+
+
+def test_otlp_export_reports_dropped_spans(tmp_path):
+    tracer = Tracer(path=str(tmp_path / "trace.otlp.json"), fmt="otlp", max_spans=2)
+    record(tracer, 3)
+    resource_spans = json.load(open(tracer.export()))["resourceSpans"][0]
+
+    assert {"key": "ace.dropped_spans", "value": {"intValue": "1"}} in resource_spans["resource"]["attributes"]
+    assert [span["name"] for span in resource_spans["scopeSpans"][0]["spans"]] == ["step_1", "step_2"]
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer()
+    record(tracer, 3)
+    assert len(tracer._spans) == 0 and tracer.export() is None
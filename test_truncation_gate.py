@@ -0,0 +1,66 @@
+
+import os
+import sys
+import json
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+import pytest
+from llm import configure_truncation_recovery
+from ace.core.curator import Curator
+from ace.core.reflector import Reflector
+
+OPERATIONS = [
+    {"type": "ADD", "section": "formulas_and_calculations", "content": "Annualize monthly rates."},
+    {"type": "ADD", "section": "strategies_and_insights", "content": "Check the units."},
+]
+CURATOR_RESPONSE = json.dumps({"reasoning": "Two new bullets.", "operations": OPERATIONS})
+# Cut off inside the second operation
+TRUNCATED_CURATOR_RESPONSE = CURATOR_RESPONSE[:CURATOR_RESPONSE.index("Check the")]
+
+BULLET_TAGS = [{"id": "str-00001", "tag": "helpful"}, {"id": "str-00002", "tag": "harmful"}]
+REFLECTOR_RESPONSE = json.dumps({"bullet_tags": BULLET_TAGS, "reasoning": "The first bullet helped."})
+
+
+@pytest.fixture
+def recovery():
+    """Configure truncation recovery for one test and disable it afterwards"""
+    yield configure_truncation_recovery
+    configure_truncation_recovery(0)
+
+
+def parse_operations(response):
+    return Curator(None, "openai", "model").parse_operations(response, current_step=0)
+
+
+def extract_bullet_tags(response):
+    return Reflector(None, "openai", "model")._extract_bullet_tags(response, use_json_mode=True)
+
+
+def test_complete_curator_response_is_applied():
+    assert parse_operations(CURATOR_RESPONSE) == OPERATIONS
+
+
+def test_truncated_curator_response_is_rejected_without_recovery(recovery):
+    recovery(0)
+    assert parse_operations(TRUNCATED_CURATOR_RESPONSE) is None
+
+
+def test_truncated_curator_response_is_salvaged_with_recovery(recovery):
+    recovery(1)
+    assert parse_operations(TRUNCATED_CURATOR_RESPONSE) == OPERATIONS[:1]
+
+
+def test_reflector_keeps_a_complete_array_without_recovery(recovery):
+    recovery(0)
+    # Cut off in the reasoning written after the full bullet_tags array
+    assert extract_bullet_tags(REFLECTOR_RESPONSE[:-10]) == BULLET_TAGS
+
+
+def test_reflector_drops_a_cut_off_array_without_recovery(recovery):
+    recovery(0)
+    truncated = REFLECTOR_RESPONSE[:REFLECTOR_RESPONSE.index("str-00002")]
+    assert extract_bullet_tags(truncated) == []
+    recovery(1)
+    assert extract_bullet_tags(truncated) == BULLET_TAGS[:1]
@@ -0,0 +1,131 @@
+
+import os
+import sys
+import json
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+import pytest
+from llm import timed_llm_call, configure_truncation_recovery, CONTINUATION_PROMPT
+from response_parsing import parse_curator_response
+
+OPERATION_1 = {"type": "ADD", "section": "formulas_and_calculations", "content": "Annualize monthly rates."}
+OPERATION_2 = {"type": "ADD", "section": "strategies_and_insights", "content": "Check the units."}
+PROMPT = "Curate the playbook."
+
+
+class FakeClient:
+    """OpenAI-style client returning queued (content, finish_reason) responses; records each request"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **params):
+        self.requests.append(params)
+        content, finish_reason = self.responses.pop(0)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content), finish_reason=finish_reason)],
+            usage=SimpleNamespace(prompt_tokens=100, completion_tokens=len(content) // 4)
+        )
+
+
+@pytest.fixture
+def recovery():
+    """Configure truncation recovery for one test and disable it afterwards"""
+    yield configure_truncation_recovery
+    configure_truncation_recovery(0)
+
+
+def curate(client):
+    return timed_llm_call(client, "openai", "model", PROMPT, "curator", "train_curate_1",
+                          max_tokens=50, sleep_seconds=0, use_json_mode=True)
+
+
+def test_cut_off_empty_response_is_retried_without_recovery(recovery):
+    recovery(0)
+    client = FakeClient(("", "length"), (json.dumps({"operations": []}), "stop"))
+    response, _ = curate(client)
+    assert json.loads(response) == {"operations": []}
+    assert len(client.requests) == 2
+
+
+def test_cut_off_empty_response_is_returned_with_recovery(recovery):
+    recovery(2)
+    client = FakeClient(("", "length"))
+    response, call_info = curate(client)
+    assert response == "" and call_info["finish_reason"] == "length"
+    assert len(client.requests) == 1
+
+
+def test_continuation_request_extends_the_partial_response(recovery):
+    recovery(2)
+    partial = '{"reasoning": "The response was cut off in the'
+    rest = ' reasoning.", "operations": [' + json.dumps(OPERATION_1) + ']}'
+    client = FakeClient((partial, "length"), (rest, "stop"))
+    response, call_info = curate(client)
+
+    # The continuation replays the prompt and the partial answer, then asks for the rest
+    continuation = client.requests[1]
+    assert continuation["messages"] == [
+        {"role": "user", "content": PROMPT},
+        {"role": "assistant", "content": partial},
+        {"role": "user", "content": CONTINUATION_PROMPT},
+    ]
+    assert "response_format" not in continuation
+    assert response == partial + rest
+    assert call_info["truncation"] == {"salvaged": False, "continuations": 1, "missing": []}
+    assert call_info["prompt_num_tokens"] == 200
+
+
+def test_operation_split_across_continuations_is_merged(recovery):
+    recovery(3)
+    parts = [
+        '{"reasoning": "Two bullets',
+        ' are needed.", "operations": [' + json.dumps(OPERATION_1)[:-12],
+        json.dumps(OPERATION_1)[-12:] + ', ' + json.dumps(OPERATION_2) + ']}',
+    ]
+    # The second part is cut off inside the first operation: "operations" has no complete value yet
+    client = FakeClient((parts[0], "length"), (parts[1], "length"), (parts[2], "stop"))
+    response, call_info = curate(client)
+
+    assert call_info["truncation"] == {"salvaged": False, "continuations": 2, "missing": []}
+    assert response == "".join(parts)
+    assert parse_curator_response(response).get("operations") == [OPERATION_1, OPERATION_2]
+
+
+def test_operations_completed_by_a_later_continuation(recovery):
+    recovery(3)
+    parts = [
+        '{"reasoning": "Two bullets',
+        ' are needed, one formula',
+        ' and one strategy.", "operations": [' + json.dumps(OPERATION_1) + ', ' + json.dumps(OPERATION_2) + ']}',
+    ]
+    client = FakeClient((parts[0], "length"), (parts[1], "length"), (parts[2], "stop"))
+    response, call_info = curate(client)
+
+    assert call_info["truncation"] == {"salvaged": False, "continuations": 2, "missing": []}
+    assert client.requests[2]["messages"][1]["content"] == parts[0] + parts[1]
+    assert parse_curator_response(response).get("operations") == [OPERATION_1, OPERATION_2]
+
+
+def test_restarted_continuation_replaces_the_partial_response(recovery):
+    recovery(2)
+    complete = json.dumps({"reasoning": "r", "operations": [OPERATION_2]})
+    client = FakeClient(('{"reasoning": "The', "length"), (complete, "stop"))
+    response, _ = curate(client)
+    assert response == complete
+
+
+def test_truncated_operations_are_salvaged_without_continuation(recovery):
+    recovery(2)
+    truncated = '{"reasoning": "r", "operations": [' + json.dumps(OPERATION_1) + ', {"type": "ADD", "sec'
+    client = FakeClient((truncated, "length"))
+    response, call_info = curate(client)
+
+    assert len(client.requests) == 1
+    assert call_info["truncation"] == {"salvaged": True, "continuations": 0}
+    assert parse_curator_response(response).get("operations") == [OPERATION_1]
@@ -0,0 +1,270 @@
+"""
+==============================================================================
+tracing.py
+==============================================================================
+
+This file contains lightweight span tracing for the ACE pipeline.
+
+Spans are recorded in memory and exported to a local file either as Chrome
+trace-event JSON (open in Perfetto / chrome://tracing) or as OTLP-JSON
+(`resourceSpans`, as accepted by OpenTelemetry collectors). Tracing is off by
+default; when disabled, `trace_span` returns a shared no-op span. Only the
+most recent `max_spans` spans are kept (roughly 1 KB each), so memory stays
+bounded on long runs; the number of dropped spans is recorded in the export.
+
+Usage:
+    with trace_span("curate", step=12) as span:
+        ...
+        span.set("operations", len(operations))
+
+"""
+import os
+import json
+import time
+import atexit
+import random
+import threading
+from collections import deque
+
+TRACE_FORMATS = ("chrome", "otlp")
+
+# Spans kept in memory; older ones are dropped
+DEFAULT_MAX_SPANS = 100000
+
+
+class Span:
+    """A single timed span; use as a context manager"""
+
+    __slots__ = ("tracer", "name", "category", "attrs", "span_id", "parent_id",
+                 "start_ns", "end_ns", "thread_id", "thread_name")
+
+    def __init__(self, tracer, name, category, attrs):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.attrs = attrs
+        self.span_id = None
+        self.parent_id = None
+        self.start_ns = None
+        self.end_ns = None
+        self.thread_id = None
+        self.thread_name = None
+
+    def set(self, key, value):
+        """Attach an attribute to the span"""
+        self.attrs[key] = value
+
+    def __enter__(self):
+        self.tracer._start(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.attrs["error"] = f"{exc_type.__name__}: {exc}"
+        self.tracer._finish(self)
+        return False
+
+
+class _NoopSpan:
+    """Shared span returned while tracing is disabled"""
+
+    __slots__ = ()
+
+    def set(self, key, value):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """
+    Collects spans from all threads and exports them to a trace file.
+
+    Args:
+        path: Output file path for export()
+        fmt: 'chrome' (trace-event JSON) or 'otlp' (OTLP-JSON)
+        service_name: Service/process name recorded in the trace
+        max_spans: Most recent spans kept for export; older ones are dropped
+    """
+
+    def __init__(self, path=None, fmt="chrome", service_name="ace", max_spans=DEFAULT_MAX_SPANS):
+        if fmt not in TRACE_FORMATS:
+            raise ValueError(f"Invalid trace format: {fmt}. Must be one of {TRACE_FORMATS}")
+        self.path = path
+        self.fmt = fmt
+        self.service_name = service_name
+        self.enabled = path is not None
+        self.trace_id = "%032x" % random.getrandbits(128)
+        self._spans = deque(maxlen=max_spans)
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # Anchor monotonic clock to wall clock once so spans share one timeline
+        self._epoch_ns = time.time_ns() - time.perf_counter_ns()
+
+    def span(self, name, category="ace", **attrs):
+        """Create a span context manager (no-op when tracing is disabled)"""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name, category, attrs)
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _start(self, span):
+        stack = self._stack()
+        span.parent_id = stack[-1].span_id if stack else None
+        span.span_id = "%016x" % random.getrandbits(64)
+        current = threading.current_thread()
+        span.thread_id = current.ident
+        span.thread_name = current.name
+        stack.append(span)
+        span.start_ns = self._epoch_ns + time.perf_counter_ns()
+
+    def _finish(self, span):
+        span.end_ns = self._epoch_ns + time.perf_counter_ns()
+        stack = self._stack()
+        if stack and stack[-1] is span:
+            stack.pop()
+        elif span in stack:
+            stack.remove(span)
+        with self._lock:
+            if len(self._spans) == self._spans.maxlen:
+                self.dropped += 1
+            self._spans.append(span)
+
+    def export(self, path=None):
+        """
+        Write the kept finished spans to `path` (defaults to the tracer's path).
+
+        Returns:
+            The path written, or None if there was nothing to write
+        """
+        path = path or self.path
+        if not path:
+            return None
+        with self._lock:
+            spans = list(self._spans)
+            dropped = self.dropped
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        payload = self._to_chrome(spans, dropped) if self.fmt == "chrome" else self._to_otlp(spans, dropped)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, default=str)
+        os.replace(tmp_path, path)
+        return path
+
+    def _to_chrome(self, spans, dropped=0):
+        pid = os.getpid()
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                   "args": {"name": self.service_name}}]
+        thread_names = {}
+        for span in spans:
+            thread_names.setdefault(span.thread_id, span.thread_name)
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": span.start_ns / 1000.0,
+                "dur": (span.end_ns - span.start_ns) / 1000.0,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": span.attrs,
+            })
+        for tid, tname in thread_names.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                           "args": {"name": tname}})
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"dropped_spans": dropped}}
+
+    def _to_otlp(self, spans, dropped=0):
+        otlp_spans = []
+        for span in spans:
+            attributes = [_otlp_attribute("ace.category", span.category),
+                          _otlp_attribute("thread.name", span.thread_name)]
+            attributes.extend(_otlp_attribute(k, v) for k, v in span.attrs.items())
+            otlp_span = {
+                "traceId": self.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": 1,  # SPAN_KIND_INTERNAL
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": attributes,
+            }
+            if span.parent_id:
+                otlp_span["parentSpanId"] = span.parent_id
+            if "error" in span.attrs:
+                otlp_span["status"] = {"code": 2, "message": str(span.attrs["error"])}
+            otlp_spans.append(otlp_span)
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", self.service_name),
+                                            _otlp_attribute("ace.dropped_spans", dropped)]},
+                "scopeSpans": [{"scope": {"name": "ace.tracing"}, "spans": otlp_spans}],
+            }]
+        }
+
+
+def _otlp_attribute(key, value):
+    """Encode a key/value pair as an OTLP-JSON attribute"""
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+_tracer = Tracer()
+
+
+def get_tracer():
+    """Return the process-wide tracer"""
+    return _tracer
+
+
+def configure_tracing(path=None, fmt="chrome", max_spans=DEFAULT_MAX_SPANS):
+    """
+    Install a new process-wide tracer.
+
+    Args:
+        path: Trace output file; None disables tracing
+        fmt: 'chrome' or 'otlp'
+        max_spans: Most recent spans kept in memory for the export
+
+    Returns:
+        The new Tracer
+    """
+    global _tracer
+    _tracer = Tracer(path=path, fmt=fmt, max_spans=max_spans)
+    return _tracer
+
+
+def trace_span(name, category="ace", **attrs):
+    """Shortcut for get_tracer().span(...)"""
+    return _tracer.span(name, category, **attrs)
+
+
+def export_trace():
+    """Export the current tracer to its configured path, if enabled"""
+    if _tracer.enabled:
+        return _tracer.export()
+    return None
+
+
+atexit.register(export_trace)
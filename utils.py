@@ -1,12 +1,16 @@
 #!/usr/bin/env python3
 import os
-import re
 import json
+import math
+import random
+from statistics import NormalDist
 import openai
 import tiktoken
 from dotenv import load_dotenv
 from typing import List, Dict, Any, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from logging_utils import get_logger, RateLimitedProgress
+from response_parsing import extract_boxed_content, parse_generator_response
 
 # Load environment variables from .env file
 load_dotenv()
@@ -72,7 +76,7 @@ def initialize_clients(api_provider):
         curator_client = openai.OpenAI(api_key=api_key, base_url=base_url)
     
     provider_display = api_provider.upper() if api_provider != "azure" else "Azure OpenAI"
-    print(f"Using {provider_display} for all models")
+    get_logger("clients").info(f"Using {provider_display} for all models")
     return generator_client, reflector_client, curator_client
 
 def get_section_slug(section_name):
@@ -102,85 +106,49 @@ def get_section_slug(section_name):
     else:
         return "".join(w[0] for w in words[:5])
 
-def extract_boxed_content(text):
-    """Helper function to extract content from \\boxed{} format"""
-    pattern = r'\\boxed\{'
-    match = re.search(pattern, text)
-    if not match:
-        return None
+def extract_answer(response):
+    """Extract final answer from model response (see parse_generator_response)"""
+    return parse_generator_response(response).final_answer
+
+
+def vote_answers(responses, weights=None) -> Dict[str, Any]:
+    """
+    Majority or weighted vote over the final answers of several samples.
     
-    start = match.end() - 1  # Position of opening brace
-    brace_count = 0
-    i = start
+    Answers are compared after stripping and lowercasing; samples without a
+    parseable final answer only win if no sample has one. Ties go to the
+    answer sampled first.
     
-    while i < len(text):
-        if text[i] == '{':
-            brace_count += 1
-        elif text[i] == '}':
-            brace_count -= 1
-            if brace_count == 0:
-                return text[start + 1:i]  # Content between braces
-        i += 1
-    return None
-
-def extract_answer(response):
-    """Extract final answer from model response"""
-    try:
-        # First try JSON parsing
-        parsed = json.loads(response)
-        answer = str(parsed.get("final_answer", "No final answer found"))
-        return answer  
-            
-    except (json.JSONDecodeError, KeyError, AttributeError):
-        # JSON parsing failed, use fallback logic
-        matches = re.findall(r"Finish\[(.*?)\]", response)
-        if matches:
-            answer = matches[-1]
-            return answer
-        
-        # Try to get final answer from JSON style response with regex matching 
-        # Try double quotes first
-        matches = re.findall(r'"final_answer"\s*:\s*"([^"]*)"', response)
-        if matches:
-            answer = matches[-1]
-            return answer
-        
-        # Try single quotes
-        matches = re.findall(r"'final_answer'\s*:\s*'([^']*)'", response)
-        if matches:
-            answer = matches[-1]
-            return answer
-        
-        # Handle JSON format without quotes (for simple expressions)
-        matches = re.findall(r'[\'"]final_answer[\'"]\s*:\s*([^,}]+)', response)
-        if matches:
-            answer = matches[-1].strip()
-            # Clean up trailing characters
-            answer = re.sub(r'[,}]*$', '', answer)
-            return answer
-        
-        # Fallback for "The final answer is: X" pattern with boxed
-        final_answer_pattern = r'[Tt]he final answer is:?\s*\$?\\boxed\{'
-        match = re.search(final_answer_pattern, response)
-        if match:
-            # Extract boxed content starting from this match
-            remaining_text = response[match.start():]
-            boxed_content = extract_boxed_content(remaining_text)
-            if boxed_content:
-                return boxed_content
-        
-        # More general pattern for "final answer is X"
-        matches = re.findall(r'[Tt]he final answer is:?\s*([^\n.]+)', response)
-        if matches:
-            answer = matches[-1].strip()
-            # Clean up common formatting
-            answer = re.sub(r'^\$?\\boxed\{([^}]+)\}\$?$', r'\1', answer)
-            answer = answer.replace('$', '').strip()
-            if answer:
-                return answer
+    Args:
+        responses: Sampled response texts for the same prompt
+        weights: Optional non-negative weight per response (e.g. a confidence
+            score); None counts every response once
         
-        return "No final answer found"
+    Returns:
+        Dict with answer (as first extracted), index (of the first response
+        giving it), agreement (its share of the total weight) and votes
+        (normalized answer -> weight)
+    """
+    if weights is None:
+        weights = [1.0] * len(responses)
+    answers = [extract_answer(response) for response in responses]
+    votes, first_index = {}, {}
+    for i, (answer, weight) in enumerate(zip(answers, weights)):
+        key = answer.strip().lower()
+        votes[key] = votes.get(key, 0.0) + weight
+        first_index.setdefault(key, i)
     
+    candidates = [key for key in votes if key != "no final answer found"] or list(votes)
+    winner = max(candidates, key=lambda key: (votes[key], -first_index[key]))
+    total = sum(votes.values())
+    return {
+        "answer": answers[first_index[winner]],
+        "index": first_index[winner],
+        "agreement": votes[winner] / total if total else 0.0,
+        "votes": votes,
+    }
+
+
 enc = tiktoken.get_encoding("cl100k_base")
 def count_tokens(prompt: str) -> int:
     return len(enc.encode(prompt))
@@ -218,6 +186,10 @@ def evaluate_single_test_sample(args_tuple, data_processor) -> Tuple[Dict, str]:
             "final_answer": final_answer,
             "target": target,
             "is_correct": is_correct,
+            "num_tokens": (call_info.get("prompt_num_tokens") or 0) + (call_info.get("response_num_tokens") or 0),
+            "response": gen_response,
+            "bullet_ids": bullet_ids,
+            "packed": False,
             "success": True
         }, None
 
@@ -225,9 +197,106 @@ def evaluate_single_test_sample(args_tuple, data_processor) -> Tuple[Dict, str]:
         return None, f"Error evaluating sample {i}: {type(e).__name__}: {str(e)}"
 
 
+def pack_test_samples(test_samples, pack_size, pack_token_budget) -> List[List[int]]:
+    """
+    Group consecutive samples into packs for multi-question generator calls.
+    
+    A pack grows until it holds pack_size samples or its questions and contexts
+    would exceed pack_token_budget tokens, so K adapts to the sample lengths;
+    a sample longer than the budget gets a pack of its own.
+    
+    Args:
+        test_samples: Samples with question and context
+        pack_size: Maximum samples per pack
+        pack_token_budget: Maximum question + context tokens per pack
+        
+    Returns:
+        List of packs, each a list of sample indices
+    """
+    packs = []
+    current, current_tokens = [], 0
+    for i, sample in enumerate(test_samples):
+        tokens = count_tokens(sample.get("question", "")) + count_tokens(sample.get("context", ""))
+        if current and (len(current) >= pack_size or current_tokens + tokens > pack_token_budget):
+            packs.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += tokens
+    if current:
+        packs.append(current)
+    return packs
+
+
+def evaluate_packed_test_samples(indices, test_samples, generator, playbook, max_tokens,
+                                 log_dir, use_json_mode, data_processor) -> Tuple[List[Tuple[Dict, str]], bool]:
+    """
+    Evaluate a pack of test samples with one generator call.
+    
+    Falls back to one request per sample if the call fails or its response
+    cannot be unpacked into one answer per question.
+    
+    Args:
+        indices: Indices of the packed samples in test_samples
+        test_samples: All test samples
+        generator: Generator instance
+        playbook: Current playbook string
+        max_tokens: Max tokens for generation
+        log_dir: Directory for logs
+        use_json_mode: Whether to use JSON mode
+        data_processor: DataProcessor instance with answer_is_correct method
+        
+    Returns:
+        Tuple of ([(result, error) per sample as evaluate_single_test_sample], fell_back)
+    """
+    def single(i):
+        return evaluate_single_test_sample(
+            (i, test_samples[i], generator, playbook, max_tokens, log_dir, use_json_mode), data_processor
+        )
+    
+    if len(indices) == 1:
+        return [single(indices[0])], False
+    
+    answers = None
+    try:
+        _, answers, call_info = generator.generate_packed(
+            questions=[(test_samples[i]["question"], test_samples[i]["context"]) for i in indices],
+            playbook=playbook,
+            use_json_mode=use_json_mode,
+            call_id=f"test_eval_packed_{indices[0]}_{indices[-1]}",
+            log_dir=log_dir
+        )
+    except Exception as e:
+        get_logger("eval").warning(f"Packed evaluation of samples {indices} failed: {type(e).__name__}: {e}")
+    if answers is None:
+        get_logger("eval").warning(f"Could not unpack answers for samples {indices}, "
+                                   f"falling back to single requests")
+        return [single(i) for i in indices], True
+    
+    call_tokens = (call_info.get("prompt_num_tokens") or 0) + (call_info.get("response_num_tokens") or 0)
+    outputs = []
+    for i, answer in zip(indices, answers):
+        # Per-sample response in the single-request format, so downstream parsing is unchanged
+        response = json.dumps(answer)
+        final_answer = extract_answer(response)
+        target = test_samples[i]["target"]
+        outputs.append(({
+            "index": i,
+            "final_answer": final_answer,
+            "target": target,
+            "is_correct": data_processor.answer_is_correct(final_answer, target),
+            "num_tokens": call_tokens / len(indices),
+            "response": response,
+            "bullet_ids": answer["bullet_ids"],
+            "packed": True,
+            "success": True
+        }, None))
+    return outputs, False
+
+
 def evaluate_test_set(data_processor, generator, playbook, test_samples,
                       max_tokens=4096, log_dir=None, max_workers=20, 
-                      use_json_mode=False) -> Tuple[Dict, Dict]:
+                      use_json_mode=False, generations=None,
+                      pack_size=1, pack_token_budget=4000) -> Tuple[Dict, Dict]:
     """
     Parallel evaluation of test set - task-agnostic implementation.
     
@@ -240,60 +309,74 @@ def evaluate_test_set(data_processor, generator, playbook, test_samples,
         log_dir: Directory for logs
         max_workers: Number of parallel workers
         use_json_mode: Whether to use JSON mode
+        generations: Optional dict filled with {index: {"response", "bullet_ids",
+            "final_answer", "is_correct"}} for every sample successfully evaluated
+            with its own single-sample request (answers from packed calls were not
+            generated from the single-sample prompt and are left out)
+        pack_size: Maximum questions answered per generator call (1 = one request
+            per sample); see pack_test_samples
+        pack_token_budget: Maximum question + context tokens per packed call
         
     Returns:
         Tuple of (results_dict, error_logs_dict)
     """
-    print(f"\n{'='*40}")
-    print(f"EVALUATING TEST SET - {len(test_samples)} samples, {max_workers} workers")
-    print(f"{'='*40}")
+    log = get_logger("eval")
+    log.info(f"\n{'='*40}")
+    log.info(f"EVALUATING TEST SET - {len(test_samples)} samples, {max_workers} workers")
+    log.info(f"{'='*40}")
+    progress = RateLimitedProgress(log, len(test_samples))
 
-    args_list = [
-        (i, sample, generator, playbook, max_tokens, log_dir, use_json_mode)
-        for i, sample in enumerate(test_samples)
-    ]
+    if pack_size > 1:
+        packs = pack_test_samples(test_samples, pack_size, pack_token_budget)
+    else:
+        packs = [[i] for i in range(len(test_samples))]
 
     results = {
         "correct": 0, "total": 0, "no_answer": 0,
         "answers": [], "targets": [], "errors": []
     }
+    packing = {"requests": len(packs), "packed_requests": sum(len(pack) > 1 for pack in packs), "fallbacks": 0}
 
     # Use a wrapper to pass data_processor to the evaluation function
-    def eval_wrapper(args_tuple):
-        return evaluate_single_test_sample(args_tuple, data_processor)
+    def eval_wrapper(pack):
+        return evaluate_packed_test_samples(
+            pack, test_samples, generator, playbook, max_tokens, log_dir, use_json_mode, data_processor
+        )
 
+    completed = 0
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_args = {
-            executor.submit(eval_wrapper, args): args 
-            for args in args_list
-        }
+        futures = [executor.submit(eval_wrapper, pack) for pack in packs]
 
-        for i, future in enumerate(as_completed(future_to_args), 1):
-            result, error = future.result()
-            
-            if error:
-                print(error)
-                continue
+        for future in as_completed(futures):
+            outputs, fell_back = future.result()
+            packing["fallbacks"] += fell_back
+            for result, error in outputs:
+                completed += 1
+                if error:
+                    log.error(error)
+                    continue
 
-            if result and result["success"]:
-                results["correct"] += (1 if result["is_correct"] else 0)
-                results["total"] += 1
-                results["answers"].append(result["final_answer"])
-                results["targets"].append(result["target"])
+                if result and result["success"]:
+                    results["correct"] += (1 if result["is_correct"] else 0)
+                    results["total"] += 1
+                    results["answers"].append(result["final_answer"])
+                    results["targets"].append(result["target"])
+                    if generations is not None and not result["packed"]:
+                        generations[result["index"]] = {
+                            key: result[key] for key in ("response", "bullet_ids", "final_answer", "is_correct")
+                        }
                 
-                if not result["is_correct"]:
-                    results["errors"].append({
-                        "index": result["index"],
-                        "prediction": result["final_answer"],
-                        "ground_truth": result["target"]
-                    })
+                    if not result["is_correct"]:
+                        results["errors"].append({
+                            "index": result["index"],
+                            "prediction": result["final_answer"],
+                            "ground_truth": result["target"]
+                        })
                 
-                if result["final_answer"] == "No final answer found":
-                    results["no_answer"] += 1
+                    if result["final_answer"] == "No final answer found":
+                        results["no_answer"] += 1
 
-            if i % 50 == 0:
-                curr_acc = results["correct"] / results["total"] if results["total"] > 0 else 0
-                print(f"Progress: {i}/{len(args_list)}, Accuracy: {curr_acc:.3f}")
+            progress.update(completed, lambda: f"Accuracy: {results['correct'] / results['total'] if results['total'] > 0 else 0:.3f}")
     
     if results["answers"] and results["targets"]:
         accuracy = data_processor.evaluate_accuracy(results["answers"], results["targets"])
@@ -304,16 +387,197 @@ def evaluate_test_set(data_processor, generator, playbook, test_samples,
             "total": results["total"],
             "no_answer": results["no_answer"]
         }
+        if pack_size > 1:
+            final_results["packing"] = packing
+            log.info(f"Packed evaluation: {len(test_samples)} samples in {packing['requests']} requests "
+                     f"({packing['fallbacks']} packs fell back to single requests)")
         
         error_logs = {
             "accuracy": accuracy,
             "errors": results["errors"]
         }
         
-        print(f"\n📊 Final Accuracy: {accuracy:.3f} ({results['correct']}/{results['total']})")
+        log.info(f"\n📊 Final Accuracy: {accuracy:.3f} ({results['correct']}/{results['total']})")
     else:
         results = {"accuracy": 0.0, "correct": 0, "total": 0}
         error_logs = {}
-        print(f"\n📊 No valid results!")
+        log.warning(f"\n📊 No valid results!")
+        
+    return final_results, error_logs
+
+
+def stratified_order(samples, seed=None) -> List[int]:
+    """
+    Shuffle sample indices so that every prefix is stratified by target.
+    
+    Args:
+        samples: Samples with a "target" field
+        seed: Seed for the shuffle
+        
+    Returns:
+        List of sample indices
+    """
+    rng = random.Random(seed)
+    strata = {}
+    for i, sample in enumerate(samples):
+        strata.setdefault(str(sample.get("target")), []).append(i)
+    for indices in strata.values():
+        rng.shuffle(indices)
+    
+    # Repeatedly take from the stratum furthest below its share of the prefix
+    total = len(samples)
+    taken = {key: 0 for key in strata}
+    order = []
+    for position in range(1, total + 1):
+        key = max(
+            (k for k in strata if taken[k] < len(strata[k])),
+            key=lambda k: position * len(strata[k]) / total - taken[k]
+        )
+        order.append(strata[key][taken[key]])
+        taken[key] += 1
+    return order
+
+
+def accuracy_interval(correct, n, population, z) -> Tuple[float, float]:
+    """
+    Wilson score interval for the accuracy over the whole population of
+    `population` samples, given `correct` out of `n` sampled without
+    replacement (finite population correction).
+    """
+    if n == 0:
+        return 0.0, 1.0
+    if n >= population:
+        p = correct / n
+        return p, p
+    p = correct / n
+    z2 = z * z * (population - n) / (population - 1)
+    denominator = 1 + z2 / n
+    center = (p + z2 / (2 * n)) / denominator
+    half_width = math.sqrt(z2) / denominator * math.sqrt(p * (1 - p) / n + z2 / (4 * n * n))
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+
+def evaluate_test_set_sequential(data_processor, generator, playbook, test_samples,
+                                 reference_accuracy=None, max_tokens=4096, log_dir=None,
+                                 max_workers=20, use_json_mode=False, chunk_size=None,
+                                 confidence=0.95, seed=None) -> Tuple[Dict, Dict]:
+    """
+    Sequential-testing evaluation: evaluate random stratified chunks and stop
+    once the confidence interval on accuracy lies entirely below
+    `reference_accuracy`. A playbook that may beat the reference is evaluated
+    on the full set, so its accuracy is exact and comparable to other
+    full-set accuracies.
+    
+    The per-look confidence is Bonferroni-adjusted over the number of chunks so
+    the overall error rate stays within 1 - confidence despite repeated looks.
+    
+    Args:
+        data_processor: DataProcessor instance with answer_is_correct and evaluate_accuracy methods
+        generator: Generator instance
+        playbook: Current playbook string
+        test_samples: List of test samples
+        reference_accuracy: Full-set accuracy to beat (e.g. best so far); None evaluates the full set
+        max_tokens: Max tokens for generation
+        log_dir: Directory for logs
+        max_workers: Number of parallel workers
+        use_json_mode: Whether to use JSON mode
+        chunk_size: Samples per chunk (defaults to max_workers)
+        confidence: Overall confidence of the early-stop decision
+        seed: Seed for the stratified sample order
         
-    return final_results, error_logs
\ No newline at end of file
+    Returns:
+        Tuple of (results_dict, error_logs_dict) as evaluate_test_set, with a
+        "sequential" entry in results_dict describing the decision and savings
+    """
+    log = get_logger("eval")
+    total_samples = len(test_samples)
+    chunk_size = max(1, chunk_size or max_workers)
+    num_looks = max(1, math.ceil(total_samples / chunk_size))
+    z = NormalDist().inv_cdf(1 - (1 - confidence) / (2 * num_looks))
+    order = stratified_order(test_samples, seed)
+    log.info(f"\n{'='*40}")
+    log.info(f"SEQUENTIAL EVALUATION - up to {total_samples} samples in chunks of {chunk_size}, "
+             f"reference accuracy {reference_accuracy if reference_accuracy is not None else 'n/a'}")
+    log.info(f"{'='*40}")
+
+    results = {
+        "correct": 0, "total": 0, "no_answer": 0,
+        "answers": [], "targets": [], "errors": []
+    }
+    evaluated = 0
+    tokens_used = 0
+    decision = "full"
+    interval = (0.0, 1.0)
+
+    def eval_wrapper(args_tuple):
+        return evaluate_single_test_sample(args_tuple, data_processor)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for start in range(0, total_samples, chunk_size):
+            args_list = [
+                (i, test_samples[i], generator, playbook, max_tokens, log_dir, use_json_mode)
+                for i in order[start:start + chunk_size]
+            ]
+            for result, error in executor.map(eval_wrapper, args_list):
+                evaluated += 1
+                if error:
+                    log.error(error)
+                    continue
+                if result and result["success"]:
+                    tokens_used += result.get("num_tokens", 0)
+                    results["correct"] += (1 if result["is_correct"] else 0)
+                    results["total"] += 1
+                    results["answers"].append(result["final_answer"])
+                    results["targets"].append(result["target"])
+                    
+                    if not result["is_correct"]:
+                        results["errors"].append({
+                            "index": result["index"],
+                            "prediction": result["final_answer"],
+                            "ground_truth": result["target"]
+                        })
+                    
+                    if result["final_answer"] == "No final answer found":
+                        results["no_answer"] += 1
+            
+            interval = accuracy_interval(results["correct"], results["total"], total_samples, z)
+            log.info(f"Sequential eval: {evaluated}/{total_samples} samples, "
+                     f"accuracy CI [{interval[0]:.3f}, {interval[1]:.3f}]")
+            if evaluated >= total_samples or reference_accuracy is None:
+                continue
+            if interval[1] < reference_accuracy:
+                decision = "worse"
+                break
+
+    samples_saved = total_samples - evaluated
+    sequential = {
+        "decision": decision,
+        "reference_accuracy": reference_accuracy,
+        "confidence_interval": list(interval),
+        "samples_evaluated": evaluated,
+        "samples_saved": samples_saved,
+        "tokens_used": tokens_used,
+        "estimated_tokens_saved": round(tokens_used / evaluated * samples_saved) if evaluated else 0,
+    }
+
+    if results["answers"] and results["targets"]:
+        accuracy = data_processor.evaluate_accuracy(results["answers"], results["targets"])
+        final_results = {
+            "accuracy": accuracy,
+            "correct": results["correct"],
+            "total": results["total"],
+            "no_answer": results["no_answer"],
+            "sequential": sequential
+        }
+        error_logs = {
+            "accuracy": accuracy,
+            "errors": results["errors"]
+        }
+        log.info(f"\n📊 Sequential Accuracy: {accuracy:.3f} ({results['correct']}/{results['total']}), "
+                 f"decision: {decision}, {samples_saved} samples saved")
+    else:
+        final_results = {"accuracy": 0.0, "correct": 0, "total": 0, "sequential": sequential}
+        error_logs = {}
+        log.warning(f"\n📊 No valid results!")
+
+    return final_results, error_logs